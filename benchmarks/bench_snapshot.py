@@ -0,0 +1,60 @@
+# benchmarks/bench_snapshot.py
+"""
+Compara el coste de bifurcar una simulación con ElevatorSystem.fork() /
+snapshot() frente a copy.deepcopy del grafo de objetos.
+
+    python benchmarks/bench_snapshot.py [--floors 50] [--cars 16] [--users 3000]
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.scenario import generate_user_events, setup_elevators, setup_system  # noqa: E402
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--floors", type=int, default=50)
+    parser.add_argument("--cars", type=int, default=16)
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    total_time, dt = 3600.0, 0.5
+    system = setup_system(1, args.floors)
+    system.rng = rng
+    setup_elevators(system, [{"id": i} for i in range(1, args.cars + 1)])
+    events = generate_user_events(args.users, 1, args.floors, total_time, dt, rng=rng)
+    system.run_until(total_time / 2, dt, events)
+
+    results = {
+        "deepcopy": _best_of(lambda: copy.deepcopy(system), args.repeat),
+        "snapshot": _best_of(system.snapshot, args.repeat),
+        "snapshot (sin logs)": _best_of(lambda: system.snapshot(include_logs=False), args.repeat),
+        "fork": _best_of(system.fork, args.repeat),
+    }
+    print(f"{args.floors} pisos, {args.cars} cabinas, {len(system.users)} usuarios, "
+          f"{system.logger.total_logged} registros de log")
+    for name, seconds in results.items():
+        ratio = results["deepcopy"] / seconds
+        print(f"{name:<22}{seconds * 1e3:>10.2f} ms   x{ratio:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# benchmarks/suite.py
+"""
+Suite de rendimiento de la simulación.
+
+Cada caso construye un edificio (pisos, cabinas y nivel de tráfico), lo
+simula con ElevatorSystem.run_until y mide ticks/s, pasajeros entregados/s
+y pico de memoria (tracemalloc, en una pasada aparte para no distorsionar
+el tiempo). Los microcasos aíslan los caminos calientes: Elevator.step,
+Controller.update_users, la cola de FloorPanel y la decisión del despacho.
+
+    python benchmarks/suite.py                         # casos estándar
+    python benchmarks/suite.py --grid                  # rejilla completa
+    python benchmarks/suite.py --save baseline.json    # guarda línea base
+    python benchmarks/suite.py --compare baseline.json --margin 0.2
+
+Con --compare el proceso termina con código 1 si algún caso es más lento
+que la línea base en más del margen indicado.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.controller import Controller  # noqa: E402
+from simulation.elevator import Elevator  # noqa: E402
+from simulation.floor_panel import FloorPanel  # noqa: E402
+from simulation.logger import Logger  # noqa: E402
+from simulation.scenario import generate_user_events, setup_elevators, setup_system  # noqa: E402
+from simulation.user import User  # noqa: E402
+
+# Llegadas por segundo y por cabina de cada nivel de tráfico
+TRAFFIC = {"light": 0.002, "medium": 0.01, "heavy": 0.03}
+
+# Casos estándar: de un edificio pequeño a una torre de 200 pisos y 64 cabinas
+STANDARD_CASES = [
+    (10, 1, "light"),
+    (10, 1, "heavy"),
+    (50, 8, "light"),
+    (50, 8, "medium"),
+    (50, 8, "heavy"),
+    (200, 64, "light"),
+    (200, 64, "heavy"),
+]
+
+GRID_FLOORS = (10, 50, 200)
+GRID_CARS = (1, 8, 64)
+
+SIM_TIME_S = 1800.0
+DT = 0.5
+
+
+def case_name(floors: int, cars: int, traffic: str) -> str:
+    return f"{floors}f-{cars}c-{traffic}"
+
+
+def _build(floors: int, cars: int, traffic: str, seed: int):
+    rng = random.Random(seed)
+    system = setup_system(1, floors)
+    system.logger.disable()
+    setup_elevators(system, [{"id": i} for i in range(1, cars + 1)])
+    num_users = round(TRAFFIC[traffic] * cars * SIM_TIME_S)
+    events = generate_user_events(num_users, 1, floors, SIM_TIME_S, DT, rng=rng)
+    return system, events
+
+
+def run_case(floors: int, cars: int, traffic: str, repeat: int = 3, seed: int = 0) -> Dict:
+    """Mejor tiempo de `repeat` ejecuciones del caso, más el pico de memoria."""
+    ticks = int(round(SIM_TIME_S / DT))
+    # Ejecución de calentamiento sin medir
+    system, events = _build(floors, cars, traffic, seed)
+    system.run_until(SIM_TIME_S, DT, events)
+    best, delivered = float("inf"), 0
+    for _ in range(repeat):
+        system, events = _build(floors, cars, traffic, seed)
+        start = time.perf_counter()
+        system.run_until(SIM_TIME_S, DT, events)
+        wall = time.perf_counter() - start
+        if wall < best:
+            best, delivered = wall, system.delivered_count
+
+    tracemalloc.start()
+    system, events = _build(floors, cars, traffic, seed)
+    system.run_until(SIM_TIME_S, DT, events)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "floors": floors,
+        "cars": cars,
+        "traffic": traffic,
+        "passengers": len(events),
+        "wall_time_s": best,
+        "ticks_per_s": ticks / best,
+        "passengers_per_s": delivered / best,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def _time_per_call(fn: Callable[[], None], calls: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / calls
+
+
+def run_micro(repeat: int = 3) -> Dict[str, Dict]:
+    """Microcasos de los caminos calientes, en llamadas por segundo."""
+    results = {}
+
+    # Elevator.step con una cabina recorriendo 50 pisos de ida y vuelta
+    elev = Elevator(id=1, min_floor=1, max_floor=50)
+
+    def step():
+        if not elev.stops:
+            elev.call(50 if elev.current_floor < 25 else 1)
+        elev.step(0.5)
+
+    results["elevator_step"] = _time_per_call(step, 20000, repeat)
+
+    # Controller.update_users con puertas abiertas y cola de 10 usuarios
+    panels = [FloorPanel(id=f, floor=f, min_floor=1, max_floor=20) for f in range(1, 21)]
+    ctrl = Controller(id=1, elevator=Elevator(id=1, min_floor=1, max_floor=20),
+                      floor_panels=panels, logger=Logger(log_level="ERROR"))
+    ctrl.elevator.door.force_open()
+    uid = itertools.count()
+
+    def update_users():
+        for _ in range(10):
+            user = User(id=next(uid), weight_kg=70.0, current_floor=1)
+            user.destination_floor = 5
+            user.call_elevator("up")
+            panels[0].call(user)
+        ctrl.update_users()
+        ctrl.riders.clear()
+        ctrl.pending_requests.clear()
+
+    results["update_users_10"] = _time_per_call(update_users, 2000, repeat)
+
+    # FloorPanel: 200 usuarios en cola, embarque por dirección
+    def panel_queue():
+        panel = FloorPanel(id=1, floor=10, min_floor=1, max_floor=20)
+        for i in range(200):
+            user = User(id=i, weight_kg=70.0, current_floor=10)
+            user.call_elevator("up" if i % 2 else "down")
+            panel.call(user)
+        panel.get_waiting_users(10, "up")
+        panel.get_waiting_users(10, "down")
+
+    results["floor_panel_200"] = _time_per_call(panel_queue, 200, repeat)
+
+    # Despacho por ETA: 64 cabinas en servicio en 150 pisos, una llamada por decisión
+    rng = random.Random(0)
+    system = setup_system(1, 150)
+    system.logger.disable()
+    setup_elevators(system, [{"id": i} for i in range(1, 65)])
+    system.run_until(300.0, DT, generate_user_events(2000, 1, 150, 600.0, DT, rng=rng))
+    calls = itertools.cycle([(rng.randint(1, 150), rng.choice(("up", "down"))) for _ in range(1000)])
+
+    def dispatch():
+        system.dispatcher.select(*next(calls))
+
+    results["dispatch_150f_64c"] = _time_per_call(dispatch, 2000, repeat)
+    return {name: {"calls_per_s": 1.0 / seconds} for name, seconds in results.items()}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], margin: float) -> List[str]:
+    """
+    Casos más lentos que la línea base en más de `margin` (fracción):
+    compara ticks_per_s en escenarios y calls_per_s en microcasos.
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        metric = "ticks_per_s" if "ticks_per_s" in current else "calls_per_s"
+        if current[metric] < reference[metric] * (1.0 - margin):
+            regressions.append(
+                f"{name}: {current[metric]:.0f} {metric} < base {reference[metric]:.0f} "
+                f"(-{1 - current[metric] / reference[metric]:.0%})"
+            )
+    return regressions
+
+
+def run_suite(grid: bool = False, repeat: int = 3, micro: bool = True,
+              only: Optional[List[str]] = None) -> Dict[str, Dict]:
+    cases = (
+        [(f, c, t) for f in GRID_FLOORS for c in GRID_CARS for t in TRAFFIC]
+        if grid else STANDARD_CASES
+    )
+    results = {}
+    for floors, cars, traffic in cases:
+        name = case_name(floors, cars, traffic)
+        if only and name not in only:
+            continue
+        results[name] = run_case(floors, cars, traffic, repeat=repeat)
+    if micro:
+        results.update(run_micro(repeat=repeat))
+    return results
+
+
+def _print_table(results: Dict[str, Dict]) -> None:
+    print(f"{'caso':<20}{'ticks/s':>12}{'pasajeros/s':>14}{'pico KiB':>12}")
+    for name, r in results.items():
+        if "ticks_per_s" in r:
+            print(f"{name:<20}{r['ticks_per_s']:>12.0f}{r['passengers_per_s']:>14.1f}"
+                  f"{r['peak_memory_kb']:>12.0f}")
+        else:
+            print(f"{name:<20}{r['calls_per_s']:>12.0f} llamadas/s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de la simulación de ascensores")
+    parser.add_argument("--grid", action="store_true", help="rejilla completa pisos x cabinas x tráfico")
+    parser.add_argument("--case", action="append", help="ejecuta sólo este caso (repetible)")
+    parser.add_argument("--no-micro", action="store_true", help="omite los microcasos")
+    parser.add_argument("--repeat", type=int, default=3, help="repeticiones por caso (mejor tiempo)")
+    parser.add_argument("--save", metavar="PATH", help="guarda los resultados como línea base JSON")
+    parser.add_argument("--compare", metavar="PATH", help="compara con una línea base JSON")
+    parser.add_argument("--margin", type=float, default=0.2,
+                        help="pérdida de rendimiento tolerada frente a la base (fracción)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(grid=args.grid, repeat=args.repeat, micro=not args.no_micro, only=args.case)
+    _print_table(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+        print(f"Línea base guardada en {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.margin)
+        if regressions:
+            print("Regresiones de rendimiento:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"Sin regresiones frente a {args.compare} (margen {args.margin:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
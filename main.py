@@ -7,113 +7,71 @@ y trazabilidad completa del proceso: llamada externa, llegada,
 entradas/salidas detectando peso y cierre de puertas.
 """
 
+import argparse
+import json
+import math
 import random
+import time
+from typing import Callable
 from simulation.elevator_system import ElevatorSystem
-from simulation.elevator        import Elevator
-from simulation.controller      import Controller
-from simulation.user            import User
-
-
-def setup_system(min_floor: int, max_floor: int) -> ElevatorSystem:
-    """Inicializa y devuelve un ElevatorSystem con todos los FloorPanels."""
-    system = ElevatorSystem(min_floor=min_floor, max_floor=max_floor)
-    system.populate_panels()
-    return system
-
-
-def setup_elevators(
-    system: ElevatorSystem,
-    specs: list[dict]
-) -> None:
-    """Añade instancias de Elevator y Controller al sistema."""
-    for spec in specs:
-        elev = Elevator(
-            system=system,
-            id=spec["id"],
-            min_floor=spec.get("min_floor", system.min_floor),
-            max_floor=spec.get("max_floor", system.max_floor),
-            speed_mps=spec.get("speed", 1.0)
-        )
-        ctrl = Controller(
-            id=spec["id"],
-            elevator=elev,
-            floor_panels=list(system.floor_panels.values()),
-            logger=system.logger
+from simulation.arrivals        import as_arrival_source
+from simulation.scenario        import (
+    setup_system,
+    setup_elevators,
+    generate_user_events,
+)
+from simulation.replications    import collect_kpis
+
+
+def console_display(ctrl) -> Callable:
+    """Suscriptor que imprime el fotograma del display con el peso y los usuarios dentro."""
+    elev = ctrl.elevator
+
+    def show(display, frame: str) -> None:
+        inside = ", ".join(f"User{u.id}({u.weight_kg:.1f}kg)" for u in ctrl.get_riders()) or "None"
+        print(
+            f"[Display E{elev.id}] {frame} "
+            f"| TotalWeight: {elev.current_weight_kg:.1f}kg "
+            f"| Inside: {inside}"
         )
-        system.add_elevator(elev, ctrl)
-
-
-def generate_user_events(
-    num_users: int,
-    min_floor: int,
-    max_floor: int,
-    total_time: float,
-    dt: float
-) -> list[dict]:
-    """
-    Crea eventos de usuarios: tiempo de aparición, id, peso, origen y destino.
-    """
-    events = []
-    for uid in range(1, num_users + 1):
-        origin = random.randint(min_floor, max_floor)
-        dest_choices = [f for f in range(min_floor, max_floor + 1) if f != origin]
-        dest = random.choice(dest_choices)
-        max_tick = int(total_time / dt)
-        tick = random.randint(0, max_tick)
-        event_time = tick * dt
-        weight = random.uniform(50.0, 90.0)
-        events.append({
-            "time": event_time,
-            "id": uid,
-            "weight": weight,
-            "origin": origin,
-            "dest": dest,
-            "dispatched": False
-        })
-    return sorted(events, key=lambda e: e["time"])
+    return show
 
 
 def update_displays(system: ElevatorSystem) -> None:
-    """Sincroniza y muestra todos los Displays, peso y usuarios dentro."""
-    for ctrl in system.controllers:
-         elev = ctrl.elevator
-         disp = elev.display
-         # Actualizar display básico
-         disp.update_floor(elev.current_floor)
-         arrow = {"up": "↑", "down": "↓"}.get(elev.direction, "—")
-         disp.update_direction(arrow)
-         disp.update_door(elev.door.status)
-         # 1) Calcula quién está dentro y su peso
-         inside = [(u.id, u.weight_kg) for u in ctrl.users if u.inside_elevator]
-         inside_str = ", ".join(f"User{uid}({w:.1f}kg)" for uid, w in inside) or "None"
-
-         # 2) Imprime display + peso + listado de pasajeros
-         print(
-                f"[Display E{elev.id}] {disp.render()} "
-                f"| TotalWeight: {elev.current_weight_kg:.1f}kg "
-                f"| Inside: {inside_str}"
-            )
+    """Sincroniza los Displays; sólo se imprimen los que han cambiado."""
+    system.publish_displays()
 
 
 def run_simulation(
     system: ElevatorSystem,
     steps: int,
     dt: float,
-    events: list[dict]
+    events
 ) -> None:
-    """Bucle principal: inyecta usuarios, procesa ticks y muestra logs y estados."""
+    """
+    Bucle principal: inyecta usuarios, procesa ticks y muestra logs y estados.
+    `events` puede ser una lista ordenada, un iterable perezoso o un ArrivalSource.
+    """
     total_time = steps * dt
     # Mostrar configuración inicial
     print("====== CONFIGURACIÓN DE SIMULACIÓN ======")
     print(f"Floors: {system.min_floor} to {system.max_floor}")
     print(f"Ticks: {steps}  |  dt: {dt}s  |  Total Time: {total_time}s")
-    print(f"Num Users: {len(events)}")
-    # Mostrar planta inicial de cada usuario
-    print("Usuarios (ID@Origen -> Destino):")
-    for evt in events:
-        print(f"  User{evt['id']}@{evt['origin']} -> {evt['dest']}")
+    if isinstance(events, list):
+        print(f"Num Users: {len(events)}")
+        # Mostrar planta inicial de cada usuario
+        print("Usuarios (ID@Origen -> Destino):")
+        for evt in events:
+            print(f"  User{evt['id']}@{evt['origin']} -> {evt['dest']}")
+    else:
+        print("Num Users: streaming")
     print("========================================\n")
 
+    arrivals = as_arrival_source(events)
+    # La consola sólo recibe los fotogramas de los displays que cambian
+    consoles = [(ctrl.elevator.display, console_display(ctrl)) for ctrl in system.controllers]
+    for display, show in consoles:
+        display.subscribe(show)
     log_index = 0
     for tick in range(1, steps + 1):
         # 1) Avanzar simulación
@@ -123,72 +81,125 @@ def run_simulation(
         for ctrl in system.controllers:
             ctrl.update_users()
 
-        # 2) Inyectar nuevos usuarios
-        for evt in events:
-            if not evt["dispatched"] and evt["time"] <= system.time:
-                print(
-                    f"[t={system.time:.1f}s] Usuario{evt['id']} aparece en piso {evt['origin']} "
-                    f"(destino {evt['dest']}, peso {evt['weight']:.1f}kg)"
-                )
-                user = User(
-                    id=evt['id'],
-                    weight_kg=evt['weight'],
-                    current_floor=evt['origin']
-                )
-                user.call_elevator(
-                    direction="up" if evt['dest'] > evt['origin'] else "down"
-                )
-                system.add_user(user)
-                # calcula la dirección como string
-                dir_str = "up" if evt["dest"] > evt["origin"] else "down"
-                # marca la llamada externa
-                system.dispatch_request(
-                    user.current_floor,
-                    dir_str
-                )
-                user.select_floor(evt['dest'])
-                evt['dispatched'] = True
+        # 2) Inyectar nuevos usuarios (sólo los que vencen en este tick)
+        for evt in arrivals.pop_due(system.time):
+            print(
+                f"[t={system.time:.1f}s] Usuario{evt['id']} aparece en piso {evt['origin']} "
+                f"(destino {evt['dest']}, peso {evt['weight']:.1f}kg)"
+            )
+            system.spawn_user(evt)
 
         # 3) Mostrar nuevos logs
-        new_logs = system.logger.logs[log_index:]
-        for entry in new_logs:
+        for entry in system.logger.history_since(log_index):
             print(entry)
-        log_index = len(system.logger.logs)
-
-        # 4) Actualizar peso en cabina
-        for ctrl in system.controllers:
-            elev = ctrl.elevator
-            elev.current_weight_kg = sum(
-                u.weight_kg for u in ctrl.users if u.inside_elevator
-            )
+        log_index = system.logger.total_logged
 
-        # 5) Mostrar estado actual
+        # 4) Mostrar estado actual
         print(f"-- Tick {tick}/{steps} (t={system.time:.1f}s) --")
         update_displays(system)
         print("" + "-" * 60)
 
+    for display, show in consoles:
+        display.unsubscribe(show)
     print("\nSimulación completada.")
 
 
-def main() -> None:
-    # Parámetros de configuración
-    MIN_FLOOR, MAX_FLOOR = 1, 10
-    STEPS = 200
-    DT = 0.5
-    NUM_USERS = 5
+def run_headless(
+    system: ElevatorSystem,
+    steps: int,
+    dt: float,
+    events,
+    profile: bool = False,
+) -> dict:
+    """
+    Modo rápido sin salida por tick: usa el motor por eventos, desactiva el
+    log y devuelve un resumen con los KPIs y el rendimiento (ticks/s).
+    Con `profile`, añade el tiempo por fase del bucle (clave "profile").
+    """
+    system.logger.disable()
+    if profile:
+        system.enable_profiling()
+    total_time = steps * dt
+    generated = len(events) if isinstance(events, list) else None
+    start = time.perf_counter()
+    system.run_until(total_time, dt, events)
+    wall = time.perf_counter() - start
+    summary = {
+        "floors": [system.min_floor, system.max_floor],
+        "cars": len(system.elevators),
+        "steps": steps,
+        "dt": dt,
+        "sim_time_s": system.time,
+        "wall_time_s": wall,
+        "ticks_per_s": steps / wall if wall > 0 else math.inf,
+        "kpis": collect_kpis(system, total_time, generated),
+    }
+    if profile:
+        summary["profile"] = system.disable_profiling().as_dict()
+    return summary
+
+
+def _json_safe(value):
+    """Sustituye NaN/inf por None para que el resumen sea JSON válido."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Simulador de sistema de ascensores."
+    )
+    parser.add_argument("--floors", type=int, default=10, help="número de plantas (1..N)")
+    parser.add_argument("--cars", type=int, default=1, help="número de ascensores")
+    parser.add_argument("--users", type=int, default=5, help="número de usuarios generados")
+    parser.add_argument("--steps", type=int, default=200, help="número de ticks")
+    parser.add_argument("--dt", type=float, default=0.5, help="duración de cada tick (s)")
+    parser.add_argument("--speed", type=float, default=1.0, help="velocidad de cabina (m/s)")
+    parser.add_argument("--seed", type=int, default=None, help="semilla aleatoria")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="sin salida por tick; imprime sólo un resumen JSON final",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="con --headless, incluye el tiempo por fase del bucle en el resumen",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    min_floor, max_floor = 1, args.floors
+    rng = random.Random(args.seed) if args.seed is not None else None
 
     # 1) Inicializar sistema
-    system = setup_system(MIN_FLOOR, MAX_FLOOR)
+    system = setup_system(min_floor, max_floor)
 
     # 2) Crear ascensores
-    specs = [{"id": 1, "min_floor": MIN_FLOOR, "max_floor": MAX_FLOOR, "speed": 1.0}]
+    specs = [
+        {"id": i, "min_floor": min_floor, "max_floor": max_floor, "speed": args.speed}
+        for i in range(1, args.cars + 1)
+    ]
     setup_elevators(system, specs)
 
     # 3) Generar eventos de usuario
-    events = generate_user_events(NUM_USERS, MIN_FLOOR, MAX_FLOOR, STEPS * DT, DT)
+    events = generate_user_events(
+        args.users, min_floor, max_floor, args.steps * args.dt, args.dt, rng=rng
+    )
 
     # 4) Ejecutar simulación dinámica
-    run_simulation(system, STEPS, DT, events)
+    if args.headless:
+        summary = run_headless(system, args.steps, args.dt, events, profile=args.profile)
+        print(json.dumps(_json_safe(summary), indent=2))
+    else:
+        run_simulation(system, args.steps, args.dt, events)
 
 
 if __name__ == "__main__":
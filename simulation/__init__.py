@@ -9,6 +9,13 @@ from .sensor import Sensor
 from .floor_panel import FloorPanel
 from .logger import Logger
 from .user import User
+from .elevator import Elevator
+from .controller import Controller
+from .elevator_system import ElevatorSystem
+from .dispatch import Dispatcher, EtaDispatcher, FirstCarDispatcher
+from .arrivals import ArrivalSource, EventListSource, StreamSource
+from .fleet import FleetEngine
+from .passengers import PassengerStore
 
 __all__ = [
     "Motor",
@@ -18,6 +25,17 @@ __all__ = [
     "FloorPanel",
     "Logger",
     "User",
+    "Elevator",
+    "Controller",
+    "ElevatorSystem",
+    "Dispatcher",
+    "EtaDispatcher",
+    "FirstCarDispatcher",
+    "ArrivalSource",
+    "EventListSource",
+    "StreamSource",
+    "FleetEngine",
+    "PassengerStore",
 ]
 
 
@@ -0,0 +1,111 @@
+# simulation/arrivals.py
+"""
+Fuentes de llegadas de usuarios ordenadas por tiempo.
+
+Cada llegada es un dict con las claves de generate_user_events:
+time, id, weight, origin y dest. La simulación sólo consulta el tiempo
+de la siguiente llegada y extrae las que ya han vencido, de modo que el
+coste por tick depende de los usuarios que aparecen y no del total.
+"""
+
+import math
+from typing import Dict, Iterable, List
+
+
+class ArrivalSource:
+    """
+    Interfaz común: una cola de llegadas consumida en orden de tiempo.
+    """
+
+    def peek_time(self) -> float:
+        """Tiempo de la siguiente llegada (math.inf si no quedan)."""
+        raise NotImplementedError
+
+    def pop(self) -> Dict:
+        """Extrae y devuelve la siguiente llegada."""
+        raise NotImplementedError
+
+    def pop_due(self, now: float) -> List[Dict]:
+        """Extrae todas las llegadas con tiempo <= now, en orden."""
+        due = []
+        while self.peek_time() <= now:
+            due.append(self.pop())
+        return due
+
+    def exhausted(self) -> bool:
+        """True si ya no quedan llegadas."""
+        return self.peek_time() == math.inf
+
+
+class EventListSource(ArrivalSource):
+    """
+    Cursor sobre una lista ya ordenada (p.ej. la de generate_user_events).
+    Las llegadas marcadas como `dispatched` se saltan.
+    """
+
+    def __init__(self, events: List[Dict]):
+        self._events = events
+        self._cursor = 0
+        self._skip_dispatched()
+
+    def _skip_dispatched(self) -> None:
+        while (
+            self._cursor < len(self._events)
+            and self._events[self._cursor].get("dispatched", False)
+        ):
+            self._cursor += 1
+
+    def peek_time(self) -> float:
+        if self._cursor >= len(self._events):
+            return math.inf
+        return self._events[self._cursor]["time"]
+
+    def pop(self) -> Dict:
+        evt = self._events[self._cursor]
+        self._cursor += 1
+        self._skip_dispatched()
+        return evt
+
+
+class StreamSource(ArrivalSource):
+    """
+    Consume perezosamente cualquier iterable de llegadas (generador,
+    lector de fichero...) manteniendo sólo un elemento de anticipación,
+    de forma que trazas mayores que la memoria se pueden reproducir.
+    """
+
+    def __init__(self, arrivals: Iterable[Dict]):
+        self._it = iter(arrivals)
+        self._next = next(self._it, None)
+        self._last_time = -math.inf
+
+    def peek_time(self) -> float:
+        if self._next is None:
+            return math.inf
+        return self._next["time"]
+
+    def pop(self) -> Dict:
+        evt = self._next
+        if evt is None:
+            raise IndexError("No quedan llegadas en la fuente.")
+        if evt["time"] < self._last_time:
+            raise ValueError(
+                f"Llegada fuera de orden: t={evt['time']} tras t={self._last_time}"
+            )
+        self._last_time = evt["time"]
+        self._next = next(self._it, None)
+        return evt
+
+
+def as_arrival_source(arrivals) -> ArrivalSource:
+    """
+    Adapta `arrivals` a ArrivalSource: las fuentes se devuelven tal cual,
+    las listas se recorren con un cursor y el resto de iterables en streaming.
+    """
+    if arrivals is None:
+        return EventListSource([])
+    if isinstance(arrivals, ArrivalSource):
+        return arrivals
+    if isinstance(arrivals, list):
+        return EventListSource(arrivals)
+    return StreamSource(arrivals)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Callable, Dict, List, Optional
 from .elevator import Elevator
 from .user import User
 from .floor_panel import FloorPanel
@@ -16,6 +16,12 @@ class Controller:
         floor_panels: list[FloorPanel],
         logger: Logger,
         users: list[User] = None,      # <-- parámetro opcional
+        timestamp_fn: Callable[[], float] = None,
+        on_board: Callable[[User], None] = None,
+        on_alight: Callable[[User], None] = None,
+        on_request: Callable[["Controller"], None] = None,
+        on_hall_call: Callable[[int, str], None] = None,
+        on_reject: Callable[[User], None] = None,
     ):
         self.id               = id
         self.elevator         = elevator
@@ -24,19 +30,41 @@ class Controller:
         self.pending_requests = []
         # Inicializa self.users
         self.users            = users if users is not None else []
-
-    def run_tick(self, dt: float) -> None:
+        # Índice de paneles por piso: la cola de espera de cada piso
+        self._panels_by_floor: Dict[int, FloorPanel] = {
+            panel.floor: panel for panel in floor_panels
+        }
+        # Usuarios dentro de este ascensor, indexados por piso destino
+        self.riders: Dict[int, List[User]] = {}
+        # Reloj de simulación para marcar entradas y salidas
+        self.timestamp_fn: Callable[[], float] = timestamp_fn or (lambda: 0.0)
+        # Avisos opcionales cuando un usuario sube y cuando llega a su destino
+        self.on_board: Optional[Callable[[User], None]] = on_board
+        self.on_alight: Optional[Callable[[User], None]] = on_alight
+        # Aviso opcional cuando un usuario sin destino sale de la cola sin subir
+        self.on_reject: Optional[Callable[[User], None]] = on_reject
+        # Aviso opcional al recibir una petición (el sistema despierta la cabina)
+        self.on_request: Optional[Callable[["Controller"], None]] = on_request
+        # Aviso para volver a registrar una llamada de planta (el sistema la
+        # despacha); sin él, la llamada vuelve a este mismo controlador
+        self.on_hall_call: Optional[Callable[[int, str], None]] = on_hall_call
+        # Pisos donde quedó gente por falta de capacidad: su llamada se vuelve
+        # a registrar cuando la cabina se haya ido
+        self.deferred_calls: List[int] = []
+
+    def run_tick(self, dt: float, now: Optional[float] = None) -> None:
         """
         Avanza un ciclo de simulación de dt segundos:
           • Procesa solicitudes pendientes
           • Mueve el ascensor
           • Gestiona la entrada/salida de usuarios
+        `now` es el reloj del sistema tras el tick (ver Elevator.step).
         """
         # 1) Procesar llamadas
         self.handle_requests()
 
         # 2) Mover ascensor
-        self.elevator.step(dt)
+        self.elevator.step(dt, now)
 
         # 3) Actualizar usuarios (entradas/salidas)
         self.update_users()
@@ -46,76 +74,143 @@ class Controller:
 
     def handle_requests(self) -> None:
         """Procesa las solicitudes internas y externas pendientes."""
+        if self.deferred_calls:
+            self._release_deferred_calls()
         # Enviar cada petición al ascensor y registrar evento
         for floor in self.pending_requests:
             # Llamada externa -> uso de call
             self.elevator.call(floor)
-            self.logger.log(f"External request: floor {floor}", level="DEBUG")
+            self.logger.log("External request: floor %s", floor, level="DEBUG")
         # Limpiar lista de pendientes
         self.pending_requests.clear()
 
+    def _release_deferred_calls(self) -> None:
+        """Vuelve a registrar las llamadas de los pisos que la cabina ya ha dejado."""
+        position = self.elevator.position_m
+        keep = []
+        for floor in self.deferred_calls:
+            if position == floor:
+                keep.append(floor)
+                continue
+            panel = self._panels_by_floor.get(floor)
+            for direction in ("up", "down"):
+                if panel is not None and panel.waiting_count(direction):
+                    self.logger.log("Re-registering hall call: floor %s %s", floor, direction, level="INFO")
+                    if self.on_hall_call is not None:
+                        self.on_hall_call(floor, direction)
+                    else:
+                        self.add_external_request(floor)
+        self.deferred_calls = keep
+
     def add_external_request(self, floor: int) -> None:
         """Añade una solicitud de llamada desde un panel exterior."""
         if floor not in self.pending_requests:
             self.pending_requests.append(floor)
-            self.logger.log(f"Added external request: floor {floor}", level="INFO")
+            self.logger.log("Added external request: floor %s", floor, level="INFO")
+            if self.on_request is not None:
+                self.on_request(self)
 
     def add_internal_request(self, floor: int) -> None:
         """Añade una solicitud desde dentro del ascensor."""
         if floor not in self.pending_requests:
             self.pending_requests.append(floor)
-            self.logger.log(f"Added internal request: floor {floor}", level="INFO")
+            self.logger.log("Added internal request: floor %s", floor, level="INFO")
+            if self.on_request is not None:
+                self.on_request(self)
 
     def update_users(self) -> None:
         """
-        Gestiona las interacciones de los usuarios:
-        1) Si un usuario está esperando y el ascensor ha llegado a su piso con puertas OPEN → entra.
-        2) Tras entrar, si tiene un destino, se añade la petición interna.
-        3) Si un usuario está dentro y el ascensor ha llegado a su destino con puertas OPEN → sale.
+        Gestiona las interacciones de los usuarios en el piso actual:
+        1) Con puertas OPEN, los pasajeros cuyo destino es este piso salen.
+        2) Los usuarios en la cola del FloorPanel de este piso entran, en
+           orden de llegada, mientras quepan en weight_limit_kg.
+        3) Tras entrar, se añade la petición interna a su destino. Quien no
+           tiene destino sale de la cola sin subir (se registra un WARNING).
+        La carga se ajusta en cada entrada y salida. Si alguien se queda
+        fuera por capacidad, su llamada se registra de nuevo al irse la
+        cabina. Sólo se consultan los índices del piso actual, así que el
+        coste no depende del número total de usuarios del edificio.
         """
-
-        for user in self.users:
-            # 1) Entrada al ascensor
-            if user.waiting and not user.inside_elevator:
-                if (
-                    self.elevator.current_floor == user.current_floor
-                    and self.elevator.door.is_open()
-                ):
-                    user.enter_elevator()
-                    self.log_event(
-                        f"User {user.id} entered elevator at floor {user.current_floor}"
-                    )
-                    # 2) Petición interna tras entrar
-                    if user.destination_floor is not None:
-                        self.add_internal_request(user.destination_floor)
-
-            # 3) Salida del ascensor
-            if (
-                user.inside_elevator
-                and user.destination_floor == self.elevator.current_floor
-                and self.elevator.door.is_open()
-            ):
-                user.exit_elevator()
-                self.log_event(
-                    f"User {user.id} exited elevator at floor {self.elevator.current_floor}"
-                )
-                # Limpio su destino de la lista si sigue ahí
-                if self.elevator.current_floor in self.elevator.target_floors:
-                    self.elevator.target_floors.remove(self.elevator.current_floor)
-
-
-    def log_event(self, event: str) -> None:
-        """Envía un evento al logger."""
-        self.logger.log(event, level="INFO")
+        elev = self.elevator
+        if not elev.door.is_open():
+            return
+        floor = elev.current_floor
+        now = self.timestamp_fn()
+
+        # 1) Salida del ascensor
+        for user in self.riders.pop(floor, ()):
+            user.exit_elevator(time=now)
+            elev.current_weight_kg -= user.weight_kg
+            self.log_event("User %s exited elevator at floor %s", user.id, floor)
+            if self.on_alight is not None:
+                self.on_alight(user)
+            # Limpio su destino de las paradas si sigue ahí
+            elev.stops.discard(floor)
+        if not self.riders:
+            # Cabina vacía: sin residuos de redondeo en la carga
+            elev.current_weight_kg = 0.0
+
+        # 2) Entrada al ascensor, hasta completar la carga (una cabina vacía
+        #    siempre admite al primero para que nadie se quede sin servicio)
+        panel = self._panels_by_floor.get(floor)
+        if panel is None or not panel.waiting_count():
+            return
+        rejected = True
+        while rejected:
+            rejected = False
+            room = elev.weight_limit_kg - elev.current_weight_kg
+            for user in panel.take_within(room, at_least_one=not self.riders):
+                if user.destination_floor is None:
+                    # Sin destino no habría parada que lo bajara y la cabina
+                    # no volvería a quedar en reposo: sale de la cola sin subir
+                    user.waiting = False
+                    self.logger.log("User %s has no destination floor; not boarded", user.id, level="WARNING")
+                    if self.on_reject is not None:
+                        self.on_reject(user)
+                    rejected = True
+                    continue
+                user.enter_elevator(time=now)
+                elev.current_weight_kg += user.weight_kg
+                self.riders.setdefault(user.destination_floor, []).append(user)
+                self.log_event("User %s entered elevator at floor %s", user.id, floor)
+                if self.on_board is not None:
+                    self.on_board(user)
+                # 3) Petición interna tras entrar
+                self.add_internal_request(user.destination_floor)
+            # Lo que reservaba un rechazado queda libre para los siguientes
+            rejected = rejected and panel.waiting_count() > 0
+        if panel.waiting_count() and floor not in self.deferred_calls:
+            self.log_event("Car full at floor %s: %s left waiting", floor, panel.waiting_count())
+            self.deferred_calls.append(floor)
+
+    def get_riders(self) -> List[User]:
+        """Devuelve los usuarios que viajan dentro de este ascensor."""
+        return [user for riders in self.riders.values() for user in riders]
+
+    def log_event(self, event: str, *args) -> None:
+        """Envía un evento al logger (plantilla %-style formateada bajo demanda)."""
+        self.logger.log(event, *args, level="INFO")
 
     def reset(self) -> None:
         """Reinicia el controlador a su estado inicial."""
         self.pending_requests.clear()
+        self.deferred_calls.clear()
         # Limpiar peticiones del ascensor también
-        self.elevator.target_floors.clear()
+        self.elevator.stops.clear()
         self.logger.log("Controller reset", level="INFO")
         self.time = 0.0
 
+    def is_quiescent(self) -> bool:
+        """
+        True si un run_tick() no cambiaría el estado: no hay peticiones
+        pendientes y el ascensor está aparcado con puertas cerradas.
+        """
+        return (
+            not self.pending_requests
+            and not self.deferred_calls
+            and self.elevator.is_parked()
+        )
+
     def get_active_calls(self) -> List[int]:
         """Devuelve los pisos que han solicitado el ascensor."""
         return list(self.pending_requests)
@@ -0,0 +1,244 @@
+# simulation/dispatch.py
+"""
+Despacho de llamadas de planta entre las cabinas de un edificio.
+
+Un Dispatcher decide qué controlador atiende cada llamada (piso, sentido).
+ElevatorSystem le presenta cada controlador con add_controller() y le pide
+una cabina con select() en cada dispatch_request().
+
+EtaDispatcher (el despacho por defecto) elige la cabina con menor tiempo
+estimado de llegada (ETA) para recoger la llamada en su sentido. El estado
+de ruta de cada cabina es su StopSet, un mapa de bits que se actualiza en
+O(1) al añadir o atender cada parada, más su tabla de tiempos de vuelo;
+de ahí el ETA se lee con unas pocas operaciones de bits y accesos a la
+tabla, sin simular el recorrido, así que asignar una llamada cuesta
+O(cabinas).
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+from .controller import Controller
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(x: int) -> int:
+        return bin(x).count("1")
+
+_ceil, _floor = math.ceil, math.floor
+
+
+class _LowMasks(dict):
+    """_LOW[k] = máscara con los k bits bajos a 1 (se crean bajo demanda)."""
+
+    def __missing__(self, k: int) -> int:
+        mask = self[k] = (1 << k) - 1 if k > 0 else 0
+        return mask
+
+
+_LOW = _LowMasks()
+
+
+class Dispatcher:
+    """
+    Interfaz común: recibe los controladores del edificio y elige uno para
+    cada llamada de planta.
+    """
+
+    def add_controller(self, controller: Controller) -> None:
+        """Registra un controlador (en el orden de ElevatorSystem.controllers)."""
+
+    def clear(self) -> None:
+        """Olvida los controladores registrados."""
+
+    def refresh(self) -> None:
+        """Vuelve a leer los parámetros de las cabinas (p. ej. tras restaurar)."""
+
+    def select(self, floor: int, direction: str) -> Optional[Controller]:
+        """Controlador que atenderá la llamada (None si ninguno puede)."""
+        raise NotImplementedError
+
+    def fresh(self) -> "Dispatcher":
+        """
+        Despacho de la misma clase, sin controladores, para una copia del
+        sistema (ElevatorSystem.fork). Un despacho con parámetros propios
+        debe redefinirlo para conservarlos.
+        """
+        return type(self)()
+
+
+class FirstCarDispatcher(Dispatcher):
+    """Envía todas las llamadas al primer controlador (despacho original)."""
+
+    def __init__(self):
+        self.controllers: List[Controller] = []
+
+    def add_controller(self, controller: Controller) -> None:
+        self.controllers.append(controller)
+
+    def clear(self) -> None:
+        self.controllers.clear()
+
+    def select(self, floor: int, direction: str) -> Optional[Controller]:
+        return self.controllers[0] if self.controllers else None
+
+
+def _route(ctrl: Controller) -> tuple:
+    """Lo que el despacho lee de una cabina (objetos vivos, nunca copias de su estado)."""
+    elev = ctrl.elevator
+    return (ctrl, elev, elev.stops, elev.door, elev.min_floor)
+
+
+def _cheapest(routes: List[tuple], f: int, d: str) -> Tuple[Optional[Controller], float]:
+    """Controlador con menor ETA para la llamada (f, d) y ese ETA."""
+    best, best_cost = None, math.inf
+    for ctrl, elev, stops, door, base in routes:
+        if elev.emergency_state:
+            continue
+        # Tabla de vuelo vigente: se relee en cada decisión, así un cambio de
+        # velocidad, aceleración, puertas o alturas cuenta desde la siguiente
+        table = elev.flight_times
+        n = table._n
+        i = f - base
+        if not 0 <= i < n:
+            continue
+        times = table._time
+
+        # Puertas: lo que falta de la transición en curso (y el cierre si abre)
+        deadline = door.deadline
+        if deadline != math.inf:
+            wait = deadline - door.now
+            if door.status == "opening":
+                wait += door.open_duration
+        elif door.status == "open":
+            wait = door.open_duration
+        else:
+            wait = 0.0
+
+        # Piso desde el que se decide: el siguiente en el sentido de la marcha
+        heading = elev.direction
+        if heading == "up":
+            a = _ceil(elev.position_m) - base
+        elif heading == "down":
+            a = _floor(elev.position_m) - base
+        else:
+            a = elev.current_floor - base
+
+        # El vuelo directo es una cota inferior: si no mejora, no hay ruta que mirar
+        cost = wait + times[a * n + i]
+        if cost >= best_cost:
+            continue
+        # Paradas de la ruta: las de la cabina más las asignadas sin procesar
+        mask = stops._mask
+        for floor in ctrl.pending_requests:
+            mask |= 1 << (floor - base)
+        if mask:
+            cost = _sweep_time(mask, a, i, heading, d, wait, times, n, table.door_time, best_cost)
+        if cost < best_cost:
+            best, best_cost = ctrl, cost
+    return best, best_cost
+
+
+def _sweep_time(
+    mask: int, a: int, i: int, heading: str, d: str, wait: float,
+    times, n: int, door_time: float, bound: float,
+) -> float:
+    """
+    ETA al índice de piso i en sentido d para una cabina en el índice a con
+    paradas `mask`, siguiendo su barrido LOOK. Primero se suman los vuelos;
+    las paradas intermedias (door_time cada una) sólo se cuentan si el
+    vuelo aún baja de `bound`.
+    """
+    hi = mask.bit_length() - 1
+    lo = (mask & -mask).bit_length() - 1
+    if heading == "idle":
+        # Parada más cercana; empate hacia arriba, como StopSet.next_stop
+        above = mask >> a
+        below = mask & _LOW[a + 1]
+        if not above:
+            heading = "down"
+        elif not below:
+            heading = "up"
+        else:
+            up_gap = (above & -above).bit_length() - 1
+            heading = "up" if up_gap <= a - (below.bit_length() - 1) else "down"
+
+    # Tramos del barrido: ida hasta el extremo, vuelta hasta el otro extremo
+    # y de nuevo hacia f. `served` son los rangos [x, y) de paradas atendidas.
+    if heading == "up":
+        top = hi if hi > a else a
+        if d == "down" and i > top:
+            top = i
+        if i >= a and (d == "up" or i == top):
+            cost, served = wait + times[a * n + i], ((a, i),)
+        else:
+            bottom = lo if lo < top else top
+            if d == "up" and i < bottom:
+                bottom = i
+            if i <= top and (d == "down" or i == bottom):
+                cost = wait + times[a * n + top] + times[top * n + i]
+                served = ((a, top + 1), (i + 1, a))
+            else:
+                cost = wait + times[a * n + top] + times[top * n + bottom] + times[bottom * n + i]
+                served = ((a, top + 1), (bottom, a))
+    else:
+        bottom = lo if lo < a else a
+        if d == "up" and i < bottom:
+            bottom = i
+        if i <= a and (d == "down" or i == bottom):
+            cost, served = wait + times[a * n + i], ((i + 1, a + 1),)
+        else:
+            top = hi if hi > bottom else bottom
+            if d == "down" and i > top:
+                top = i
+            if i >= bottom and (d == "up" or i == top):
+                cost = wait + times[a * n + bottom] + times[bottom * n + i]
+                served = ((bottom, a + 1), (a + 1, i))
+            else:
+                cost = wait + times[a * n + bottom] + times[bottom * n + top] + times[top * n + i]
+                served = ((bottom, a + 1), (a + 1, top + 1))
+    if cost >= bound or not door_time:
+        return cost
+    for x, y in served:
+        if y > x:
+            cost += door_time * _popcount(mask >> x & _LOW[y - x])
+    return cost
+
+
+class EtaDispatcher(Dispatcher):
+    """
+    Asigna cada llamada a la cabina que antes pasaría por el piso en el
+    sentido pedido, siguiendo su barrido LOOK: termina lo que le queda en
+    su sentido, da la vuelta en la parada más lejana y así hasta llegar.
+    Cada parada intermedia suma el tiempo de puertas de la cabina y una
+    puerta en movimiento o abierta suma lo que le falta para cerrar.
+    Empate: la primera cabina. Las cabinas en emergencia no se eligen.
+
+    La tabla de vuelo de cada cabina se lee con Elevator.flight_times en
+    cada decisión, así que los cambios de velocidad, aceleración, puertas
+    o alturas de piso se tienen en cuenta sin avisar al despacho.
+    """
+
+    def __init__(self):
+        self._routes: List[tuple] = []
+
+    def add_controller(self, controller: Controller) -> None:
+        self._routes.append(_route(controller))
+
+    def clear(self) -> None:
+        self._routes.clear()
+
+    def refresh(self) -> None:
+        """Vuelve a leer las paradas y puertas de cada cabina (p. ej. tras restaurar)."""
+        self._routes = [_route(route[0]) for route in self._routes]
+
+    def select(self, floor: int, direction: str) -> Optional[Controller]:
+        return _cheapest(self._routes, floor, direction)[0]
+
+    def estimate(self, controller: Controller, floor: int, direction: str) -> float:
+        """ETA (s) de `controller` para la llamada (math.inf si no puede atenderla)."""
+        for route in self._routes:
+            if route[0] is controller:
+                return _cheapest([route], floor, direction)[1]
+        raise ValueError(f"Controlador {controller.id} no registrado en el despacho")
@@ -1,6 +1,17 @@
+from typing import Callable, List, Optional
+
+# Símbolo de dirección que muestra el display para cada dirección de cabina
+ARROWS = {"up": "↑", "down": "↓"}
+
+
 class Display:
     """
     Muestra información visual del estado del ascensor.
+
+    Cada cambio real de piso, dirección, puerta o error incrementa `version`;
+    render() reutiliza el texto mientras la versión no cambie y publish()
+    entrega el fotograma a los suscriptores sólo si ha cambiado desde la
+    última publicación.
     """
 
     def __init__(
@@ -9,17 +20,65 @@ class Display:
     ):
         # Identificador único del display
         self.id: int = id
+        # Versión del contenido: sube con cada cambio de lo que se muestra
+        self.version: int = 0
+        # Texto renderizado y versión a la que corresponde
+        self._frame: Optional[str] = None
+        self._frame_version: int = -1
+        # Última versión entregada a los suscriptores
+        self._published: int = -1
+        self._subscribers: List[Callable[["Display", str], None]] = []
         # Piso mostrado actualmente
-        self.current_floor: int = 0
+        self._current_floor: int = 0
         # Dirección mostrada: "↑", "↓" o "—"
-        self.direction: str = "—"
+        self._direction: str = "—"
         # Estado de la puerta mostrado: "open", "closed", "moving"
-        self.door_status: str = "closed"
+        self._door_status: str = "closed"
         # Mensaje de error o advertencia
-        self.error_message: str = ""
+        self._error_message: str = ""
         # Modo: "internal" o "external"
         self.mode: str = "internal"
 
+    @property
+    def current_floor(self) -> int:
+        return self._current_floor
+
+    @current_floor.setter
+    def current_floor(self, value: int) -> None:
+        if value != self._current_floor:
+            self._current_floor = value
+            self.version += 1
+
+    @property
+    def direction(self) -> str:
+        return self._direction
+
+    @direction.setter
+    def direction(self, value: str) -> None:
+        if value != self._direction:
+            self._direction = value
+            self.version += 1
+
+    @property
+    def door_status(self) -> str:
+        return self._door_status
+
+    @door_status.setter
+    def door_status(self, value: str) -> None:
+        if value != self._door_status:
+            self._door_status = value
+            self.version += 1
+
+    @property
+    def error_message(self) -> str:
+        return self._error_message
+
+    @error_message.setter
+    def error_message(self, value: str) -> None:
+        if value != self._error_message:
+            self._error_message = value
+            self.version += 1
+
     def update_floor(self, floor: int) -> None:
         """Actualiza el piso mostrado."""
         self.current_floor = floor
@@ -32,6 +91,12 @@ class Display:
         """Actualiza el estado de la puerta en pantalla."""
         self.door_status = status
 
+    def update(self, floor: int, direction: str, door_status: str) -> None:
+        """Actualiza piso, dirección y puerta de una vez."""
+        self.current_floor = floor
+        self.direction = direction
+        self.door_status = door_status
+
     def show_error(self, msg: str) -> None:
         """Muestra un mensaje de error o advertencia."""
         self.error_message = msg
@@ -40,13 +105,42 @@ class Display:
         """Limpia el mensaje de error actual."""
         self.error_message = ""
 
+    def is_dirty(self) -> bool:
+        """True si hay cambios sin publicar."""
+        return self.version != self._published
+
     def render(self) -> str:
         """Devuelve una representación visual del display para impresión o logs."""
-        parts = [
-            f"Floor: {self.current_floor}",
-            f"Direction: {self.direction}",
-            f"Door: {self.door_status}"
-        ]
-        if self.error_message:
-            parts.append(f"Error: {self.error_message}")
-        return " | ".join(parts)
+        if self._frame_version != self.version:
+            parts = [
+                f"Floor: {self._current_floor}",
+                f"Direction: {self._direction}",
+                f"Door: {self._door_status}"
+            ]
+            if self._error_message:
+                parts.append(f"Error: {self._error_message}")
+            self._frame = " | ".join(parts)
+            self._frame_version = self.version
+        return self._frame
+
+    def subscribe(self, callback: Callable[["Display", str], None]) -> None:
+        """Registra `callback(display, frame)`, llamado en cada publicación con cambios."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[["Display", str], None]) -> None:
+        """Retira un suscriptor registrado con subscribe()."""
+        self._subscribers.remove(callback)
+
+    def publish(self) -> bool:
+        """
+        Entrega el fotograma actual a los suscriptores si ha cambiado desde
+        la última publicación. Devuelve True si lo ha entregado.
+        """
+        if self.version == self._published:
+            return False
+        self._published = self.version
+        if self._subscribers:
+            frame = self.render()
+            for callback in list(self._subscribers):
+                callback(self, frame)
+        return True
@@ -1,6 +1,15 @@
+import math
+from typing import Optional
+
+
 class Door:
     """
     Gestiona la apertura y cierre de las puertas del ascensor.
+
+    Las transiciones se guardan como un instante absoluto (`deadline`) sobre
+    el reloj de simulación de la puerta (`now`), no como un temporizador que
+    se descuenta en cada tick: entre transiciones tick() sólo avanza el reloj
+    y next_transition() dice cuándo ocurrirá el siguiente cambio de estado.
     """
 
     def __init__(
@@ -12,8 +21,10 @@ class Door:
         self.id: int = id
         # Estado actual: "open", "closed", "opening", "closing"
         self.status: str = "closed"
-        # Temporizador de acción (s)
-        self.timer: float = 0.0
+        # Reloj de simulación visto por la puerta (s)
+        self.now: float = 0.0
+        # Instante en que termina la apertura/cierre en curso (inf si no hay)
+        self.deadline: float = math.inf
         # Duración de apertura antes de cerrar automáticamente (s) y también para cierre
         self.open_duration: float = open_duration
         # Indica si la puerta está bloqueada por objeto o sensor de seguridad
@@ -23,11 +34,28 @@ class Door:
         # Bloqueo por emergencia
         self.emergency_locked: bool = False
 
+    @property
+    def timer(self) -> float:
+        """Tiempo que falta para terminar la transición en curso (s)."""
+        if self.deadline == math.inf:
+            return 0.0
+        return max(self.deadline - self.now, 0.0)
+
+    def next_transition(self) -> float:
+        """Instante del siguiente cambio de estado (math.inf si la puerta está quieta)."""
+        return self.deadline
+
+    def sync(self, now: float) -> None:
+        """Sitúa el reloj de la puerta en `now` (p. ej. tras un salto del motor por eventos)."""
+        self.now = now
+        if now >= self.deadline:
+            self._finish()
+
     def open(self) -> None:
         """Inicia la secuencia de apertura de la puerta."""
         # Siempre permite apertura
         self.status = "opening"
-        self.timer = self.open_duration
+        self.deadline = self.now + self.open_duration
 
     def close(self) -> None:
         """Inicia la secuencia de cierre de la puerta."""
@@ -35,12 +63,12 @@ class Door:
         if self.blocked or self.emergency_locked:
             return
         self.status = "closing"
-        self.timer = self.open_duration
+        self.deadline = self.now + self.open_duration
 
     def force_open(self) -> None:
         """Abre la puerta ignorando condiciones normales (emergencia o bloqueo)."""
         self.status = "open"
-        self.timer = 0.0
+        self.deadline = math.inf
 
     def lock_emergency(self) -> None:
         """Bloquea la puerta en estado de emergencia."""
@@ -54,19 +82,20 @@ class Door:
         """Establece estado de bloqueo por sensor o manual."""
         self.blocked = value
 
-    def tick(self, dt: float) -> None:
-        """Avanza el temporizador, actualiza `status` si la acción finaliza."""
-        if self.status == "opening":
-            self.timer -= dt
-            if self.timer <= 0:
-                self.status = "open"
-                self.timer = 0.0
-        elif self.status == "closing":
-            self.timer -= dt
-            if self.timer <= 0:
-                # Al cerrar, el bloqueo debe impedir reapertura accidental
-                self.status = "closed"
-                self.timer = 0.0
+    def tick(self, dt: float, now: Optional[float] = None) -> None:
+        """
+        Avanza el reloj dt segundos y completa la transición si vence. Si se
+        da `now` (el reloj del sistema tras el tick), el reloj se pone en ese
+        instante en vez de sumar dt.
+        """
+        self.now = self.now + dt if now is None else now
+        if self.now >= self.deadline:
+            self._finish()
+
+    def _finish(self) -> None:
+        # Al cerrar, el bloqueo debe impedir reapertura accidental
+        self.status = "open" if self.status == "opening" else "closed"
+        self.deadline = math.inf
 
     def is_open(self) -> bool:
         """True si la puerta está completamente abierta."""
@@ -78,4 +107,4 @@ class Door:
 
     def is_moving(self) -> bool:
         """True si la puerta está en transición de apertura/cierre."""
-        return self.status in ("opening", "closing")
+        return self.deadline != math.inf
@@ -1,10 +1,14 @@
+import math
+
 from .motor import Motor
+from .motion import MotionProfile
+from .flight_times import FlightTimeTable, elevation_at, elevations, position_at, shared_table
 from .door import Door
-from .display import Display
+from .display import ARROWS, Display
 from .sensor import Sensor
 from .logger import Logger
-from typing import List, TYPE_CHECKING
-from .user import User
+from typing import Callable, List, Optional, Sequence, TYPE_CHECKING
+from .stops import StopSet
 
 if TYPE_CHECKING:
     from .elevator_system import ElevatorSystem
@@ -18,11 +22,13 @@ class Elevator:
     def __init__(
         self,
         id: int,
-        system: "ElevatorSystem",
+        system: "ElevatorSystem" = None,
         min_floor: int = 1,
         max_floor: int = 10,
         weight_limit_kg: float = 600.0,
         speed_mps: float = 1.0,
+        acceleration_mps2: float = math.inf,
+        floor_heights: Optional[Sequence[float]] = None,
     ):
         # Referencia al sistema
         self.system = system
@@ -35,16 +41,25 @@ class Elevator:
         # Estado dinámico
         self.current_floor = min_floor
         self.position_m = float(min_floor)
-        self.target_floors: List[int] = []
+        # Paradas pendientes (mapa de bits con consultas en orden LOOK)
+        self.stops = StopSet(min_floor, max_floor)
         self.direction = "idle"   # "up", "down", "idle"
         self.is_moving = False
+        # Tiempo acumulado en servicio (moviéndose o con puertas en uso)
+        self.busy_time = 0.0
 
         # Control de puertas
         self.door = Door(id=self.id)
         self._just_opened = False
 
-        # Velocidad
-        self.speed_mps = speed_mps
+        # Motor: velocidad máxima y aceleración del perfil de viaje
+        # (aceleración infinita = velocidad constante)
+        self.motor = Motor(id=self.id, max_speed=speed_mps, acceleration=acceleration_mps2)
+        # Viaje en curso hacia la siguiente parada (perfil analítico)
+        self._trip: Optional[MotionProfile] = None
+        # Alturas de los tramos entre pisos (None = cada piso mide 1)
+        self.floor_heights = floor_heights
+        self._flight_times: Optional[FlightTimeTable] = None
 
         # Carga
         self.weight_limit_kg = weight_limit_kg
@@ -52,50 +67,127 @@ class Elevator:
         self.emergency_state = False
 
         # Componentes auxiliares
-        self.motor = Motor(id=self.id, max_speed=self.speed_mps)
         self.display = Display(id=self.id)
         self.logger = Logger()
 
-        # Pasajeros dentro
-        self.passengers: List[User] = []
-
+        # Aviso al recibir una parada (el sistema despierta la cabina aparcada)
+        self.on_call: Optional[Callable[[], None]] = None
+
+
+    @property
+    def speed_mps(self) -> float:
+        """Velocidad de crucero (la velocidad máxima del motor)."""
+        return self.motor.max_speed
+
+    @speed_mps.setter
+    def speed_mps(self, value: float) -> None:
+        self.motor.max_speed = value
+
+    @property
+    def acceleration_mps2(self) -> float:
+        """Aceleración y deceleración del motor (math.inf = velocidad constante)."""
+        return self.motor.acceleration
+
+    @acceleration_mps2.setter
+    def acceleration_mps2(self, value: float) -> None:
+        self.motor.acceleration = value
+
+    @property
+    def floor_heights(self) -> Optional[tuple]:
+        """Altura de cada tramo entre pisos consecutivos, o None si son uniformes."""
+        return self._floor_heights
+
+    @floor_heights.setter
+    def floor_heights(self, value: Optional[Sequence[float]]) -> None:
+        self._floor_heights = None if value is None else tuple(value)
+        # Cotas de cada piso, sólo si hay que traducir posición <-> cota
+        self._levels = (
+            None if value is None else elevations(self.min_floor, self.max_floor, value)
+        )
+
+    @property
+    def flight_times(self) -> FlightTimeTable:
+        """
+        Tabla de tiempos de vuelo de esta cabina (compartida con las cabinas
+        de iguales parámetros). Se obtiene la primera vez y se vuelve a
+        obtener si cambian velocidad, aceleración, duración de puertas o
+        alturas de piso.
+        """
+        motor = self.motor
+        table = self._flight_times
+        # Comparación campo a campo (sin construir la clave): es barata y el
+        # despacho la hace en cada decisión
+        if (
+            table is None
+            or table.max_speed != motor.max_speed
+            or table.acceleration != motor.acceleration
+            or table.door_time != 2 * self.door.open_duration
+            or table.key[3] != (self._floor_heights or ())
+        ):
+            table = self._flight_times = shared_table(
+                self.min_floor, self.max_floor, motor.max_speed,
+                motor.acceleration, 2 * self.door.open_duration, self._floor_heights,
+            )
+        return table
 
     def call(self, floor: int) -> None:
-        if self.min_floor <= floor <= self.max_floor and floor not in self.target_floors:
-            self.target_floors.append(floor)
+        if self.min_floor <= floor <= self.max_floor:
+            self.stops.add(floor)
+            if self.on_call is not None:
+                self.on_call()
 
     def select_floor(self, floor: int) -> None:
-        if self.min_floor <= floor <= self.max_floor and floor not in self.target_floors:
-            self.target_floors.append(floor)
-
-    def step(self, dt: float) -> None:
+        if self.min_floor <= floor <= self.max_floor:
+            self.stops.add(floor)
+            if self.on_call is not None:
+                self.on_call()
+
+    @property
+    def target_floors(self) -> List[int]:
+        """Paradas pendientes en el orden en que se atenderán (LOOK)."""
+        return self.stops.in_service_order(self.position_m, self.direction)
+
+    def next_stop(self) -> Optional[int]:
+        """Siguiente parada en orden LOOK desde la posición actual."""
+        return self.stops.next_stop(self.position_m, self.direction)
+
+    def step(self, dt: float, now: Optional[float] = None) -> None:
+        """
+        Avanza la cabina dt segundos. `now` es el reloj del sistema tras el
+        tick: la puerta lo toma tal cual (ver Door.tick) en vez de sumar dt.
+        """
         if self.emergency_state:
             return
+        if not self.is_parked():
+            self.busy_time += dt
 
-        # 1) Avanza la animación de la puerta
-        self.door.tick(dt)
+        # 1) Avanza el reloj de la puerta (sólo cambia de estado al vencer
+        #    su deadline)
+        door = self.door
+        door.tick(dt, now)
 
-        # 2) Si justo acabó de abrir, cargo/descargo y cierro
+        # 2) Si justo acabó de abrir, cierro: el embarque y desembarque ya
+        #    los ha hecho Controller.update_users con las puertas abiertas
         if self._just_opened:
-            self.unload_passengers()
-            self.load_passengers()
             self._just_opened = False
-            self.door.close()
+            door.close()
             return
 
-        # 3) Si la puerta está en transición, esperamos
-        if self.door.is_moving():
+        # 3) Si la puerta está en transición, esperamos hasta su deadline
+        if door.deadline != math.inf:
             return
 
         # 4) Si la puerta está completamente abierta y no hemos marcado aún
-        if self.door.is_open() and not self._just_opened:
-            # marcamos para que en el siguiente tick ejecute load/unload
+        if door.status == "open":
+            # marcamos para que en el siguiente tick se cierre
             self._just_opened = True
             return
 
         # 5) Aquí la puerta está completamente cerrada
-        if not self.target_floors:
+        if not self.stops:
             self.is_moving = False
+            self.direction = "idle"
+            self._trip = None
             return
 
         # 6) Movemos hacia la siguiente parada
@@ -104,29 +196,115 @@ class Elevator:
 
 
     def move_towards_target(self, dt: float) -> None:
-        if not self.target_floors:
+        next_floor = self.next_stop()
+        if next_floor is None:
+            return
+        trip = self._trip
+        if trip is not None and next_floor != trip.floor:
+            # Parada nueva por delante: se replanifica desde la posición y
+            # velocidad actuales sólo si aún da tiempo a frenar en ella
+            ahead = (self._elevation(next_floor) - self._elevation(self.position_m)) * trip.direction
+            if ahead > 0 and ahead >= trip.braking_distance():
+                trip = self._start_trip(next_floor, trip.speed(trip.elapsed))
+        if trip is None:
+            # Si ya estamos parados en la parada, se atiende sin moverse
+            if next_floor == self.position_m:
+                self.direction = "idle"
+                self._arrive(next_floor)
+                return
+            trip = self._start_trip(next_floor, 0.0)
+
+        self.direction = "up" if trip.direction > 0 else "down"
+        trip.elapsed += dt
+        if trip.elapsed >= trip.total:
+            self._arrive(trip.floor)
             return
 
-        next_floor = self.target_floors[0]
-        self.update_direction()
-
-        # Mover "físico"
-        delta = self.speed_mps * dt * (1 if self.direction == "up" else -1)
-        self.position_m += delta
-
-        # Actualizar piso actual
-        new_floor = int(self.position_m)
-        if new_floor != self.current_floor:
-            self.current_floor = new_floor
-
-        # Si llegamos o pasamos el destino
-        if ((self.direction == "up" and self.position_m >= next_floor) or
-            (self.direction == "down" and self.position_m <= next_floor)):
-            self.position_m = float(next_floor)
-            self.current_floor = next_floor
-            self.target_floors.pop(0)
-            self.open_door()
+        self._follow_trip(trip)
 
+    def _follow_trip(self, trip: MotionProfile) -> None:
+        """Sitúa la cabina donde indica el viaje en su instante actual."""
+        # Posición en forma cerrada: no depende del tamaño de dt
+        if self._levels is None:
+            self.position_m = trip.position()
+        else:
+            self.position_m = position_at(self._levels, self.min_floor, trip.position())
+        self.current_floor = int(self.position_m)
+        self.motor.current_speed = trip.direction * trip.speed(trip.elapsed)
+        self.motor.direction = self.direction
+
+    def next_event_in(self) -> float:
+        """
+        Segundos hasta el próximo cambio discreto de estado: fin de la
+        transición de puertas (Door.next_transition) o llegada a la parada
+        (time_to_arrival). 0 si el próximo step() ya cambia algo más que
+        relojes y posición; math.inf si la cabina está aparcada.
+        """
+        if self.emergency_state:
+            return math.inf
+        door = self.door
+        if self._just_opened:
+            return 0.0
+        if door.deadline != math.inf:
+            return door.next_transition() - door.now
+        if door.status != "closed":
+            return 0.0
+        if not self.stops:
+            return 0.0 if self.is_moving else math.inf
+        trip = self._trip
+        if trip is None or self.next_stop() != trip.floor:
+            return 0.0
+        return self.time_to_arrival()
+
+    def skip(self, dt: float, ticks: int = 1, now: Optional[float] = None) -> None:
+        """
+        Avanza `ticks` ticks de dt segundos sin eventos (ver next_event_in):
+        sólo corren los relojes y, si hay viaje, la posición sobre su perfil.
+        Los relojes suman dt tick a tick como step(), para que el resultado
+        no dependa de cuántos ticks se salten de una vez; la posición se
+        calcula una sola vez al final. `now` es como en step().
+        """
+        door = self.door
+        trip = self._trip
+        moving = trip is not None and door.deadline == math.inf
+        busy = self.busy_time
+        elapsed = trip.elapsed if moving else 0.0
+        clock = door.now
+        for _ in range(ticks):
+            busy += dt
+            elapsed += dt
+            clock += dt
+        self.busy_time = busy
+        door.now = clock if now is None else now
+        if moving:
+            trip.elapsed = elapsed
+            self._follow_trip(trip)
+
+    def _elevation(self, position: float) -> float:
+        """Cota de una posición en pisos (la propia posición si los pisos miden 1)."""
+        if self._levels is None:
+            return position
+        return elevation_at(self._levels, self.min_floor, position)
+
+    def _start_trip(self, floor: int, v0: float) -> MotionProfile:
+        self._trip = MotionProfile(
+            self._elevation(self.position_m), self._elevation(floor), v0,
+            self.motor.max_speed, self.motor.acceleration, floor,
+        )
+        return self._trip
+
+    def time_to_arrival(self) -> float:
+        """Segundos que faltan para llegar a la parada del viaje en curso (0 si no hay)."""
+        return self._trip.remaining_time() if self._trip is not None else 0.0
+
+    def _arrive(self, floor: int) -> None:
+        self._trip = None
+        self.motor.current_speed = 0.0
+        self.motor.direction = "stopped"
+        self.position_m = float(floor)
+        self.current_floor = floor
+        self.stops.discard(floor)
+        self.open_door()
 
     def open_door(self) -> None:
         self.door.open()
@@ -136,45 +314,56 @@ class Elevator:
     def activate_emergency(self) -> None:
         self.emergency_state = True
         self.is_moving = False
-        self.target_floors.clear()
+        self._trip = None
+        self.motor.current_speed = 0.0
+        self.motor.direction = "stopped"
+        self.stops.clear()
         self.open_door()
+        self.display.show_error("EMERGENCY")
 
     def reset_emergency(self) -> None:
         self.emergency_state = False
+        self.display.clear_error()
         # No devolvemos la puerta a cerrar aquí, se manejará en step()
 
     def is_idle(self) -> bool:
-        return not self.target_floors and not self.is_moving
-
-    def unload_passengers(self) -> None:
-        offboard = [u for u in self.passengers
-                    if u.destination == self.current_floor]
-        for u in offboard:
-            self.passengers.remove(u)
-            self.current_weight_kg -= u.weight_kg
-            u.exit(self.current_floor)
-            self.logger.info(f"User {u.id} left at floor {self.current_floor}")
-
-    def load_passengers(self) -> None:
-        waiting = self.system.floor_panels[self.current_floor] \
-                            .get_waiting_users(self.current_floor,
-                                               self.direction)
-        for u in waiting:
-            self.passengers.append(u)
-            self.current_weight_kg += u.weight_kg
-            self.internal_panel.press(u.destination)
-            self.logger.info(
-                f"User {u.id} boarded at floor {self.current_floor} → dest {u.destination}"
-            )
+        return not self.stops and not self.is_moving
+
+    def is_parked(self) -> bool:
+        """
+        True si un step() no cambiaría nada: sin destinos, parado y con
+        puertas cerradas (o bloqueado en emergencia).
+        """
+        if self.emergency_state:
+            return True
+        return (
+            self.is_idle()
+            and self.door.is_closed()
+            and not self._just_opened
+        )
+
+    def update_display(self) -> bool:
+        """
+        Vuelca piso, dirección y puerta al display y publica el fotograma si
+        ha cambiado. Devuelve True si lo ha publicado.
+        """
+        display = self.display
+        display.update(self.current_floor, ARROWS.get(self.direction, "—"), self.door.status)
+        return display.publish()
+
+    @property
+    def door_status(self) -> str:
+        """Estado actual de la puerta ("open", "closed", "opening", "closing")."""
+        return self.door.status
 
     def update_direction(self) -> None:
-        if not self.target_floors:
+        next_floor = self.next_stop()
+        if next_floor is None:
             self.direction = "idle"
             return
-        next_floor = self.target_floors[0]
-        if next_floor > self.current_floor:
+        if next_floor > self.position_m:
             self.direction = "up"
-        elif next_floor < self.current_floor:
+        elif next_floor < self.position_m:
             self.direction = "down"
         else:
             self.direction = "idle"
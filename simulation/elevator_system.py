@@ -1,10 +1,20 @@
 # simulation/elevator_system.py
 
+import math
+import random
+import time
+from functools import partial
+
+from .arrivals import ArrivalSource, StreamSource, as_arrival_source
 from .controller import Controller
+from .dispatch import Dispatcher, EtaDispatcher
 from .floor_panel import FloorPanel
 from .user import User
 from .logger import Logger
-from typing import List, Dict
+from .histogram import LogHistogram
+from .passengers import PassengerStore
+from .profiling import PhaseTimer
+from typing import List, Dict, Optional
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -17,6 +27,9 @@ class ElevatorSystem:
         min_floor: int = 1,
         max_floor: int = 10,
         logger: Logger = None,
+        passenger_store: PassengerStore = None,
+        rng: random.Random = None,
+        dispatcher: Dispatcher = None,
     ):
         self.min_floor = min_floor
         self.max_floor = max_floor
@@ -28,6 +41,35 @@ class ElevatorSystem:
         self.users: List[User] = []
         self.logger: Logger = logger or Logger()
         self.time: float = 0.0
+        # El reloj se deriva de un contador entero de ticks (ver _advance):
+        # time = _epoch + _ticks·_tick_dt, sin acumular el redondeo de dt
+        self._epoch: float = 0.0
+        self._tick_dt: float = 0.0
+        self._ticks: int = 0
+        # Último valor de `time` puesto por _advance (si cambia por fuera, se rebasa)
+        self._clock_at: float = 0.0
+        # Con almacén columnar, los usuarios viven en él mientras están en
+        # el edificio y no se acumulan en `users` tras llegar a su destino
+        self.passenger_store: Optional[PassengerStore] = passenger_store
+        self.delivered_count: int = 0
+        # Generador aleatorio propio de la simulación (se guarda en snapshot)
+        self.rng: Optional[random.Random] = rng
+        # Política de despacho de llamadas de planta (por defecto, menor ETA)
+        self.dispatcher: Dispatcher = dispatcher or EtaDispatcher()
+        # Registro opcional del estado por tick (ver recorder.StateRecorder)
+        self.recorder = None
+        # Llegadas en streaming de run_until, adaptadas una sola vez (ver _arrival_source)
+        self._stream: Optional[tuple] = None
+        # Medición opcional por fases (ver enable_profiling)
+        self.profiler: Optional[PhaseTimer] = None
+        # KPIs de servicio en streaming: memoria fija sea cual sea el tráfico
+        self.wait_histogram = LogHistogram()
+        self.journey_histogram = LogHistogram()
+        # Conjunto activo: controladores con trabajo pendiente, en el orden de
+        # `controllers`. Los aparcados no se ejecutan hasta que se despiertan.
+        self._active: List[Controller] = []
+        self._awake: set = set()
+        self._order: Dict[Controller, int] = {}
 
         # paneles de planta
         self.floor_panel: Dict[int, FloorPanel] = {
@@ -53,34 +95,339 @@ class ElevatorSystem:
 
     def add_elevator(self, elevator: "Elevator", controller: Controller) -> None:
         self.elevators.append(elevator)
-        # Vinculamos el listado global de usuarios al controlador
+        # La puerta mide sus deadlines con el reloj de la simulación
+        elevator.door.sync(self.time)
+        # Vinculamos el listado global de usuarios y el reloj al controlador
         controller.users = self.users
+        controller.timestamp_fn = self.get_time
+        controller.on_board = self.user_boarded
+        controller.on_alight = self.user_delivered
+        controller.on_reject = self.user_rejected
+        controller.on_request = self.wake
+        controller.on_hall_call = self.dispatch_request
+        # Una parada directa (Elevator.call/select_floor) también la despierta
+        elevator.on_call = partial(self.wake, controller)
+        self._order[controller] = len(self.controllers)
         self.controllers.append(controller)
+        self.dispatcher.add_controller(controller)
+        if not controller.is_quiescent():
+            self.wake(controller)
+
+    def wake(self, controller: Controller) -> None:
+        """
+        Añade un controlador al conjunto activo. Lo hacen las peticiones
+        (despacho o embarque) y las paradas directas (Elevator.call o
+        select_floor); tras otras manipulaciones de una cabina (emergencias,
+        cambios de estado a mano) hay que despertarla a mano.
+        """
+        if controller in self._awake:
+            return
+        self._awake.add(controller)
+        elev = controller.elevator
+        # Mientras dormía su puerta no ha avanzado: se pone en hora
+        if not elev.emergency_state:
+            elev.door.sync(self.time)
+        self._active = sorted(self._awake, key=self._order.__getitem__)
+
+    def active_controllers(self) -> List[Controller]:
+        """Controladores que se ejecutan en el próximo tick."""
+        return list(self._active)
+
+    def _rebuild_active(self) -> None:
+        """Recalcula el conjunto activo desde el estado (tras restaurar)."""
+        self._awake = {ctrl for ctrl in self.controllers if not ctrl.is_quiescent()}
+        self._active = sorted(self._awake, key=self._order.__getitem__)
+
+    def _retire_idle(self) -> None:
+        """Saca del conjunto activo los controladores que han quedado aparcados."""
+        idle = [ctrl for ctrl in self._active if ctrl.is_quiescent()]
+        if idle:
+            self._awake.difference_update(idle)
+            self._active = [ctrl for ctrl in self._active if ctrl in self._awake]
+
+    def get_time(self) -> float:
+        """Devuelve el tiempo de simulación actual (s)."""
+        return self.time
 
     def add_user(self, user: User) -> None:
-        """Añade un usuario al sistema."""
-        self.users.append(user)
+        """
+        Añade un usuario al sistema. Si está esperando, entra en la cola del
+        FloorPanel de su piso, que es el índice que consultan los controladores.
+        """
+        if self.passenger_store is None:
+            self.users.append(user)
+        panel = self.floor_panels.get(user.current_floor)
+        if user.waiting and panel is not None:
+            panel.call(user)
+
+    def spawn_user(self, evt: Dict) -> User:
+        """
+        Materializa un evento de llegada (time, id, weight, origin, dest):
+        crea el User, lo registra y lanza la llamada externa.
+        """
+        direction = "up" if evt["dest"] > evt["origin"] else "down"
+        if self.passenger_store is not None:
+            user = self.passenger_store.new_user(evt["id"], evt["weight"], evt["origin"])
+        else:
+            user = User(
+                id=evt["id"],
+                weight_kg=evt["weight"],
+                current_floor=evt["origin"]
+            )
+        # El destino se conoce desde la llegada; select_floor() sólo actúa
+        # dentro de la cabina, así que se fija directamente.
+        user.destination_floor = evt["dest"]
+        user.call_elevator(direction=direction, time=self.time)
+        self.add_user(user)
+        self.dispatch_request(user.current_floor, direction)
+        evt["dispatched"] = True
+        return user
+
+    def user_boarded(self, user: User) -> None:
+        """Un usuario ha subido a una cabina: se registra su tiempo de espera."""
+        wait = user.wait_time()
+        if wait is not None:
+            self.wait_histogram.record(wait)
+
+    def user_delivered(self, user: User) -> None:
+        """
+        Un usuario ha llegado a su destino: se registra su tiempo de viaje y,
+        si vive en el almacén, se libera su fila.
+        """
+        self.delivered_count += 1
+        journey = user.journey_time()
+        if journey is not None:
+            self.journey_histogram.record(journey)
+        if self.passenger_store is not None:
+            self.passenger_store.release(user)
+
+    def user_rejected(self, user: User) -> None:
+        """
+        Un usuario sin destino ha salido de la cola sin subir: ya no está en
+        ninguna cola ni cabina, así que si vive en el almacén se libera su fila.
+        """
+        if self.passenger_store is not None:
+            self.passenger_store.release(user)
+
+    def service_stats(self) -> Dict[str, Dict]:
+        """Resumen (recuento, media, p50/p90/p99, máximo) de esperas y viajes."""
+        return {
+            "wait": self.wait_histogram.summary(),
+            "journey": self.journey_histogram.summary(),
+        }
+
+    def refresh_loads(self) -> None:
+        """
+        Recalcula desde cero el peso en cabina de cada ascensor a partir de
+        sus usuarios. El bucle no lo necesita (los controladores ajustan la
+        carga en cada entrada y salida); sirve como comprobación.
+        """
+        for ctrl in self.controllers:
+            ctrl.elevator.current_weight_kg = sum(
+                u.weight_kg for u in ctrl.get_riders()
+            )
 
     def dispatch_request(self, floor: int, direction: str) -> None:
         """
-        Asigna una llamada externa a un controlador.
-        De momento, despacha siempre al primer controlador.
+        Asigna una llamada externa al controlador que elija el dispatcher
+        (ver dispatch.py).
         """
-        if not self.controllers:
+        ctrl = self.dispatcher.select(floor, direction)
+        if ctrl is None:
+            if self.controllers:
+                self.logger.log("No car available for floor %s %s", floor, direction, level="WARNING")
             return
-        ctrl = self.controllers[0]
         ctrl.add_external_request(floor)
-        self.logger.log(f"Dispatched external call for floor {floor}", "INFO")
+        self.logger.log("Dispatched external call for floor %s %s to car %s", floor, direction, ctrl.elevator.id, level="INFO")
 
     def run_tick(self, dt: float) -> None:
         """
         Ejecuta un ciclo de simulación de dt segundos:
-        - Incrementa el tiempo global.
-        - Llama a run_tick(dt) de cada controlador.
+        - Incrementa el tiempo global (ver _advance).
+        - Llama a run_tick(dt) de cada controlador activo (los aparcados
+          no cambiarían nada) y retira los que quedan aparcados.
+        - Si hay recorder, le pasa el estado del tick.
         """
-        self.time += dt
-        for ctrl in self.controllers:
-            ctrl.run_tick(dt)
+        now = self._advance(1, dt)
+        active = self._active
+        if self.profiler is None:
+            for ctrl in active:
+                ctrl.run_tick(dt, now)
+        else:
+            self._run_tick_profiled(dt)
+        self._retire_idle()
+        if self.recorder is not None:
+            # Sólo pueden haber cambiado las cabinas ejecutadas en este tick
+            self.recorder.tick(self, active)
+
+    def _advance(self, ticks: int, dt: float) -> float:
+        """
+        Avanza el reloj global `ticks` ticks de dt y devuelve el nuevo
+        instante. El tiempo se calcula como origen + n·dt a partir de un
+        contador entero, así que no depende de cuántos ticks se avancen de
+        una vez (run_tick o un salto de run_until) ni arrastra el error de
+        sumar dt repetidamente. Si cambia dt o alguien ha movido `time` (reset,
+        restore, asignación directa), el origen pasa a ser el instante actual.
+        """
+        if dt != self._tick_dt or self.time != self._clock_at:
+            self._epoch = self.time
+            self._tick_dt = dt
+            self._ticks = 0
+        self._ticks += ticks
+        self.time = self._clock_at = self._epoch + self._ticks * dt
+        return self.time
+
+    def _run_tick_profiled(self, dt: float) -> None:
+        """Misma secuencia que Controller.run_tick, midiendo cada fase por cabina."""
+        clock = time.perf_counter_ns
+        add = self.profiler.add
+        for ctrl in self._active:
+            car = ctrl.elevator.id
+            t0 = clock()
+            ctrl.handle_requests()
+            t1 = clock()
+            ctrl.elevator.step(dt, self.time)
+            t2 = clock()
+            ctrl.update_users()
+            t3 = clock()
+            add("handle_requests", car, t1 - t0)
+            add("elevator_step", car, t2 - t1)
+            add("update_users", car, t3 - t2)
+
+    def _after_tick(self, source) -> None:
+        """Tras el tick: segundo embarque y llegadas vencidas."""
+        if self.profiler is None:
+            for ctrl in self._active:
+                ctrl.update_users()
+            for evt in source.pop_due(self.time):
+                self.spawn_user(evt)
+            return
+        clock = time.perf_counter_ns
+        add = self.profiler.add
+        for ctrl in self._active:
+            start = clock()
+            ctrl.update_users()
+            add("update_users", ctrl.elevator.id, clock() - start)
+        start = clock()
+        for evt in source.pop_due(self.time):
+            self.spawn_user(evt)
+        add("spawn_users", None, clock() - start)
+
+    def enable_profiling(self) -> PhaseTimer:
+        """Activa la medición por fases (reiniciando contadores) y devuelve el PhaseTimer."""
+        self.profiler = PhaseTimer()
+        return self.profiler
+
+    def disable_profiling(self) -> Optional[PhaseTimer]:
+        """Desactiva la medición y devuelve los contadores acumulados."""
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    def run_until(self, until: float, dt: float, events=None) -> None:
+        """
+        Motor por eventos discretos: avanza hasta `until` con la misma
+        secuencia por tick que main.run_simulation (run_tick, update_users,
+        e inyección de llegadas), pero salta directamente hasta el tick del
+        siguiente evento: la próxima llegada, el fin de una transición de
+        puertas o la llegada de una cabina a su parada (ver
+        Elevator.next_event_in). Entre eventos sólo corren los relojes y la
+        posición de las cabinas sobre su perfil, que se avanzan de una vez.
+
+        El reloj global sale de un contador entero de ticks (ver _advance) y
+        los relojes de las cabinas corren tick a tick también en los saltos
+        (ver Elevator.skip), así que el resultado es idéntico bit a bit al
+        del motor por ticks para cualquier dt, no sólo los exactos en binario.
+
+        `events` puede ser la lista ordenada de generate_user_events, un
+        iterable de llegadas en orden o cualquier ArrivalSource.
+        """
+        source = self._arrival_source(events)
+
+        remaining = int(round((until - self.time) / dt))
+        while remaining > 0:
+            quiet = min(self._quiet_ticks(source, dt), remaining)
+            if quiet > 0:
+                self._skip_ticks(quiet, dt)
+                remaining -= quiet
+                if remaining == 0:
+                    break
+
+            self.run_tick(dt)
+            self._after_tick(source)
+            remaining -= 1
+
+    def _arrival_source(self, events) -> ArrivalSource:
+        """
+        ArrivalSource para `events`. Un iterable en streaming se adapta una
+        sola vez y se reutiliza en las siguientes llamadas con el mismo
+        objeto: su StreamSource ya ha leído una llegada de anticipación, que
+        se perdería si se envolviera de nuevo al simular el día por tramos.
+        """
+        if events is None or isinstance(events, (ArrivalSource, list)):
+            return as_arrival_source(events)
+        if self._stream is None or self._stream[0] is not events:
+            self._stream = (events, StreamSource(events))
+        return self._stream[1]
+
+    def _quiet_ticks(self, source, dt: float) -> float:
+        """
+        Ticks siguientes en los que seguro no ocurre ningún evento. Se deja
+        un tick de margen antes del evento para que el tick que lo dispara
+        se simule completo aunque el redondeo adelante o retrase el umbral.
+        """
+        # Un evento a menos de dos ticks no deja nada que saltar
+        limit = 2 * dt
+        horizon = source.peek_time() - self.time
+        if horizon <= limit:
+            return 0
+        for ctrl in self._active:
+            if ctrl.pending_requests or ctrl.deferred_calls:
+                return 0
+            wait = ctrl.elevator.next_event_in()
+            if wait < horizon:
+                if wait <= limit:
+                    return 0
+                horizon = wait
+        if horizon == math.inf:
+            return math.inf
+        return math.ceil(horizon / dt) - 2
+
+    def _skip_ticks(self, ticks: int, dt: float) -> None:
+        """Avanza `ticks` ticks sin eventos: reloj global y relojes/posición de las cabinas activas."""
+        now = self._advance(ticks, dt)
+        if self.recorder is not None:
+            # Las muestras del salto salen del estado de las cabinas antes de moverlas
+            self.recorder.skip(self, ticks, dt, self._active)
+        for ctrl in self._active:
+            ctrl.elevator.skip(dt, ticks, now)
+
+    def publish_displays(self) -> int:
+        """
+        Sincroniza el display de cada ascensor y publica sólo los que han
+        cambiado (ver Display.subscribe). Devuelve cuántos ha publicado.
+        """
+        return sum(elev.update_display() for elev in self.elevators)
+
+    def snapshot(self, include_logs: bool = True) -> Dict:
+        """
+        Estado compacto y serializable del sistema (ver snapshot.py). Con
+        include_logs=False no se copian los registros del log.
+        """
+        from .snapshot import take_snapshot
+        return take_snapshot(self, include_logs=include_logs)
+
+    def restore(self, snap: Dict) -> None:
+        """Vuelve al estado de una instantánea tomada con snapshot()."""
+        from .snapshot import restore_snapshot
+        restore_snapshot(self, snap)
+
+    def fork(self) -> "ElevatorSystem":
+        """
+        Copia independiente del sistema en el instante actual, con un
+        despacho de la misma clase (ver Dispatcher.fresh).
+        """
+        from .snapshot import build_from_snapshot
+        return build_from_snapshot(self.snapshot(), self.dispatcher.fresh())
 
     def get_elevator_status(self) -> List[Dict]:
         """
@@ -103,8 +450,17 @@ class ElevatorSystem:
         """
         self.elevators.clear()
         self.controllers.clear()
+        self._active = []
+        self._awake.clear()
+        self._order.clear()
+        self.dispatcher.clear()
+        self._stream = None
         self.floor_panels.clear()
         self.users.clear()
+        self.delivered_count = 0
+        self.wait_histogram.reset()
+        self.journey_histogram.reset()
         self.time = 0.0
-        self.logger.log("ElevatorSystem reset", "INFO")
+        self._epoch, self._tick_dt, self._ticks, self._clock_at = 0.0, 0.0, 0, 0.0
+        self.logger.log("ElevatorSystem reset", level="INFO")
 
@@ -0,0 +1,338 @@
+# simulation/fleet.py
+"""
+Motor vectorizado de flota (struct-of-arrays) para edificios muy grandes.
+
+Mantiene el estado de todos los ascensores en arrays de NumPy (posición,
+dirección, puertas, temporizadores y paradas) y los avanza a la vez con la
+misma semántica que Elevator.step y Door.tick. NumPy es opcional: el resto
+del paquete no lo necesita.
+"""
+
+import math
+from typing import Dict, List, TYPE_CHECKING
+
+from .stops import StopSet
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependencia opcional
+    np = None
+
+if TYPE_CHECKING:
+    from .elevator import Elevator
+
+
+# Códigos de estado de puerta
+DOOR_CLOSED = 0
+DOOR_OPENING = 1
+DOOR_OPEN = 2
+DOOR_CLOSING = 3
+
+_DOOR_NAMES = ("closed", "opening", "open", "closing")
+_DOOR_CODES = {name: code for code, name in enumerate(_DOOR_NAMES)}
+
+# Códigos de dirección
+_DIRECTION_NAMES = {1: "up", -1: "down", 0: "idle"}
+_DIRECTION_CODES = {"up": 1, "down": -1, "idle": 0}
+
+
+class FleetEngine:
+    """
+    Estado de N ascensores como arrays paralelos, avanzado con step(dt).
+    Las paradas de cada cabina son una fila de una máscara booleana por piso
+    (el equivalente vectorizado de StopSet) y se atienden en orden LOOK.
+    """
+
+    def __init__(
+        self,
+        num_cars: int,
+        min_floor: int = 1,
+        max_floor: int = 10,
+        speed_mps: float = 1.0,
+        open_duration: float = 1.0,
+        acceleration_mps2: float = math.inf,
+    ):
+        if np is None:
+            raise ImportError("FleetEngine necesita NumPy (pip install numpy).")
+        self.num_cars = num_cars
+        self.base_floor = min_floor
+        num_floors = max_floor - min_floor + 1
+
+        # Límites y parámetros por cabina
+        self.min_floor = np.full(num_cars, min_floor, dtype=np.int64)
+        self.max_floor = np.full(num_cars, max_floor, dtype=np.int64)
+        self.speed_mps = np.full(num_cars, speed_mps, dtype=np.float64)
+        self.acceleration = np.full(num_cars, acceleration_mps2, dtype=np.float64)
+        self.open_duration = np.full(num_cars, open_duration, dtype=np.float64)
+
+        # Estado dinámico
+        self.position_m = np.full(num_cars, float(min_floor), dtype=np.float64)
+        self.current_floor = np.full(num_cars, min_floor, dtype=np.int64)
+        self.direction = np.zeros(num_cars, dtype=np.int8)
+        self.is_moving = np.zeros(num_cars, dtype=bool)
+        self.emergency = np.zeros(num_cars, dtype=bool)
+
+        # Puertas
+        self.door_status = np.full(num_cars, DOOR_CLOSED, dtype=np.int8)
+        # Reloj de cada puerta y deadline de la transición en curso (inf = quieta)
+        self.door_clock = np.zeros(num_cars, dtype=np.float64)
+        self.door_deadline = np.full(num_cars, np.inf, dtype=np.float64)
+        self.just_opened = np.zeros(num_cars, dtype=bool)
+
+        # Viaje en curso (perfil de motion.MotionProfile, una celda por cabina)
+        self.trip_active = np.zeros(num_cars, dtype=bool)
+        self.trip_start = np.zeros(num_cars, dtype=np.float64)
+        self.trip_target = np.zeros(num_cars, dtype=np.int64)
+        self.trip_direction = np.zeros(num_cars, dtype=np.int8)
+        self.trip_v0 = np.zeros(num_cars, dtype=np.float64)
+        self.trip_t1 = np.zeros(num_cars, dtype=np.float64)
+        self.trip_t2 = np.zeros(num_cars, dtype=np.float64)
+        self.trip_total = np.zeros(num_cars, dtype=np.float64)
+        self.trip_peak = np.zeros(num_cars, dtype=np.float64)
+        self.trip_elapsed = np.zeros(num_cars, dtype=np.float64)
+
+        # Paradas: máscara (cabina x piso) y número de paradas por cabina
+        self.floors = np.arange(min_floor, max_floor + 1, dtype=np.float64)
+        self.num_targets = np.zeros(num_cars, dtype=np.int64)
+        self.target_mask = np.zeros((num_cars, num_floors), dtype=bool)
+
+    @classmethod
+    def from_elevators(cls, elevators: List["Elevator"]) -> "FleetEngine":
+        """
+        Construye el motor copiando el estado de instancias Elevator. Sólo
+        admite cabinas con pisos uniformes (sin floor_heights).
+        """
+        if any(e.floor_heights is not None for e in elevators):
+            raise ValueError("FleetEngine no admite alturas de piso no uniformes")
+        min_floor = min(e.min_floor for e in elevators)
+        max_floor = max(e.max_floor for e in elevators)
+        fleet = cls(len(elevators), min_floor=min_floor, max_floor=max_floor)
+        for i, elev in enumerate(elevators):
+            fleet.min_floor[i] = elev.min_floor
+            fleet.max_floor[i] = elev.max_floor
+            fleet.speed_mps[i] = elev.speed_mps
+            fleet.acceleration[i] = elev.acceleration_mps2
+            fleet.open_duration[i] = elev.door.open_duration
+            fleet.position_m[i] = elev.position_m
+            fleet.current_floor[i] = elev.current_floor
+            fleet.direction[i] = _DIRECTION_CODES.get(elev.direction, 0)
+            fleet.is_moving[i] = elev.is_moving
+            fleet.emergency[i] = elev.emergency_state
+            fleet.door_status[i] = _DOOR_CODES[elev.door.status]
+            fleet.door_clock[i] = elev.door.now
+            fleet.door_deadline[i] = elev.door.deadline
+            fleet.just_opened[i] = elev._just_opened
+            for floor in elev.target_floors:
+                fleet.call(i, floor)
+            trip = elev._trip
+            if trip is not None:
+                fleet.trip_active[i] = True
+                fleet.trip_start[i] = trip.start
+                fleet.trip_target[i] = trip.floor
+                fleet.trip_direction[i] = trip.direction
+                fleet.trip_v0[i] = trip.v0
+                fleet.trip_t1[i], fleet.trip_t2[i] = trip.t1, trip.t2
+                fleet.trip_total[i], fleet.trip_peak[i] = trip.total, trip.v_peak
+                fleet.trip_elapsed[i] = trip.elapsed
+        return fleet
+
+    def call(self, car: int, floor: int) -> None:
+        """Equivalente a Elevator.call: añade la parada si es válida y nueva."""
+        if not self.min_floor[car] <= floor <= self.max_floor[car]:
+            return
+        slot = floor - self.base_floor
+        if self.target_mask[car, slot]:
+            return
+        self.num_targets[car] += 1
+        self.target_mask[car, slot] = True
+
+    def step(self, dt: float) -> None:
+        """Avanza todas las cabinas dt segundos (semántica de Elevator.step)."""
+        active = ~self.emergency
+        status = self.door_status
+
+        # 1) Door.tick: avanza el reloj y completa las transiciones vencidas
+        self.door_clock[active] += dt
+        finished = active & (self.door_clock >= self.door_deadline)
+        status[finished & (status == DOOR_OPENING)] = DOOR_OPEN
+        status[finished & (status == DOOR_CLOSING)] = DOOR_CLOSED
+        self.door_deadline[finished] = np.inf
+
+        # 2) Si justo acabó de abrir, se inicia el cierre
+        closing = active & self.just_opened
+        self.just_opened[closing] = False
+        status[closing] = DOOR_CLOSING
+        self.door_deadline[closing] = self.door_clock[closing] + self.open_duration[closing]
+        rest = active & ~closing
+
+        # 3) Puertas en transición: esperar
+        rest &= self.door_deadline == np.inf
+
+        # 4) Puerta recién abierta: se marca para el siguiente tick
+        opened = rest & (status == DOOR_OPEN)
+        self.just_opened[opened] = True
+        rest &= ~opened
+
+        # 5) Puertas cerradas: sin paradas se queda quieto
+        has_targets = self.num_targets > 0
+        parked = rest & ~has_targets
+        self.is_moving[parked] = False
+        self.direction[parked] = 0
+        self.trip_active[parked] = False
+        moving = rest & has_targets
+        self.is_moving[moving] = True
+
+        # 6) Movimiento hacia la siguiente parada (LOOK)
+        if moving.any():
+            self._move_towards_target(np.flatnonzero(moving), dt)
+
+    def _next_stop(self, cars):
+        """Siguiente parada LOOK de cada cabina (semántica de StopSet.next_stop)."""
+        position = self.position_m[cars]
+        mask = self.target_mask[cars]
+        above_mask = mask & (self.floors >= position[:, None])
+        below_mask = mask & (self.floors <= position[:, None])
+        has_above = above_mask.any(axis=1)
+        has_below = below_mask.any(axis=1)
+        above = self.base_floor + np.argmax(above_mask, axis=1)
+        below = self.base_floor + mask.shape[1] - 1 - np.argmax(below_mask[:, ::-1], axis=1)
+
+        direction = self.direction[cars]
+        nearest_above = has_above & (~has_below | (above - position <= position - below))
+        pick_above = np.where(
+            direction == 1, has_above,
+            np.where(direction == -1, ~has_below, nearest_above),
+        )
+        return np.where(pick_above, above, below)
+
+    def _move_towards_target(self, cars, dt: float) -> None:
+        next_floor = self._next_stop(cars)
+        position = self.position_m[cars]
+        active = self.trip_active[cars]
+
+        # Parada nueva por delante del viaje en curso: se replanifica si
+        # aún da tiempo a frenar en ella (Elevator.move_towards_target)
+        changed = active & (next_floor != self.trip_target[cars])
+        if changed.any():
+            moving = cars[changed]
+            ahead = (next_floor[changed] - position[changed]) * self.trip_direction[moving]
+            speed = self._trip_speed(moving)
+            accel = self.acceleration[moving]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                braking = np.where(np.isinf(accel), 0.0, speed * speed / (2.0 * accel))
+            replan = (ahead > 0) & (ahead >= braking)
+            self._start_trips(moving[replan], next_floor[changed][replan], speed[replan])
+
+        # Sin viaje: parada en la posición actual se atiende sin moverse
+        idle = ~active
+        here = idle & (next_floor == position)
+        self.direction[cars[here]] = 0
+        self._arrive(cars[here], next_floor[here])
+        start = idle & ~here
+        self._start_trips(cars[start], next_floor[start], np.zeros(int(start.sum())))
+
+        cars = cars[~here]
+        self.direction[cars] = self.trip_direction[cars]
+        self.trip_elapsed[cars] += dt
+        arrived = self.trip_elapsed[cars] >= self.trip_total[cars]
+        self._arrive(cars[arrived], self.trip_target[cars[arrived]])
+
+        # Posición en forma cerrada (motion.MotionProfile.offset)
+        cars = cars[~arrived]
+        position = self.trip_start[cars] + self.trip_direction[cars] * self._trip_offset(cars)
+        self.position_m[cars] = position
+        self.current_floor[cars] = np.trunc(position).astype(np.int64)
+
+    def _start_trips(self, cars, floors, v0) -> None:
+        """Planifica viajes desde la posición actual (motion.plan vectorizado)."""
+        if not len(cars):
+            return
+        start = self.position_m[cars]
+        distance = np.abs(floors - start)
+        vmax = self.speed_mps[cars]
+        accel = self.acceleration[cars]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d_acc = (vmax * vmax - v0 * v0) / (2.0 * accel)
+            d_dec = vmax * vmax / (2.0 * accel)
+            v_tri = np.sqrt(np.maximum((2.0 * accel * distance + v0 * v0) / 2.0, v0 * v0))
+            infinite = np.isinf(accel)
+            trapezoid = ~infinite & (d_acc + d_dec <= distance)
+            peak = np.where(infinite | trapezoid, vmax, v_tri)
+            t1 = np.where(infinite, 0.0, (peak - v0) / accel)
+            cruise = np.where(
+                infinite, distance / vmax,
+                np.where(trapezoid, t1 + (distance - d_acc - d_dec) / vmax, t1),
+            )
+            total = np.where(infinite, cruise, cruise + peak / accel)
+        self.trip_active[cars] = True
+        self.trip_start[cars] = start
+        self.trip_target[cars] = floors
+        self.trip_direction[cars] = np.where(floors >= start, 1, -1)
+        self.trip_v0[cars] = v0
+        self.trip_t1[cars] = t1
+        self.trip_t2[cars] = cruise
+        self.trip_total[cars] = total
+        self.trip_peak[cars] = peak
+        self.trip_elapsed[cars] = 0.0
+
+    def _trip_speed(self, cars):
+        t = self.trip_elapsed[cars]
+        t1, t2, peak = self.trip_t1[cars], self.trip_t2[cars], self.trip_peak[cars]
+        accel = self.acceleration[cars]
+        with np.errstate(invalid="ignore"):
+            return np.where(
+                t >= self.trip_total[cars], 0.0,
+                np.where(t < t1, self.trip_v0[cars] + accel * t,
+                         np.where(t < t2, peak, peak - accel * (t - t2))),
+            )
+
+    def _trip_offset(self, cars):
+        t = self.trip_elapsed[cars]
+        t1, t2, peak = self.trip_t1[cars], self.trip_t2[cars], self.trip_peak[cars]
+        v0, accel = self.trip_v0[cars], self.acceleration[cars]
+        with np.errstate(invalid="ignore"):
+            s1 = np.where(t1 == 0.0, 0.0, v0 * t1 + 0.5 * accel * t1 * t1)
+            tau = t - t2
+            return np.where(
+                t < t1, v0 * t + 0.5 * accel * t * t,
+                np.where(t < t2, s1 + peak * (t - t1),
+                         s1 + peak * (t2 - t1) + peak * tau - 0.5 * accel * tau * tau),
+            )
+
+    def _arrive(self, cars, floors) -> None:
+        if not len(cars):
+            return
+        self.trip_active[cars] = False
+        self.position_m[cars] = floors.astype(np.float64)
+        self.current_floor[cars] = floors
+        self.num_targets[cars] -= 1
+        self.target_mask[cars, floors - self.base_floor] = False
+        # Door.open()
+        self.door_status[cars] = DOOR_OPENING
+        self.door_deadline[cars] = self.door_clock[cars] + self.open_duration[cars]
+
+    def get_target_floors(self, car: int) -> List[int]:
+        """Paradas pendientes de una cabina, en el orden en que se atenderán."""
+        stops = StopSet(self.base_floor, self.base_floor + self.target_mask.shape[1] - 1)
+        for slot in np.flatnonzero(self.target_mask[car]):
+            stops.add(self.base_floor + int(slot))
+        return stops.in_service_order(
+            float(self.position_m[car]), _DIRECTION_NAMES[int(self.direction[car])]
+        )
+
+    def get_status(self) -> List[Dict]:
+        """
+        Estado de cada cabina con las mismas claves que
+        ElevatorSystem.get_elevator_status más puertas y paradas.
+        """
+        return [
+            {
+                "id": car,
+                "current_floor": int(self.current_floor[car]),
+                "direction": _DIRECTION_NAMES[int(self.direction[car])],
+                "position_m": float(self.position_m[car]),
+                "door_status": _DOOR_NAMES[self.door_status[car]],
+                "target_floors": self.get_target_floors(car),
+            }
+            for car in range(self.num_cars)
+        ]
@@ -0,0 +1,135 @@
+# simulation/flight_times.py
+"""
+Tabla precalculada de tiempos de vuelo entre pisos.
+
+FlightTimeTable guarda, para cada par de pisos (a, b) de una cabina, la
+distancia y el tiempo de viaje de parada a parada según el perfil de
+motion.plan, en arrays densos de n x n. Construirla cuesta un plan() por
+distancia distinta (n con pisos uniformes); después cada consulta es un
+acceso por índice. Admite alturas de piso no uniformes a través de la
+cota de cada piso.
+"""
+
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .motion import plan
+
+
+def elevations(min_floor: int, max_floor: int, floor_heights: Optional[Sequence[float]] = None) -> List[float]:
+    """
+    Cota de cada piso de min_floor a max_floor. `floor_heights` da la altura
+    de cada tramo entre pisos consecutivos (max_floor - min_floor valores);
+    sin ella, cada piso mide 1 y la cota coincide con el número de piso.
+    """
+    if floor_heights is None:
+        return [float(f) for f in range(min_floor, max_floor + 1)]
+    if len(floor_heights) != max_floor - min_floor:
+        raise ValueError(
+            f"floor_heights necesita {max_floor - min_floor} alturas, no {len(floor_heights)}"
+        )
+    if any(h <= 0 for h in floor_heights):
+        raise ValueError("Las alturas de piso deben ser positivas")
+    levels = [float(min_floor)]
+    for height in floor_heights:
+        levels.append(levels[-1] + height)
+    return levels
+
+
+def elevation_at(levels: List[float], min_floor: int, position: float) -> float:
+    """Cota de una posición continua en pisos (interpolación lineal por tramo)."""
+    index = min(int(position) - min_floor, len(levels) - 2)
+    if index < 0:
+        return levels[0]
+    return levels[index] + (position - min_floor - index) * (levels[index + 1] - levels[index])
+
+
+def position_at(levels: List[float], min_floor: int, elevation: float) -> float:
+    """Inversa de elevation_at: posición continua en pisos a una cota dada."""
+    index = min(max(bisect_right(levels, elevation) - 1, 0), len(levels) - 2)
+    if index < 0:
+        return float(min_floor)
+    span = levels[index + 1] - levels[index]
+    return min_floor + index + (elevation - levels[index]) / span
+
+
+class FlightTimeTable:
+    """
+    Distancias y tiempos de vuelo de una cabina entre cualquier par de
+    pisos, más el tiempo de una parada (apertura y cierre de puertas).
+    `key` identifica los parámetros con que se construyó, para invalidarla.
+    """
+
+    def __init__(
+        self,
+        min_floor: int,
+        max_floor: int,
+        max_speed: float,
+        acceleration: float,
+        door_time: float = 0.0,
+        floor_heights: Optional[Sequence[float]] = None,
+    ):
+        self.min_floor = min_floor
+        self.max_floor = max_floor
+        self.max_speed = max_speed
+        self.acceleration = acceleration
+        self.door_time = door_time
+        self.levels = elevations(min_floor, max_floor, floor_heights)
+        self.key = (max_speed, acceleration, door_time, tuple(floor_heights or ()))
+
+        n = max_floor - min_floor + 1
+        self._n = n
+        levels = self.levels
+        times: Dict[float, float] = {}
+        self._distance = array("d", bytes(8 * n * n))
+        self._time = array("d", bytes(8 * n * n))
+        for a in range(n):
+            row = a * n
+            for b in range(n):
+                d = abs(levels[b] - levels[a])
+                t = times.get(d)
+                if t is None:
+                    t = times[d] = plan(d, 0.0, max_speed, acceleration)[2] if d else 0.0
+                self._distance[row + b] = d
+                self._time[row + b] = t
+
+    def distance(self, a: int, b: int) -> float:
+        """Distancia vertical entre los pisos a y b."""
+        return self._distance[(a - self.min_floor) * self._n + (b - self.min_floor)]
+
+    def flight_time(self, a: int, b: int) -> float:
+        """Segundos de viaje de a a b, partiendo y terminando en reposo."""
+        return self._time[(a - self.min_floor) * self._n + (b - self.min_floor)]
+
+    def route_time(self, start: int, stops: Iterable[int]) -> float:
+        """Tiempo para recorrer `stops` en orden desde `start`, con una parada en cada uno."""
+        total, here = 0.0, start
+        for floor in stops:
+            total += self.flight_time(here, floor) + self.door_time
+            here = floor
+        return total
+
+    def matrix(self) -> List[List[float]]:
+        """Tabla completa de tiempos de vuelo como lista de filas."""
+        n = self._n
+        return [list(self._time[row * n:(row + 1) * n]) for row in range(n)]
+
+
+
+@lru_cache(maxsize=64)
+def shared_table(
+    min_floor: int,
+    max_floor: int,
+    max_speed: float,
+    acceleration: float,
+    door_time: float = 0.0,
+    floor_heights: Optional[tuple] = None,
+) -> FlightTimeTable:
+    """
+    FlightTimeTable compartida por todas las cabinas con los mismos
+    parámetros (la tabla es de sólo lectura): una flota homogénea guarda
+    una sola tabla de n x n en lugar de una por cabina.
+    """
+    return FlightTimeTable(min_floor, max_floor, max_speed, acceleration, door_time, floor_heights)
@@ -1,4 +1,7 @@
-from typing import List
+import heapq
+from collections import OrderedDict
+from operator import itemgetter
+from typing import List, Optional, Tuple
 from .user import User
 
 class FloorPanel:
@@ -6,6 +9,11 @@ class FloorPanel:
     Panel externo de cada piso:  
     - mantiene cola de usuarios que han llamdo desde aquí  
     - enciende/apaga indicadores según dirección  
+
+    La cola se reparte en dos FIFO por sentido (OrderedDict por id de
+    usuario): recuentos, cancelación y embarque de n usuarios son O(1) por
+    usuario, sin recorrer a los que esperan en el otro sentido. Un id sólo
+    puede estar una vez en cola en el panel.
     """
     def __init__(
         self,
@@ -22,8 +30,10 @@ class FloorPanel:
         self.down_pressed = False
         self.indicator_up = False
         self.indicator_down = False
-        # Cola interna de usuarios que esperan en este piso
-        self._waiting: List[User] = []
+        # Colas de espera por sentido: id -> (orden de llegada, usuario)
+        self._up: "OrderedDict[int, Tuple[int, User]]" = OrderedDict()
+        self._down: "OrderedDict[int, Tuple[int, User]]" = OrderedDict()
+        self._seq = 0
 
     def press_up(self) -> None:
         if self.has_up_button:
@@ -52,42 +62,113 @@ class FloorPanel:
         if self.down_pressed: dirs.append("down")
         return dirs
 
+    def _queue(self, direction: Optional[str]) -> "OrderedDict[int, Tuple[int, User]]":
+        return self._up if direction == "up" else self._down
+
+    def _enqueue(self, user: User) -> None:
+        if user.id in self._up or user.id in self._down:
+            # Con la misma clave se sustituiría en silencio al que ya espera
+            raise ValueError(f"El usuario {user.id} ya está en la cola del piso {self.floor}")
+        self._seq += 1
+        self._queue(user.call_direction)[user.id] = (self._seq, user)
+
+    def _release(self, direction: str) -> None:
+        """Apaga el indicador de un sentido si ya no queda nadie esperando en él."""
+        if direction == "up":
+            if not self._up:
+                self.reset_up()
+        elif not self._down:
+            self.reset_down()
+
     def call(self, user: User) -> None:
-        """Añade usuario a la cola y enciende el indicador correcto."""
-        self._waiting.append(user)
+        """Añade usuario a la cola de su sentido y enciende el indicador correcto."""
+        self._enqueue(user)
         if user.call_direction == "up":
             self.press_up()
         else:
             self.press_down()
 
+    def waiting_count(self, direction: Optional[str] = None) -> int:
+        """Usuarios en cola en un sentido ("up"/"down") o en total, en O(1)."""
+        if direction is None:
+            return len(self._up) + len(self._down)
+        return len(self._queue(direction))
+
+    def waiting_users(self) -> List[User]:
+        """Todos los usuarios en cola, en orden de llegada (sin sacarlos)."""
+        if not self._up or not self._down:
+            return [user for _, user in (self._up or self._down).values()]
+        return [user for _, user in heapq.merge(self._up.values(), self._down.values(), key=itemgetter(0))]
+
+    def take(self, direction: str, n: Optional[int] = None) -> List[User]:
+        """
+        Saca hasta `n` usuarios (todos si n es None) de la cola del sentido
+        indicado, en orden de llegada. Apaga el indicador si la cola se vacía.
+        """
+        queue = self._queue(direction)
+        count = len(queue) if n is None else min(n, len(queue))
+        taken = [queue.popitem(last=False)[1][1] for _ in range(count)]
+        self._release(direction)
+        return taken
+
+    def take_within(self, weight_kg: float, at_least_one: bool = False) -> List[User]:
+        """
+        Saca usuarios en orden de llegada (de ambos sentidos) mientras su peso
+        acumulado quepa en `weight_kg`; se detiene en el primero que no cabe.
+        Con at_least_one, el primero sale aunque no quepa (cabina vacía).
+        """
+        up, down = self._up, self._down
+        taken: List[User] = []
+        room = weight_kg
+        while up or down:
+            if not down or (up and up[next(iter(up))][0] < down[next(iter(down))][0]):
+                queue = up
+            else:
+                queue = down
+            user = queue[next(iter(queue))][1]
+            if user.weight_kg > room and (taken or not at_least_one):
+                break
+            queue.popitem(last=False)
+            room -= user.weight_kg
+            taken.append(user)
+        if taken:
+            self._release("up")
+            self._release("down")
+        return taken
+
     def get_waiting_users(self, current_floor: int, direction: str) -> List[User]:
         """
         Devuelve sólo los usuarios en cola cuya dirección coincide
         con la del ascensor, y los elimina de la cola interna.
         Mantiene el indicador de la otra dirección si procede.
         """
-        matches: List[User] = []
-        rest: List[User] = []
-
-        for u in self._waiting:
-            if u.call_direction == direction:
-                matches.append(u)
-            else:
-                rest.append(u)
+        return self.take(direction)
 
-        # La cola interna se convierte en los que no coincidían
-        self._waiting = rest
-
-        # Si ya no quedan “up” pendientes, apaga el indicador correspondiente
-        if direction == "up" and not any(u.call_direction == "up" for u in self._waiting):
+    def pop_waiting_users(self) -> List[User]:
+        """
+        Devuelve todos los usuarios en cola (en orden de llegada), vacía la
+        cola y apaga ambos indicadores.
+        """
+        waiting = self.waiting_users()
+        if waiting:
+            self._up.clear()
+            self._down.clear()
             self.reset_up()
-        # Igual para “down”
-        if direction == "down" and not any(u.call_direction == "down" for u in self._waiting):
             self.reset_down()
+        return waiting
 
-        return matches
+    def cancel(self, user_id: int) -> Optional[User]:
+        """
+        Saca de la cola al usuario `user_id` en O(1) y devuelve el usuario
+        (None si no estaba). Apaga el indicador si su sentido se queda vacío.
+        """
+        for direction in ("up", "down"):
+            entry = self._queue(direction).pop(user_id, None)
+            if entry is not None:
+                self._release(direction)
+                return entry[1]
+        return None
 
-    def clear_call(self, floor: int, user_id: str) -> None:
+    def clear_call(self, floor: int, user_id: int) -> None:
         """Elimina de la cola a un usuario específico (por cancelación, p.ej.)."""
-        self._waiting = [u for u in self._waiting if u.id != user_id]
-        # (podrías tocar también reset_* si queda vacío para esa dirección)
+        self.cancel(user_id)
@@ -0,0 +1,117 @@
+# simulation/histogram.py
+"""
+Histograma de memoria fija con cubetas logarítmicas (estilo HdrHistogram).
+
+Los valores se cuantizan a múltiplos de `resolution` y se agrupan en
+cubetas cuyo ancho se duplica en cada potencia de dos, con `sub_buckets`
+subdivisiones lineales por potencia. El error relativo de cualquier
+percentil queda acotado por 1 / (sub_buckets / 2) y la memoria no depende
+del número de valores registrados.
+"""
+
+import math
+from array import array
+from typing import Dict, Optional
+
+
+class LogHistogram:
+    """
+    Registra valores no negativos (en segundos) entre 0 y `highest`.
+    Los valores por encima de `highest` se cuentan en la última cubeta.
+    """
+
+    def __init__(self, resolution: float = 0.01, highest: float = 86400.0, sub_buckets: int = 128):
+        if resolution <= 0 or highest <= resolution:
+            raise ValueError("Se necesita 0 < resolution < highest")
+        if sub_buckets < 2 or sub_buckets & (sub_buckets - 1):
+            raise ValueError("sub_buckets debe ser una potencia de dos >= 2")
+        self.resolution = resolution
+        self.highest = highest
+        self.sub_buckets = sub_buckets
+        self._sub_bits = sub_buckets.bit_length() - 1
+        self._half = sub_buckets // 2
+        self._max_units = int(highest / resolution)
+        self._counts = array("Q", bytes(8 * (self._index(self._max_units) + 1)))
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, units: int) -> int:
+        bucket = max(units.bit_length() - self._sub_bits, 0)
+        return bucket * self._half + (units >> bucket)
+
+    def _upper_value(self, index: int) -> float:
+        """Mayor valor que cae en la cubeta `index`."""
+        if index < self.sub_buckets:
+            bucket, sub = 0, index
+        else:
+            bucket = index // self._half - 1
+            sub = index - bucket * self._half
+        return (((sub + 1) << bucket) - 1) * self.resolution
+
+    def record(self, value: float) -> None:
+        """Añade un valor al histograma en O(1)."""
+        if value < 0 or math.isnan(value):
+            raise ValueError(f"Valor no válido para el histograma: {value}")
+        units = min(int(value / self.resolution), self._max_units)
+        self._counts[self._index(units)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Valor por debajo del cual queda el p% de los registros (None si está
+        vacío). Se devuelve el extremo superior de la cubeta, acotado al máximo.
+        """
+        if not self.count:
+            return None
+        rank = max(math.ceil(p / 100.0 * self.count), 1)
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(self._upper_value(index), self.max)
+        return self.max
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Suma los registros de otro histograma con la misma configuración."""
+        if (other.resolution, other.highest, other.sub_buckets) != (
+            self.resolution, self.highest, self.sub_buckets
+        ):
+            raise ValueError("No se pueden combinar histogramas con configuraciones distintas")
+        for index, n in enumerate(other._counts):
+            if n:
+                self._counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def reset(self) -> None:
+        """Vacía el histograma sin liberar sus cubetas."""
+        for index in range(len(self._counts)):
+            self._counts[index] = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = self.max = None
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Recuento, media, máximo y percentiles p50/p90/p99."""
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
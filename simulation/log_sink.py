@@ -0,0 +1,173 @@
+# simulation/log_sink.py
+"""
+Destinos de log en streaming para Logger.
+
+Cada registro aceptado por el Logger se escribe al momento en disco a
+través de un writer con buffer, de modo que un fallo no pierde todo el
+historial y las ejecuciones largas no tienen que guardarlo en memoria.
+Los segmentos rotan por tamaño y/o por tiempo y, opcionalmente, se
+comprimen con gzip al cerrarse.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import struct
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .logger import Logger, LogRecord, render_message
+
+_LEVEL_CODES = Logger._LEVELS
+_LEVEL_NAMES = {code: name for name, code in _LEVEL_CODES.items()}
+
+# Cabecera binaria: longitud del mensaje, timestamp y código de nivel
+_FRAME_HEADER = struct.Struct("<IdB")
+
+
+class RotatingSink:
+    """
+    Base de los destinos: gestiona fichero, buffer, rotación y gzip.
+    Las subclases sólo definen cómo codificar un registro en bytes.
+
+    Los segmentos cerrados se llaman `<path>.1`, `<path>.2`... (con `.gz`
+    si `compress`); con `backup_count` sólo se conservan los más recientes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        interval_s: Optional[float] = None,
+        compress: bool = False,
+        backup_count: Optional[int] = None,
+        buffer_size: int = 64 * 1024,
+        clock: Callable[[], float] = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.interval_s = interval_s
+        self.compress = compress
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self.clock: Callable[[], float] = clock or time.monotonic
+        # Número de segmentos ya rotados
+        self.segments = 0
+        self._file = None
+        self._open()
+
+    def _open(self) -> None:
+        self._file = open(self.path, "wb", buffering=self.buffer_size)
+        self._bytes = 0
+        self._opened_at = self.clock()
+
+    def encode(self, record: LogRecord) -> bytes:
+        """Convierte un registro en los bytes que se escriben."""
+        raise NotImplementedError
+
+    def write(self, record: LogRecord) -> None:
+        """Escribe un registro, rotando antes si el segmento está lleno."""
+        if self._file is None:
+            raise ValueError(f"El sink de {self.path} está cerrado")
+        data = self.encode(record)
+        if self._should_rotate(len(data)):
+            self.rotate()
+        self._file.write(data)
+        self._bytes += len(data)
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self._bytes == 0:
+            return False
+        if self.max_bytes is not None and self._bytes + incoming > self.max_bytes:
+            return True
+        if self.interval_s is not None and self.clock() - self._opened_at >= self.interval_s:
+            return True
+        return False
+
+    def segment_path(self, n: int) -> str:
+        """Ruta del segmento rotado número n."""
+        return f"{self.path}.{n}.gz" if self.compress else f"{self.path}.{n}"
+
+    def rotate(self) -> None:
+        """Cierra el segmento actual, lo archiva y abre uno nuevo."""
+        self._file.close()
+        self.segments += 1
+        target = self.segment_path(self.segments)
+        if self.compress:
+            with open(self.path, "rb") as src, gzip.open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.path)
+        else:
+            os.replace(self.path, target)
+        if self.backup_count is not None:
+            expired = self.segments - self.backup_count
+            if expired >= 1 and os.path.exists(self.segment_path(expired)):
+                os.remove(self.segment_path(expired))
+        self._open()
+
+    def flush(self) -> None:
+        """Vuelca el buffer al sistema operativo."""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Cierra el segmento activo (queda sin rotar en `path`)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JsonLinesSink(RotatingSink):
+    """Un objeto JSON por línea: time, level, message y, si los hay, template/args."""
+
+    def encode(self, record: LogRecord) -> bytes:
+        timestamp, level, template, args = record
+        entry: Dict[str, Any] = {
+            "time": timestamp,
+            "level": level,
+            "message": render_message(template, args),
+        }
+        if args:
+            entry["template"] = template
+            entry["args"] = list(args)
+        return (json.dumps(entry, default=str) + "\n").encode("utf-8")
+
+
+class BinaryFrameSink(RotatingSink):
+    """
+    Tramas binarias compactas: cabecera `<IdB` (longitud, timestamp,
+    código de nivel) seguida del mensaje formateado en UTF-8.
+    """
+
+    def encode(self, record: LogRecord) -> bytes:
+        timestamp, level, template, args = record
+        payload = render_message(template, args).encode("utf-8")
+        return _FRAME_HEADER.pack(len(payload), timestamp, _LEVEL_CODES.get(level, 0)) + payload
+
+
+def read_frames(path: str) -> Iterator[Tuple[float, str, str]]:
+    """Lee (timestamp, nivel, mensaje) de un fichero de BinaryFrameSink (.gz incluido)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        while True:
+            header = f.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                return
+            length, timestamp, code = _FRAME_HEADER.unpack(header)
+            yield timestamp, _LEVEL_NAMES.get(code, str(code)), f.read(length).decode("utf-8")
+
+
+def read_json_lines(path: str) -> Iterator[Dict[str, Any]]:
+    """Lee los registros de un fichero de JsonLinesSink (.gz incluido)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
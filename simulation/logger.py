@@ -1,9 +1,35 @@
-from typing import Callable, List
+import warnings
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+# Registro sin formatear: (timestamp, nivel, plantilla, argumentos)
+LogRecord = Tuple[float, str, str, Tuple[Any, ...]]
+
+
+def render_message(template: str, args: Tuple[Any, ...]) -> str:
+    """
+    Formatea la plantilla %-style con sus argumentos. Si no casan, se
+    devuelve la plantilla tal cual seguida de los argumentos: un registro
+    mal formado no debe romper el historial entero.
+    """
+    if not args:
+        return template
+    try:
+        return template % args
+    except (TypeError, ValueError, KeyError):
+        return f"{template} {args!r}"
 
 
 class Logger:
     """
     Registra eventos y acciones del sistema para trazabilidad y depuración.
+
+    Los registros se guardan sin formatear y sólo se convierten a texto al
+    consultarlos (show_history, export...). Con `capacity` el historial es
+    un buffer circular que conserva únicamente los últimos registros.
+    Con `sink` (ver log_sink.py) cada registro aceptado se escribe además
+    en disco en el momento.
     """
 
     # Mapeo de niveles a valores numéricos para comparación
@@ -18,38 +44,106 @@ class Logger:
         self,
         log_level: str = "INFO",
         timestamp_fn: Callable[[], float] = None,
+        capacity: Optional[int] = None,
+        sink=None,
     ):
-        # Lista de mensajes de log
-        self.logs: List[str] = []
+        # Registros sin formatear (acotados a `capacity` si se indica)
+        self._records: Deque[LogRecord] = deque(maxlen=capacity)
+        # Total de registros aceptados desde el inicio (incluye descartados)
+        self.total_logged: int = 0
         # Si el logger está activo
         self.enabled: bool = True
-        # Nivel mínimo de severidad
-        self.log_level: str = log_level
+        # Nivel mínimo de severidad (fija también el umbral numérico)
+        self.log_level = log_level
         # Función para obtener timestamp
         self.timestamp_fn: Callable[[], float] = timestamp_fn or (lambda: 0.0)
+        # Destino en streaming opcional (JsonLinesSink, BinaryFrameSink...)
+        self.sink = sink
+
+    @property
+    def log_level(self) -> str:
+        return self._log_level
+
+    @log_level.setter
+    def log_level(self, level: str) -> None:
+        self._log_level = level
+        # Umbral precalculado: filtrar un mensaje es una comparación de enteros
+        self._threshold = Logger._LEVELS.get(level.upper(), 0)
+
+    @property
+    def capacity(self) -> Optional[int]:
+        """Número máximo de registros conservados (None = sin límite)."""
+        return self._records.maxlen
 
-    def log(self, message: str, level: str = "INFO") -> None:
-        """Agrega una nueva entrada al log si el nivel cumple con el mínimo."""
+    @property
+    def logs(self) -> List[str]:
+        """Todos los registros conservados, ya formateados."""
+        return [self._format(r) for r in self._records]
+
+    def log(self, message: str, *args: Any, level: str = "INFO") -> None:
+        """
+        Agrega una nueva entrada al log si el nivel cumple con el mínimo.
+        `message` puede ser una plantilla %-style cuyos `args` sólo se
+        formatean cuando se consulta el historial. El nivel se pasa por
+        nombre; la forma antigua log(message, "WARNING") se sigue aceptando
+        (con DeprecationWarning) si el mensaje no tiene marcadores %.
+        """
+        if (
+            len(args) == 1
+            and isinstance(args[0], str)
+            and args[0].upper() in Logger._LEVELS
+            and "%" not in message
+        ):
+            warnings.warn(
+                "Logger.log(message, level) está obsoleto: usa log(message, level=...)",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            level, args = args[0], ()
         if not self.enabled:
             return
-        lvl = level.upper()
-        if lvl not in Logger._LEVELS:
-            return
-        if Logger._LEVELS[lvl] < Logger._LEVELS.get(self.log_level.upper(), 0):
+        value = Logger._LEVELS.get(level)
+        if value is None:
+            level = level.upper()
+            value = Logger._LEVELS.get(level)
+            if value is None:
+                return
+        if value < self._threshold:
             return
-        timestamp = self.timestamp_fn()
-        entry = f"[{timestamp}] {lvl}: {message}"
-        self.logs.append(entry)
+        record = (self.timestamp_fn(), level, message, args)
+        self._records.append(record)
+        self.total_logged += 1
+        if self.sink is not None:
+            self.sink.write(record)
+
+    def is_enabled_for(self, level: str) -> bool:
+        """True si un mensaje de este nivel se registraría."""
+        return self.enabled and Logger._LEVELS.get(level.upper(), 0) >= self._threshold
+
+    @staticmethod
+    def _format(record: LogRecord) -> str:
+        timestamp, lvl, message, args = record
+        return f"[{timestamp}] {lvl}: {render_message(message, args)}"
 
     def show_history(self, n: int = None) -> List[str]:
         """Devuelve los últimos n registros (o todos si n es None)."""
-        if n is None or n >= len(self.logs):
-            return list(self.logs)
-        return self.logs[-n:]
+        if n is None or n >= len(self._records):
+            return self.logs
+        if n <= 0:
+            return []
+        last = list(islice(reversed(self._records), n))
+        return [self._format(r) for r in reversed(last)]
+
+    def history_since(self, count: int) -> List[str]:
+        """
+        Registros aceptados después de que total_logged valiera `count`
+        (los ya descartados por el buffer circular no se devuelven).
+        """
+        return self.show_history(max(self.total_logged - count, 0))
 
     def clear(self) -> None:
         """Limpia todos los registros."""
-        self.logs.clear()
+        self._records.clear()
 
     def enable(self) -> None:
         """Activa el sistema de log."""
@@ -65,12 +159,26 @@ class Logger:
         if lvl in Logger._LEVELS:
             self.log_level = lvl
 
+    def flush(self) -> None:
+        """Vuelca a disco el buffer del sink, si lo hay."""
+        if self.sink is not None:
+            self.sink.flush()
+
+    def close(self) -> None:
+        """
+        Cierra el sink, si lo hay, y lo desengancha: los registros
+        posteriores sólo se guardan en memoria.
+        """
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
+
     def export(self, path: str) -> None:
         """Exporta los logs a un archivo de texto en disco."""
         try:
             with open(path, 'w', encoding='utf-8') as f:
-                for entry in self.logs:
-                    f.write(entry + "\n")
+                for record in self._records:
+                    f.write(self._format(record) + "\n")
         except Exception:
             self.log(f"Error exporting logs to {path}", level="ERROR")
             raise
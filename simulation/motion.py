@@ -0,0 +1,107 @@
+# simulation/motion.py
+"""
+Perfil de movimiento trapezoidal en forma cerrada.
+
+Un viaje parte con velocidad v0 (>= 0, en el sentido de la marcha),
+acelera con `accel` hasta v_peak (como mucho `max_speed`), mantiene esa
+velocidad y frena con `accel` hasta detenerse exactamente en el destino.
+Si la distancia no da para alcanzar `max_speed` el perfil es triangular.
+Con accel = math.inf el perfil se reduce a velocidad constante.
+
+La posición y el instante de llegada se calculan analíticamente, así que
+el resultado no depende del paso dt con que se avance el viaje.
+"""
+
+import math
+from typing import Optional, Tuple
+
+
+def plan(distance: float, v0: float, max_speed: float, accel: float) -> Tuple[float, float, float, float]:
+    """
+    Tiempos del perfil para recorrer `distance` partiendo de `v0`:
+    (fin de aceleración t1, inicio de frenada t2, duración total, v_peak).
+    Requiere que se pueda frenar a tiempo: v0² / (2·accel) <= distance.
+    """
+    if math.isinf(accel):
+        t2 = distance / max_speed
+        return 0.0, t2, t2, max_speed
+    d_acc = (max_speed * max_speed - v0 * v0) / (2.0 * accel)
+    d_dec = max_speed * max_speed / (2.0 * accel)
+    if d_acc + d_dec <= distance:
+        t1 = (max_speed - v0) / accel
+        t2 = t1 + (distance - d_acc - d_dec) / max_speed
+        return t1, t2, t2 + max_speed / accel, max_speed
+    # Triangular: se empieza a frenar antes de llegar a max_speed
+    v_peak = math.sqrt(max((2.0 * accel * distance + v0 * v0) / 2.0, v0 * v0))
+    t1 = (v_peak - v0) / accel
+    return t1, t1, t1 + v_peak / accel, v_peak
+
+
+class MotionProfile:
+    """
+    Viaje de `start` a `target` con su perfil y el tiempo transcurrido.
+    Las posiciones son cotas; `floor` es el piso de destino (por defecto,
+    `target`, cuando cada piso mide 1 y cota y número de piso coinciden).
+    """
+
+    __slots__ = (
+        "start", "target", "floor", "direction", "distance", "v0", "max_speed", "accel",
+        "t1", "t2", "total", "v_peak", "elapsed",
+    )
+
+    def __init__(
+        self,
+        start: float,
+        target: float,
+        v0: float,
+        max_speed: float,
+        accel: float,
+        floor: Optional[int] = None,
+    ):
+        self.start = start
+        self.target = target
+        self.floor = target if floor is None else floor
+        self.direction = 1 if target >= start else -1
+        self.distance = abs(target - start)
+        self.v0 = v0
+        self.max_speed = max_speed
+        self.accel = accel
+        self.t1, self.t2, self.total, self.v_peak = plan(self.distance, v0, max_speed, accel)
+        self.elapsed = 0.0
+
+    def offset(self, t: float) -> float:
+        """Distancia recorrida a los t segundos de empezar el viaje."""
+        if t >= self.total:
+            return self.distance
+        if t < self.t1:
+            return self.v0 * t + 0.5 * self.accel * t * t
+        s1 = 0.0 if self.t1 == 0.0 else self.v0 * self.t1 + 0.5 * self.accel * self.t1 * self.t1
+        if t < self.t2:
+            return s1 + self.v_peak * (t - self.t1)
+        tau = t - self.t2
+        return s1 + self.v_peak * (self.t2 - self.t1) + self.v_peak * tau - 0.5 * self.accel * tau * tau
+
+    def speed(self, t: float) -> float:
+        """Módulo de la velocidad a los t segundos."""
+        if t >= self.total:
+            return 0.0
+        if t < self.t1:
+            return self.v0 + self.accel * t
+        if t < self.t2:
+            return self.v_peak
+        return self.v_peak - self.accel * (t - self.t2)
+
+    def position(self) -> float:
+        """Cota actual."""
+        return self.start + self.direction * self.offset(self.elapsed)
+
+    def braking_distance(self) -> float:
+        """Distancia mínima para detenerse desde la velocidad actual."""
+        if math.isinf(self.accel):
+            return 0.0
+        v = self.speed(self.elapsed)
+        return v * v / (2.0 * self.accel)
+
+    def remaining_time(self) -> float:
+        """Segundos hasta la llegada."""
+        return max(self.total - self.elapsed, 0.0)
@@ -0,0 +1,179 @@
+# simulation/passengers.py
+"""
+Población de pasajeros en columnas compactas.
+
+PassengerStore guarda los atributos de cada pasajero en arrays tipados
+(módulo array de la biblioteca estándar) en lugar de un objeto por
+usuario. StoredUser es un handle con la misma API que User que lee y
+escribe su fila del almacén. Las filas de los pasajeros ya entregados se
+liberan y se reutilizan, así que la memoria depende de cuántos pasajeros
+hay a la vez en el edificio y no de cuántos se han simulado.
+"""
+
+import math
+from array import array
+from typing import List, Optional
+
+from .user import UserBase
+
+# Centinela de "sin piso" para las columnas enteras
+NO_FLOOR = -(2 ** 31)
+
+# Bits de la columna de estado
+_WAITING = 1
+_INSIDE = 2
+
+_DIRECTIONS = (None, "up", "down")
+_DIRECTION_CODES = {name: code for code, name in enumerate(_DIRECTIONS)}
+
+
+class PassengerStore:
+    """
+    Columnas: id, weight, origin, current_floor, destination, state,
+    call_direction y las marcas call/board/alight (NaN = sin valor).
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.weight = array("d")
+        self.origin = array("i")
+        self.current_floor = array("i")
+        self.destination = array("i")
+        self.state = array("B")
+        self.call_direction = array("B")
+        self.call_time = array("d")
+        self.board_time = array("d")
+        self.alight_time = array("d")
+        # Filas liberadas disponibles para reutilizar
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        """Número de pasajeros vivos (filas en uso)."""
+        return len(self.ids) - len(self._free)
+
+    @property
+    def capacity(self) -> int:
+        """Filas reservadas (en uso + libres)."""
+        return len(self.ids)
+
+    def nbytes(self) -> int:
+        """Memoria ocupada por las columnas."""
+        columns = (
+            self.ids, self.weight, self.origin, self.current_floor, self.destination,
+            self.state, self.call_direction, self.call_time, self.board_time, self.alight_time,
+        )
+        return sum(c.itemsize * len(c) for c in columns)
+
+    def allocate(self, id: int, weight_kg: float, current_floor: int) -> int:
+        """Reserva una fila para un pasajero nuevo y devuelve su índice."""
+        if self._free:
+            row = self._free.pop()
+            self.ids[row] = id
+            self.weight[row] = weight_kg
+            self.origin[row] = current_floor
+            self.current_floor[row] = current_floor
+            self.destination[row] = NO_FLOOR
+            self.state[row] = 0
+            self.call_direction[row] = 0
+            self.call_time[row] = self.board_time[row] = self.alight_time[row] = math.nan
+            return row
+        self.ids.append(id)
+        self.weight.append(weight_kg)
+        self.origin.append(current_floor)
+        self.current_floor.append(current_floor)
+        self.destination.append(NO_FLOOR)
+        self.state.append(0)
+        self.call_direction.append(0)
+        self.call_time.append(math.nan)
+        self.board_time.append(math.nan)
+        self.alight_time.append(math.nan)
+        return len(self.ids) - 1
+
+    def new_user(self, id: int, weight_kg: float, current_floor: int) -> "StoredUser":
+        """Crea un pasajero y devuelve su handle con la API de User."""
+        return StoredUser(self, self.allocate(id, weight_kg, current_floor))
+
+    def release(self, user: "StoredUser") -> None:
+        """Libera la fila del pasajero; el handle deja de ser válido."""
+        self._free.append(user._row)
+        user._store = None
+
+
+def _int_column(name: str):
+    def getter(self) -> Optional[int]:
+        value = getattr(self._store, name)[self._row]
+        return None if value == NO_FLOOR else value
+
+    def setter(self, value: Optional[int]) -> None:
+        getattr(self._store, name)[self._row] = NO_FLOOR if value is None else value
+
+    return property(getter, setter)
+
+
+def _time_column(name: str):
+    def getter(self) -> Optional[float]:
+        value = getattr(self._store, name)[self._row]
+        return None if math.isnan(value) else value
+
+    def setter(self, value: Optional[float]) -> None:
+        getattr(self._store, name)[self._row] = math.nan if value is None else value
+
+    return property(getter, setter)
+
+
+def _flag(bit: int):
+    def getter(self) -> bool:
+        return bool(self._store.state[self._row] & bit)
+
+    def setter(self, value: bool) -> None:
+        state = self._store.state
+        state[self._row] = (state[self._row] | bit) if value else (state[self._row] & ~bit)
+
+    return property(getter, setter)
+
+
+class StoredUser(UserBase):
+    """
+    Handle ligero sobre una fila de PassengerStore. Hereda los métodos de
+    UserBase, no los slots de User: sus atributos se leen y escriben
+    directamente en las columnas, y cada handle ocupa 48 bytes en vez de
+    los 128 que ocuparía reservando además los diez slots de User.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: PassengerStore, row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._store.ids[self._row]
+
+    @id.setter
+    def id(self, value: int) -> None:
+        self._store.ids[self._row] = value
+
+    @property
+    def weight_kg(self) -> float:
+        return self._store.weight[self._row]
+
+    @weight_kg.setter
+    def weight_kg(self, value: float) -> None:
+        self._store.weight[self._row] = value
+
+    @property
+    def call_direction(self) -> Optional[str]:
+        return _DIRECTIONS[self._store.call_direction[self._row]]
+
+    @call_direction.setter
+    def call_direction(self, value: Optional[str]) -> None:
+        self._store.call_direction[self._row] = _DIRECTION_CODES[value]
+
+    current_floor = _int_column("current_floor")
+    destination_floor = _int_column("destination")
+    waiting = _flag(_WAITING)
+    inside_elevator = _flag(_INSIDE)
+    call_time = _time_column("call_time")
+    board_time = _time_column("board_time")
+    alight_time = _time_column("alight_time")
@@ -0,0 +1,72 @@
+# simulation/profiling.py
+"""
+Instrumentación opcional por fases del bucle de simulación.
+
+PhaseTimer acumula, por fase y por cabina, el número de llamadas y el
+tiempo total en nanosegundos (time.perf_counter_ns). ElevatorSystem sólo lo
+usa si se activa con enable_profiling(); desactivado, el bucle no mide nada.
+"""
+
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# Fases medidas, en el orden en que ocurren dentro de un tick
+PHASES = (
+    "handle_requests",
+    "elevator_step",
+    "update_users",
+    "spawn_users",
+)
+
+
+class PhaseTimer:
+    """Contadores (llamadas, ns) por (fase, cabina); cabina None = fase global."""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, Optional[Hashable]], List[int]] = {}
+
+    def add(self, phase: str, car: Optional[Hashable], elapsed_ns: int) -> None:
+        """Suma una llamada de `elapsed_ns` nanosegundos a la fase de la cabina."""
+        stat = self._stats.get((phase, car))
+        if stat is None:
+            self._stats[(phase, car)] = [1, elapsed_ns]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed_ns
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """
+        {fase: {"calls", "total_ns", "mean_ns", "cars": {cabina: {...}}}},
+        con las fases en orden de ejecución.
+        """
+        order = {phase: i for i, phase in enumerate(PHASES)}
+        result: Dict[str, Dict] = {}
+        for (phase, car), (calls, total) in sorted(
+            self._stats.items(), key=lambda item: (order.get(item[0][0], len(order)), item[0][0])
+        ):
+            entry = result.setdefault(phase, {"calls": 0, "total_ns": 0, "cars": {}})
+            entry["calls"] += calls
+            entry["total_ns"] += total
+            if car is not None:
+                entry["cars"][car] = {"calls": calls, "total_ns": total, "mean_ns": total / calls}
+        for entry in result.values():
+            entry["mean_ns"] = entry["total_ns"] / entry["calls"]
+        return result
+
+    def table(self, per_car: bool = False) -> str:
+        """Tabla de texto: llamadas, total (ms), media (µs) y % del tiempo medido."""
+        data = self.as_dict()
+        grand = sum(entry["total_ns"] for entry in data.values()) or 1
+        lines = [f"{'fase':<18}{'cabina':>8}{'llamadas':>11}{'total ms':>11}{'media µs':>10}{'%':>7}"]
+        for phase, entry in data.items():
+            rows = [("-", entry)]
+            if per_car:
+                rows += [(str(car), stat) for car, stat in entry["cars"].items()]
+            for car, stat in rows:
+                lines.append(
+                    f"{phase:<18}{car:>8}{stat['calls']:>11}{stat['total_ns'] / 1e6:>11.2f}"
+                    f"{stat['mean_ns'] / 1e3:>10.2f}{100 * stat['total_ns'] / grand:>7.1f}"
+                )
+        return "\n".join(lines)
@@ -0,0 +1,355 @@
+# simulation/recorder.py
+"""
+Registro columnar del estado de la flota tick a tick.
+
+StateRecorder se engancha a ElevatorSystem (system.recorder) y, cada
+`stride` ticks, guarda de cada cabina posición, dirección, puerta, carga y
+número de paradas. Las muestras se escriben por índice, celda a celda, en
+un bloque NumPy reservado de antemano (`chunk_ticks` muestras x cabinas x
+variables). Al llenarse, el bloque se convierte de golpe en registros
+estructurados que se vuelcan a un fichero .npy (legible con
+numpy.load(path, mmap_mode="r")) o, sin fichero, se añaden en memoria
+como un bloque más; el bloque de escritura se reutiliza.
+
+En cada muestra sólo se leen las cabinas que han podido cambiar: las que
+el sistema ha ejecutado desde la muestra anterior. Una cabina aparcada
+repite su última fila, que se copia de una vez con NumPy al volver a
+escribirla o al convertir el bloque. La primera muestra de cada bloque
+lee todas las cabinas.
+
+En los saltos del motor por eventos (ElevatorSystem.run_until) sólo
+cambian el tiempo y la posición de las cabinas en viaje: skip() apunta el
+tramo y, al convertir el bloque, los tiempos y las posiciones (del perfil
+de cada viaje, en forma cerrada) de todos los tramos se calculan de una
+vez con NumPy. NumPy es opcional: el resto del paquete no lo necesita.
+"""
+
+import math
+from struct import Struct
+from typing import Iterable, List, Optional, Set
+
+from .fleet import _DOOR_CODES, _DIRECTION_CODES
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependencia opcional
+    np = None
+
+# Variables por cabina de cada muestra, en el orden del bloque
+_FIELDS = ("position", "direction", "door", "load", "stops")
+_WIDTH = len(_FIELDS)
+# Escribe las variables de una cabina (una celda del bloque) con una llamada en C
+_PACK_CAR = Struct(f"{_WIDTH}d").pack_into
+_CAR_BYTES = _WIDTH * 8
+
+# Bytes reservados para la cabecera .npy: el tamaño final se escribe al cerrar
+_NPY_HEADER_BYTES = 512
+
+
+def recorder_dtype(num_cars: int):
+    """dtype de una muestra: tiempo y una columna por variable con una celda por cabina."""
+    return np.dtype([
+        ("time", "<f8"),
+        ("position", "<f8", (num_cars,)),
+        ("direction", "i1", (num_cars,)),
+        ("door", "i1", (num_cars,)),
+        ("load", "<f4", (num_cars,)),
+        ("stops", "<i4", (num_cars,)),
+    ])
+
+
+def _within(counts):
+    """Posición de cada elemento dentro de su tramo, para tramos de `counts` elementos."""
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def _trip_positions(trips, counts, t):
+    """
+    Posiciones (cotas) a los instantes `t` de los viajes `trips`, con
+    `counts` instantes seguidos por viaje: motion.MotionProfile.offset
+    vectorizado, con las mismas operaciones en el mismo orden para que
+    coincida bit a bit con el cálculo tick a tick.
+    """
+    def param(name):
+        return np.repeat(np.array([getattr(trip, name) for trip in trips]), counts)
+
+    t1, t2, v0, accel, peak = (param(name) for name in ("t1", "t2", "v0", "accel", "v_peak"))
+    with np.errstate(invalid="ignore"):
+        s1 = np.where(t1 == 0.0, 0.0, v0 * t1 + 0.5 * accel * t1 * t1)
+        tau = t - t2
+        offset = np.where(
+            t >= param("total"), param("distance"),
+            np.where(t < t1, v0 * t + 0.5 * accel * t * t,
+                     np.where(t < t2, s1 + peak * (t - t1),
+                              s1 + peak * (t2 - t1) + peak * tau - 0.5 * accel * tau * tau)),
+        )
+    return param("start") + param("direction") * offset
+
+
+def _position_at(levels, min_floor: int, elevation):
+    """flight_times.position_at vectorizado (searchsorted en lugar de bisect_right)."""
+    levels = np.asarray(levels)
+    index = np.clip(np.searchsorted(levels, elevation, side="right") - 1, 0, len(levels) - 2)
+    return min_floor + index + (elevation - levels[index]) / (levels[index + 1] - levels[index])
+
+
+def _npy_header(dtype, count: int) -> bytes:
+    header = repr({
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": (count,),
+    })
+    # Formato .npy 1.0: firma, versión, longitud (uint16) y dict con relleno
+    body_len = _NPY_HEADER_BYTES - 10
+    padded = header.ljust(body_len - 1) + "\n"
+    if len(padded) != body_len:
+        raise ValueError("Demasiadas cabinas para la cabecera .npy reservada")
+    return b"\x93NUMPY\x01\x00" + body_len.to_bytes(2, "little") + padded.encode("latin1")
+
+
+class StateRecorder:
+    """
+    Muestras del estado de `num_cars` cabinas. Con `path`, las muestras se
+    vuelcan a un .npy por bloques; sin él, se acumulan en memoria.
+    """
+
+    def __init__(
+        self,
+        num_cars: int,
+        path: Optional[str] = None,
+        stride: int = 1,
+        chunk_ticks: int = 4096,
+    ):
+        if np is None:
+            raise ImportError("StateRecorder necesita NumPy (pip install numpy).")
+        if stride < 1 or chunk_ticks < 1:
+            raise ValueError("stride y chunk_ticks deben ser >= 1")
+        self.num_cars = num_cars
+        self.path = path
+        self.stride = stride
+        self.dtype = recorder_dtype(num_cars)
+        self.count = 0
+        self._ticks = 0
+        self.chunk_ticks = chunk_ticks
+        self._rows = 0
+        # Fila del bloque en que se escribió por última vez cada cabina
+        self._last: List[int] = [0] * num_cars
+        # Controladores ejecutados en ticks sin muestra (stride > 1)
+        self._dirty: Set = set()
+        self._chunks: List = []
+        # Bloque de escritura (muestra x cabina x variable) y sus memoryview:
+        # escribir por índice en ellos no pasa por NumPy
+        self._times = np.empty(chunk_ticks)
+        self._block = np.empty((chunk_ticks, num_cars, _WIDTH))
+        self._time_cells = memoryview(self._times)
+        self._bytes = memoryview(self._block).cast("B")
+        # Tramos de skip() pendientes de calcular al convertir el bloque:
+        # (fila, muestras, origen, primer tick, stride, dt) y, por cabina en
+        # viaje, (fila, muestras, cabina, tiempo de viaje, primer tick,
+        # stride, dt, ascensor, viaje)
+        self._spans: List[tuple] = []
+        self._trips: List[tuple] = []
+        self._file = None
+        if path is not None:
+            self._file = open(path, "wb")
+            self._file.write(_npy_header(self.dtype, 0))
+
+    def tick(self, system, active: Optional[Iterable] = None) -> None:
+        """
+        Llamado en cada tick del sistema: guarda una muestra cada `stride`
+        ticks. `active` son los controladores ejecutados en el tick (los
+        demás no han cambiado); sin él, se leen todas las cabinas.
+        """
+        self._ticks += 1
+        if (self._ticks - 1) % self.stride:
+            if active is not None:
+                self._dirty.update(active)
+            return
+        row = self._rows
+        self._time_cells[row] = system.time
+        if active is None or row == 0:
+            active = system.controllers
+            self._dirty.clear()
+        elif self._dirty:
+            active = self._dirty.union(active)
+            self._dirty.clear()
+        index = system._order
+        data = self._bytes
+        last = self._last
+        base = row * self.num_cars
+        # Mismo código que _write_car, en línea: es el camino de cada tick
+        for ctrl in active:
+            i = index[ctrl]
+            elev = ctrl.elevator
+            if last[i] < row - 1:
+                # Aparcada desde su última fila: se repite hasta esta
+                self._block[last[i] + 1:row, i] = self._block[last[i], i]
+            last[i] = row
+            _PACK_CAR(
+                data, (base + i) * _CAR_BYTES,
+                elev.position_m,
+                _DIRECTION_CODES[elev.direction],
+                _DOOR_CODES[elev.door.status],
+                elev.current_weight_kg,
+                elev.stops._count,
+            )
+        self._rows = row + 1
+        self.count += 1
+        if self._rows == self.chunk_ticks:
+            self.flush()
+
+    def skip(self, system, ticks: int, dt: float, active: Iterable) -> None:
+        """
+        Equivale a `ticks` llamadas a tick() en un salto sin eventos de
+        run_until, con los controladores `active`. Se llama con el reloj del
+        sistema ya avanzado y las cabinas aún en el instante anterior al
+        salto. Cada cabina se escribe una vez y sus filas del tramo repiten
+        la primera, como las de una aparcada; el tiempo de las muestras y la
+        posición de las cabinas en viaje se apuntan y se calculan al
+        convertir el bloque (ver _fill_skipped).
+        """
+        done = self._ticks
+        self._ticks = done + ticks
+        # Primer tick del salto (1..ticks) que toca muestra
+        first = -done % self.stride + 1
+        if first > ticks:
+            self._dirty.update(active)
+            return
+        index = system._order
+        cars = self._dirty.union(active)
+        self._dirty.clear()
+        moving = []
+        for ctrl in active:
+            elev = ctrl.elevator
+            trip = elev._trip
+            if trip is not None and elev.door.deadline == math.inf:
+                moving.append((index[ctrl], elev, trip, trip.elapsed))
+
+        write = self._write_car
+        stride = self.stride
+        # Tick del sistema justo antes del salto (ver ElevatorSystem._advance)
+        origin = system._ticks - ticks
+        samples = range(first, ticks + 1, stride)
+        while samples:
+            row = self._rows
+            part = samples[:self.chunk_ticks - row]
+            samples = samples[len(part):]
+            n = len(part)
+            # La primera muestra del bloque lee todas las cabinas
+            for ctrl in system.controllers if row == 0 else cars:
+                write(row, index[ctrl], ctrl.elevator)
+            self._spans.append((row, n, system._epoch, origin + part.start, stride, dt))
+            for i, elev, trip, elapsed in moving:
+                self._trips.append((row, n, i, elapsed, part.start, stride, dt, elev, trip))
+            self._rows = row + n
+            self.count += n
+            if self._rows == self.chunk_ticks:
+                self.flush()
+
+    def _fill_skipped(self) -> None:
+        """Tiempos y posiciones de las muestras de los tramos de skip(), de una vez."""
+        row, n, epoch, first, stride, dt = (np.array(col) for col in zip(*self._spans))
+        j = _within(n)
+        # Mismo cálculo que ElevatorSystem._advance: origen + n·dt
+        ticks = np.repeat(first, n) + np.repeat(stride, n) * j
+        self._times[np.repeat(row, n) + j] = np.repeat(epoch, n) + ticks * np.repeat(dt, n)
+        self._spans.clear()
+        if not self._trips:
+            return
+
+        row, n, car, elapsed, first, stride, dt = (
+            np.array(col) for col in list(zip(*self._trips))[:7]
+        )
+        j = _within(n)
+        # Tiempo de viaje sumando dt tick a tick, como Elevator.step: cumsum
+        # por filas acumula en orden. Los tramos se agrupan por longitudes
+        # parecidas para no rellenar los cortos hasta el más largo.
+        at = np.repeat(first, n) + np.repeat(stride, n) * j
+        # Último tick de cada tramo
+        reach = first + (n - 1) * stride
+        start = np.cumsum(n) - n
+        t = np.empty(len(j))
+        order = np.argsort(reach, kind="stable")
+        lo = 0
+        while lo < len(order):
+            hi = int(np.searchsorted(reach[order], 2 * reach[order[lo]], side="right"))
+            group = order[lo:hi]
+            steps = np.empty((len(group), int(reach[group].max()) + 1))
+            steps[:, 0] = elapsed[group]
+            steps[:, 1:] = dt[group, None]
+            cells = np.repeat(start[group], n[group]) + _within(n[group])
+            t[cells] = np.cumsum(steps, axis=1)[np.repeat(np.arange(len(group)), n[group]), at[cells]]
+            lo = hi
+
+        position = _trip_positions([entry[8] for entry in self._trips], n, t)
+        for k, entry in enumerate(self._trips):
+            elev = entry[7]
+            if elev._levels is not None:
+                cells = slice(start[k], start[k] + n[k])
+                position[cells] = _position_at(elev._levels, elev.min_floor, position[cells])
+        self._block[np.repeat(row, n) + j, np.repeat(car, n), 0] = position
+        self._trips.clear()
+
+    def _write_car(self, row: int, i: int, elev) -> None:
+        """Escribe la cabina i (ascensor `elev`) en la fila `row` del bloque."""
+        last = self._last
+        if last[i] < row - 1:
+            # Aparcada desde su última fila: se repite hasta esta
+            self._block[last[i] + 1:row, i] = self._block[last[i], i]
+        last[i] = row
+        _PACK_CAR(
+            self._bytes, (row * self.num_cars + i) * _CAR_BYTES,
+            elev.position_m,
+            _DIRECTION_CODES[elev.direction],
+            _DOOR_CODES[elev.door.status],
+            elev.current_weight_kg,
+            elev.stops._count,
+        )
+
+    def flush(self) -> None:
+        """Convierte el bloque pendiente en registros y lo vuelca al fichero (o a memoria)."""
+        rows = self._rows
+        if not rows:
+            return
+        block = self._block
+        for car, row in enumerate(self._last):
+            if row < rows - 1:
+                block[row + 1:rows, car] = block[row, car]
+        if self._spans:
+            self._fill_skipped()
+        records = np.empty(rows, dtype=self.dtype)
+        records["time"] = self._times[:rows]
+        for f, name in enumerate(_FIELDS):
+            records[name] = block[:rows, :, f]
+        if self._file is not None:
+            self._file.write(records.tobytes())
+        else:
+            self._chunks.append(records)
+        self._rows = 0
+
+    def close(self) -> None:
+        """Vuelca lo pendiente y, con fichero, fija el número de muestras en la cabecera."""
+        self.flush()
+        if self._file is not None and not self._file.closed:
+            self._file.seek(0)
+            self._file.write(_npy_header(self.dtype, self.count))
+            self._file.close()
+
+    def to_array(self):
+        """
+        Todas las muestras como array estructurado: en memoria, o el .npy
+        mapeado (tras close()) si se grabó a fichero.
+        """
+        if self.path is not None:
+            self.close()
+            return np.load(self.path, mmap_mode="r")
+        self.flush()
+        if not self._chunks:
+            return np.zeros(0, dtype=self.dtype)
+        return np.concatenate(self._chunks)
+
+    def __enter__(self) -> "StateRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,200 @@
+# simulation/replications.py
+"""
+Réplicas Monte Carlo de un escenario en paralelo.
+
+Cada réplica construye el edificio, genera sus usuarios con una semilla
+propia, ejecuta la simulación con ElevatorSystem.run_until y devuelve un
+registro compacto de KPIs. Las semillas se derivan de una semilla maestra
+por índice de réplica, así que el resultado no depende del número de
+procesos.
+"""
+
+import math
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from .scenario import generate_user_events, setup_elevators, setup_system
+
+# Escenario por defecto (mismos parámetros que main.main)
+DEFAULT_SCENARIO = {
+    "min_floor": 1,
+    "max_floor": 10,
+    "num_cars": 1,
+    "speed": 1.0,
+    "num_users": 5,
+    "steps": 200,
+    "dt": 0.5,
+}
+
+# Métricas de cada réplica que se agregan con intervalo de confianza
+AGGREGATED_KPIS = (
+    "mean_wait_s", "p90_wait_s", "mean_journey_s", "p90_journey_s", "delivered", "utilization",
+)
+
+
+def derive_seeds(master_seed: int, n: int) -> List[int]:
+    """Semillas de las n réplicas, determinadas sólo por la semilla maestra."""
+    rng = random.Random(master_seed)
+    return [rng.getrandbits(63) for _ in range(n)]
+
+
+def _mean(values: List[float]) -> float:
+    return statistics.fmean(values) if values else math.nan
+
+
+def _or_nan(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def run_replication(scenario: Dict, seed: int) -> Dict:
+    """Ejecuta una réplica del escenario y devuelve su registro de KPIs."""
+    sc = {**DEFAULT_SCENARIO, **scenario}
+    rng = random.Random(seed)
+    system = setup_system(sc["min_floor"], sc["max_floor"])
+    setup_elevators(
+        system,
+        [{"id": i, "speed": sc["speed"]} for i in range(1, sc["num_cars"] + 1)],
+    )
+    total_time = sc["steps"] * sc["dt"]
+    events = generate_user_events(
+        sc["num_users"], sc["min_floor"], sc["max_floor"], total_time, sc["dt"], rng=rng
+    )
+    system.run_until(total_time, sc["dt"], events)
+    return {"seed": seed, **collect_kpis(system, total_time, len(events))}
+
+
+def collect_kpis(system, total_time: float, generated: int) -> Dict:
+    """
+    KPIs de una ejecución terminada: esperas, viajes, entregados y uso de
+    cabinas. Salen de los histogramas del sistema, no de la lista de usuarios.
+    """
+    wait = system.wait_histogram.summary()
+    journey = system.journey_histogram.summary()
+    utilization = [
+        elev.busy_time / total_time if total_time > 0 else 0.0
+        for elev in system.elevators
+    ]
+    return {
+        "generated": generated,
+        "delivered": journey["count"],
+        "mean_wait_s": _or_nan(wait["mean"]),
+        "p50_wait_s": _or_nan(wait["p50"]),
+        "p90_wait_s": _or_nan(wait["p90"]),
+        "p99_wait_s": _or_nan(wait["p99"]),
+        "max_wait_s": _or_nan(wait["max"]),
+        "mean_journey_s": _or_nan(journey["mean"]),
+        "p50_journey_s": _or_nan(journey["p50"]),
+        "p90_journey_s": _or_nan(journey["p90"]),
+        "p99_journey_s": _or_nan(journey["p99"]),
+        "max_journey_s": _or_nan(journey["max"]),
+        "utilization": _mean(utilization),
+        "car_utilization": utilization,
+    }
+
+
+def _run_replication_args(args) -> Dict:
+    return run_replication(*args)
+
+
+def _t_cdf(t: float, df: int) -> float:
+    """
+    Función de distribución de la t de Student con df entero, por la suma
+    finita exacta de Abramowitz & Stegun 26.7.3-26.7.4.
+    """
+    theta = math.atan(t / math.sqrt(df))
+    c2 = math.cos(theta) ** 2
+    if df % 2:
+        # df impar: A = 2/pi · (theta + sin·cos·(1 + 2/3 cos² + 2·4/(3·5) cos⁴ + ...))
+        total, term = 0.0, 1.0
+        for k in range(1, (df - 1) // 2 + 1):
+            total += term
+            term *= c2 * (2 * k) / (2 * k + 1)
+        a = 2 / math.pi * (theta + math.sin(theta) * math.cos(theta) * total)
+    else:
+        # df par: A = sin·(1 + 1/2 cos² + 1·3/(2·4) cos⁴ + ...)
+        total, term = 0.0, 1.0
+        for k in range(1, df // 2 + 1):
+            total += term
+            term *= c2 * (2 * k - 1) / (2 * k)
+        a = math.sin(theta) * total
+    return 0.5 + a / 2
+
+
+def _t_pdf(t: float, df: int) -> float:
+    log_norm = math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - 0.5 * math.log(df * math.pi)
+    return math.exp(log_norm - (df + 1) / 2 * math.log1p(t * t / df))
+
+
+def _t_quantile(p: float, df: int) -> float:
+    """
+    Cuantil de la t de Student. Con df = 1 y df = 2 hay forma cerrada; en
+    el resto se parte de la expansión de Cornish-Fisher (Abramowitz &
+    Stegun 26.7.5), que subestima las colas con pocos grados de libertad,
+    y se refina con Newton sobre la distribución exacta.
+    """
+    if df <= 0:
+        return math.inf
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = statistics.NormalDist().inv_cdf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    t = z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+    for _ in range(50):
+        step = (_t_cdf(t, df) - p) / _t_pdf(t, df)
+        t -= step
+        if abs(step) <= 1e-12 * max(abs(t), 1.0):
+            break
+    return t
+
+
+def confidence_interval(values: List[float], confidence: float = 0.95) -> Dict:
+    """Media e intervalo de confianza t de Student (se ignoran los NaN)."""
+    values = [v for v in values if not math.isnan(v)]
+    n = len(values)
+    if n == 0:
+        return {"n": 0, "mean": math.nan, "ci_low": math.nan, "ci_high": math.nan}
+    mean = statistics.fmean(values)
+    if n == 1:
+        return {"n": 1, "mean": mean, "ci_low": math.nan, "ci_high": math.nan}
+    half = _t_quantile(0.5 + confidence / 2, n - 1) * statistics.stdev(values) / math.sqrt(n)
+    return {"n": n, "mean": mean, "ci_low": mean - half, "ci_high": mean + half}
+
+
+def run_replications(
+    scenario: Dict,
+    n: int,
+    master_seed: int = 0,
+    workers: Optional[int] = None,
+    confidence: float = 0.95,
+) -> Dict:
+    """
+    Ejecuta n réplicas del escenario (en un ProcessPoolExecutor si
+    workers != 1) y agrega sus KPIs con intervalos de confianza.
+    Devuelve {"scenario", "master_seed", "replications", "summary"}.
+    """
+    seeds = derive_seeds(master_seed, n)
+    args = [(scenario, seed) for seed in seeds]
+    if workers == 1:
+        records = [_run_replication_args(a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map conserva el orden de las réplicas
+            records = list(pool.map(_run_replication_args, args))
+
+    summary = {
+        kpi: confidence_interval([float(r[kpi]) for r in records], confidence)
+        for kpi in AGGREGATED_KPIS
+    }
+    return {
+        "scenario": {**DEFAULT_SCENARIO, **scenario},
+        "master_seed": master_seed,
+        "replications": records,
+        "summary": summary,
+    }
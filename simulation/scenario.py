@@ -0,0 +1,76 @@
+# simulation/scenario.py
+"""
+Construcción de escenarios: edificio, ascensores y eventos de usuarios.
+"""
+
+import math
+import random
+
+from .elevator_system import ElevatorSystem
+from .elevator import Elevator
+from .controller import Controller
+
+
+def setup_system(min_floor: int, max_floor: int) -> ElevatorSystem:
+    """Inicializa y devuelve un ElevatorSystem con todos los FloorPanels."""
+    system = ElevatorSystem(min_floor=min_floor, max_floor=max_floor)
+    system.populate_panels()
+    return system
+
+
+def setup_elevators(
+    system: ElevatorSystem,
+    specs: list[dict]
+) -> None:
+    """Añade instancias de Elevator y Controller al sistema."""
+    for spec in specs:
+        elev = Elevator(
+            system=system,
+            id=spec["id"],
+            min_floor=spec.get("min_floor", system.min_floor),
+            max_floor=spec.get("max_floor", system.max_floor),
+            speed_mps=spec.get("speed", 1.0),
+            acceleration_mps2=spec.get("acceleration", math.inf),
+            floor_heights=spec.get("floor_heights"),
+        )
+        ctrl = Controller(
+            id=spec["id"],
+            elevator=elev,
+            floor_panels=list(system.floor_panels.values()),
+            logger=system.logger
+        )
+        system.add_elevator(elev, ctrl)
+
+
+def generate_user_events(
+    num_users: int,
+    min_floor: int,
+    max_floor: int,
+    total_time: float,
+    dt: float,
+    rng=None,
+) -> list[dict]:
+    """
+    Crea eventos de usuarios: tiempo de aparición, id, peso, origen y destino.
+    `rng` es un random.Random para sorteos reproducibles (por defecto, el
+    generador global del módulo random).
+    """
+    rng = rng or random
+    events = []
+    for uid in range(1, num_users + 1):
+        origin = rng.randint(min_floor, max_floor)
+        dest_choices = [f for f in range(min_floor, max_floor + 1) if f != origin]
+        dest = rng.choice(dest_choices)
+        max_tick = int(total_time / dt)
+        tick = rng.randint(0, max_tick)
+        event_time = tick * dt
+        weight = rng.uniform(50.0, 90.0)
+        events.append({
+            "time": event_time,
+            "id": uid,
+            "weight": weight,
+            "origin": origin,
+            "dest": dest,
+            "dispatched": False
+        })
+    return sorted(events, key=lambda e: e["time"])
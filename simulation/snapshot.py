@@ -0,0 +1,245 @@
+# simulation/snapshot.py
+"""
+Instantáneas compactas del estado de un ElevatorSystem.
+
+take_snapshot() vuelca el estado dinámico del edificio (reloj, ascensores
+con puertas, motor y display, controladores, paneles, usuarios vivos,
+histogramas, log y estado del RNG) a tuplas de tipos básicos, serializables
+con pickle. restore_snapshot() lo vuelca de nuevo sobre un sistema con la
+misma topología y build_from_snapshot() construye uno nuevo, lo que permite
+bifurcar una simulación en un instante t sin copiar el grafo de objetos.
+
+Los usuarios se guardan como una tabla; paneles y cabinas los referencian
+por índice, así que un mismo usuario sigue siendo un único objeto al
+restaurar.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .controller import Controller
+from .dispatch import Dispatcher, EtaDispatcher
+from .elevator import Elevator
+from .histogram import LogHistogram
+from .logger import Logger
+from .motion import MotionProfile
+from .passengers import PassengerStore
+from .user import User
+
+# Atributos guardados de cada componente, en orden
+ELEVATOR_FIELDS = (
+    "current_floor", "position_m", "direction", "is_moving", "busy_time", "_just_opened",
+    "speed_mps", "weight_limit_kg", "current_weight_kg", "emergency_state", "floor_heights",
+)
+DOOR_FIELDS = ("status", "now", "deadline", "open_duration", "blocked", "auto_close", "emergency_locked")
+MOTOR_FIELDS = (
+    "current_speed", "target_speed", "acceleration", "max_speed", "direction",
+    "position_m", "braking", "power_on",
+)
+DISPLAY_FIELDS = ("current_floor", "direction", "door_status", "error_message", "mode")
+PANEL_FIELDS = ("up_pressed", "down_pressed", "indicator_up", "indicator_down")
+USER_FIELDS = User.__slots__
+# El viaje en curso se guarda por sus parámetros y se replanifica al restaurar
+TRIP_FIELDS = ("start", "target", "v0", "max_speed", "accel", "floor", "elapsed")
+
+SNAPSHOT_VERSION = 6
+
+
+def _get(obj: Any, fields: Tuple[str, ...]) -> tuple:
+    return tuple(getattr(obj, name) for name in fields)
+
+
+def _set(obj: Any, fields: Tuple[str, ...], values: Iterable[Any]) -> None:
+    for name, value in zip(fields, values):
+        setattr(obj, name, value)
+
+
+def _trip_state(elev: Elevator) -> Optional[tuple]:
+    return _get(elev._trip, TRIP_FIELDS) if elev._trip is not None else None
+
+
+def _restore_trip(state: Optional[tuple]) -> Optional[MotionProfile]:
+    if state is None:
+        return None
+    start, target, v0, max_speed, accel, floor, elapsed = state
+    trip = MotionProfile(start, target, v0, max_speed, accel, floor)
+    trip.elapsed = elapsed
+    return trip
+
+
+def _live_users(system) -> List[User]:
+    """Usuarios del sistema más los que sólo están en colas o cabinas (modo almacén)."""
+    users = list(system.users)
+    seen = {id(u) for u in users}
+    queued = [u for panel in system.floor_panels.values() for u in panel.waiting_users()]
+    riding = [
+        u for ctrl in system.controllers for riders in ctrl.riders.values() for u in riders
+    ]
+    for user in queued + riding:
+        if id(user) not in seen:
+            seen.add(id(user))
+            users.append(user)
+    return users
+
+
+def _histogram_state(h: LogHistogram) -> tuple:
+    return (h._counts.tobytes(), h.count, h.total, h.min, h.max)
+
+
+def _restore_histogram(h: LogHistogram, state: tuple) -> None:
+    counts, h.count, h.total, h.min, h.max = state
+    h._counts = array("Q")
+    h._counts.frombytes(counts)
+
+
+def take_snapshot(system, include_logs: bool = True) -> Dict[str, Any]:
+    """Estado completo de `system` como diccionario de tipos básicos."""
+    users = _live_users(system)
+    index = {id(u): i for i, u in enumerate(users)}
+    logger = system.logger
+    return {
+        "version": SNAPSHOT_VERSION,
+        "time": system.time,
+        # Origen, dt y contador del reloj (ver ElevatorSystem._advance)
+        "clock": (system._epoch, system._tick_dt, system._ticks),
+        "floors": (system.min_floor, system.max_floor),
+        # Sólo se guarda la clase: build_from_snapshot necesita el despacho
+        # si no es el de por defecto
+        "dispatcher": type(system.dispatcher).__name__,
+        "delivered_count": system.delivered_count,
+        "rng": system.rng.getstate() if system.rng is not None else None,
+        "store": system.passenger_store is not None,
+        "users": [_get(u, USER_FIELDS) for u in users],
+        "registered": len(system.users),
+        "panels": [
+            (floor, _get(panel, PANEL_FIELDS), [index[id(u)] for u in panel.waiting_users()])
+            for floor, panel in system.floor_panels.items()
+        ],
+        "cars": [
+            (
+                elev.id, elev.min_floor, elev.max_floor,
+                _get(elev, ELEVATOR_FIELDS), elev.stops._mask, len(elev.stops),
+                _get(elev.door, DOOR_FIELDS), _get(elev.motor, MOTOR_FIELDS),
+                _get(elev.display, DISPLAY_FIELDS),
+                ctrl.id, list(ctrl.pending_requests),
+                [(dest, [index[id(u)] for u in riders]) for dest, riders in ctrl.riders.items()],
+                _trip_state(elev), list(ctrl.deferred_calls),
+            )
+            for elev, ctrl in zip(system.elevators, system.controllers)
+        ],
+        "histograms": (
+            _histogram_state(system.wait_histogram),
+            _histogram_state(system.journey_histogram),
+        ),
+        "logger": (
+            logger.log_level, logger.enabled, logger.capacity, logger.total_logged,
+            list(logger._records) if include_logs else None,
+        ),
+    }
+
+
+def restore_snapshot(system, snap: Dict[str, Any]) -> None:
+    """
+    Devuelve `system` al estado de `snap`. El sistema debe tener la misma
+    topología (pisos, ascensores y controladores) que el de la instantánea.
+    """
+    if snap.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Versión de instantánea no soportada: {snap.get('version')}")
+    cars = snap["cars"]
+    if (system.min_floor, system.max_floor) != tuple(snap["floors"]) or len(system.elevators) != len(cars):
+        raise ValueError("La instantánea no corresponde a la topología de este sistema")
+
+    system.time = system._clock_at = snap["time"]
+    system._epoch, system._tick_dt, system._ticks = snap["clock"]
+    system.delivered_count = snap["delivered_count"]
+    if snap["rng"] is not None and system.rng is not None:
+        system.rng.setstate(snap["rng"])
+
+    # Usuarios: objetos nuevos, compartidos por colas, cabinas y lista global
+    if snap["store"]:
+        system.passenger_store = PassengerStore()
+        users = []
+        for values in snap["users"]:
+            user = system.passenger_store.new_user(0, 0.0, 0)
+            _set(user, USER_FIELDS, values)
+            users.append(user)
+    else:
+        users = [User.__new__(User) for _ in snap["users"]]
+        for user, values in zip(users, snap["users"]):
+            _set(user, USER_FIELDS, values)
+    system.users[:] = users[:snap["registered"]]
+
+    for floor, flags, waiting in snap["panels"]:
+        panel = system.floor_panels[floor]
+        panel.pop_waiting_users()
+        for i in waiting:
+            panel._enqueue(users[i])
+        _set(panel, PANEL_FIELDS, flags)
+
+    for (elev_id, _, _, fields, mask, count, door, motor, display,
+         ctrl_id, pending, riders, trip, deferred), elev, ctrl in zip(cars, system.elevators, system.controllers):
+        if elev.id != elev_id or ctrl.id != ctrl_id:
+            raise ValueError("La instantánea no corresponde a la topología de este sistema")
+        _set(elev, ELEVATOR_FIELDS, fields)
+        elev.stops._mask, elev.stops._count = mask, count
+        _set(elev.door, DOOR_FIELDS, door)
+        _set(elev.motor, MOTOR_FIELDS, motor)
+        _set(elev.display, DISPLAY_FIELDS, display)
+        elev._trip = _restore_trip(trip)
+        ctrl.pending_requests = list(pending)
+        ctrl.deferred_calls = list(deferred)
+        ctrl.riders = {dest: [users[i] for i in idx] for dest, idx in riders}
+
+    # El conjunto activo y las rutas del despacho se derivan del estado restaurado
+    system._rebuild_active()
+    system.dispatcher.refresh()
+
+    _restore_histogram(system.wait_histogram, snap["histograms"][0])
+    _restore_histogram(system.journey_histogram, snap["histograms"][1])
+
+    level, enabled, capacity, total_logged, records = snap["logger"]
+    logger = system.logger
+    logger.log_level = level
+    logger.enabled = enabled
+    logger.total_logged = total_logged
+    if records is not None:
+        logger._records.clear()
+        logger._records.extend(records)
+
+
+def build_from_snapshot(snap: Dict[str, Any], dispatcher: Optional[Dispatcher] = None):
+    """
+    Construye un ElevatorSystem nuevo (paneles, ascensores y controladores
+    por defecto) y le aplica la instantánea. El sink del log no se hereda.
+    `dispatcher` es el despacho del sistema nuevo, sin controladores (ver
+    Dispatcher.fresh); es obligatorio si el sistema de la instantánea no
+    usaba EtaDispatcher.
+    """
+    from .elevator_system import ElevatorSystem
+    import random
+
+    if dispatcher is None:
+        if snap["dispatcher"] != EtaDispatcher.__name__:
+            raise ValueError(
+                f"La instantánea usaba {snap['dispatcher']}: pasa un despacho "
+                "equivalente con dispatcher=..."
+            )
+        dispatcher = EtaDispatcher()
+    min_floor, max_floor = snap["floors"]
+    level, _, capacity, _, _ = snap["logger"]
+    system = ElevatorSystem(
+        min_floor=min_floor,
+        max_floor=max_floor,
+        logger=Logger(log_level=level, capacity=capacity),
+        rng=random.Random() if snap["rng"] is not None else None,
+        dispatcher=dispatcher,
+    )
+    system.populate_panels()
+    panels = list(system.floor_panels.values())
+    for car in snap["cars"]:
+        elev_id, car_min, car_max, ctrl_id = car[0], car[1], car[2], car[9]
+        elev = Elevator(id=elev_id, system=system, min_floor=car_min, max_floor=car_max)
+        ctrl = Controller(id=ctrl_id, elevator=elev, floor_panels=panels, logger=system.logger)
+        system.add_elevator(elev, ctrl)
+    restore_snapshot(system, snap)
+    return system
@@ -0,0 +1,112 @@
+# simulation/stops.py
+"""
+Conjunto de paradas de una cabina con consultas en orden LOOK.
+"""
+
+import math
+from typing import Iterator, List, Optional
+
+
+class StopSet:
+    """
+    Paradas pendientes de un ascensor guardadas como mapa de bits por piso
+    (bit i = piso min_floor + i). La pertenencia es O(1) y la siguiente
+    parada por encima o por debajo de una posición se obtiene con
+    operaciones de bits, sin recorrer la lista de paradas.
+    """
+
+    def __init__(self, min_floor: int, max_floor: int):
+        self.min_floor = min_floor
+        self.max_floor = max_floor
+        self._mask = 0
+        self._count = 0
+
+    def _bit(self, floor: int) -> int:
+        return 1 << (floor - self.min_floor)
+
+    def add(self, floor: int) -> bool:
+        """Añade una parada; devuelve True si no estaba ya."""
+        if not self.min_floor <= floor <= self.max_floor:
+            raise ValueError(f"Piso {floor} fuera de rango [{self.min_floor}, {self.max_floor}]")
+        bit = self._bit(floor)
+        if self._mask & bit:
+            return False
+        self._mask |= bit
+        self._count += 1
+        return True
+
+    def discard(self, floor: int) -> bool:
+        """Elimina una parada si existe; devuelve True si estaba."""
+        if floor not in self:
+            return False
+        self._mask &= ~self._bit(floor)
+        self._count -= 1
+        return True
+
+    def clear(self) -> None:
+        """Elimina todas las paradas."""
+        self._mask = 0
+        self._count = 0
+
+    def __contains__(self, floor: int) -> bool:
+        if not self.min_floor <= floor <= self.max_floor:
+            return False
+        return bool(self._mask >> (floor - self.min_floor) & 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        """Recorre las paradas de menor a mayor piso."""
+        mask, floor = self._mask, self.min_floor
+        while mask:
+            low = mask & -mask
+            yield floor + low.bit_length() - 1
+            mask ^= low
+
+    def at_or_above(self, position: float) -> Optional[int]:
+        """Parada más baja con piso >= position (None si no hay)."""
+        index = max(math.ceil(position) - self.min_floor, 0)
+        mask = self._mask >> index
+        if not mask:
+            return None
+        return self.min_floor + index + (mask & -mask).bit_length() - 1
+
+    def at_or_below(self, position: float) -> Optional[int]:
+        """Parada más alta con piso <= position (None si no hay)."""
+        index = math.floor(position) - self.min_floor
+        if index < 0:
+            return None
+        mask = self._mask & ((1 << (index + 1)) - 1)
+        if not mask:
+            return None
+        return self.min_floor + mask.bit_length() - 1
+
+    def next_stop(self, position: float, direction: str) -> Optional[int]:
+        """
+        Siguiente parada en orden LOOK: la más cercana en el sentido de la
+        marcha y, si no queda ninguna, la más cercana en sentido contrario.
+        Sin sentido ("idle") se elige la más cercana (empate: hacia arriba).
+        """
+        above = self.at_or_above(position)
+        below = self.at_or_below(position)
+        if direction == "up":
+            return above if above is not None else below
+        if direction == "down":
+            return below if below is not None else above
+        if above is None:
+            return below
+        if below is None or above - position <= position - below:
+            return above
+        return below
+
+    def in_service_order(self, position: float, direction: str) -> List[int]:
+        """Todas las paradas en el orden en que LOOK las atendería."""
+        stops = list(self)
+        at = [f for f in stops if f == position]
+        above = [f for f in stops if f > position]
+        below = [f for f in reversed(stops) if f < position]
+        first = self.next_stop(position, direction)
+        if first is not None and (first < position or (first == position and direction == "down")):
+            return at + below + above
+        return at + above + below
@@ -0,0 +1,189 @@
+# simulation/trace.py
+"""
+Trazas binarias de llegadas con registros de tamaño fijo.
+
+Formato: cabecera de 16 bytes (firma b"ELVTRC01" + número de registros
+como uint64) seguida de registros little-endian de 32 bytes:
+time (float64), id (int64), weight (float64), origin (int32), dest (int32),
+ordenados por tiempo.
+
+TraceWriter escribe la traza por bloques. TraceSource es una ArrivalSource
+que lee directamente del fichero mapeado en memoria (mmap), sin cargarlo:
+arrancar la reproducción es instantáneo y la memoria no crece con el
+tamaño de la traza. open_trace_array() da la misma traza como
+numpy.memmap estructurado para análisis vectorizado.
+"""
+
+import math
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Optional
+
+from .arrivals import ArrivalSource
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependencia opcional
+    np = None
+
+MAGIC = b"ELVTRC01"
+_HEADER = struct.Struct("<8sQ")
+_RECORD = struct.Struct("<dqdii")
+_TIME = struct.Struct("<d")
+
+HEADER_SIZE = _HEADER.size
+RECORD_SIZE = _RECORD.size
+
+# dtype equivalente para numpy.memmap (mismo orden y tamaño que _RECORD)
+TRACE_DTYPE = [
+    ("time", "<f8"), ("id", "<i8"), ("weight", "<f8"), ("origin", "<i4"), ("dest", "<i4"),
+]
+
+
+class TraceWriter:
+    """
+    Escribe llegadas en una traza binaria. Las llegadas deben venir en
+    orden de tiempo; el número de registros se fija en la cabecera al cerrar.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._last_time = -math.inf
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, 0))
+
+    def write(self, evt: Dict) -> None:
+        """Añade una llegada con las claves de generate_user_events."""
+        time = evt["time"]
+        if time < self._last_time:
+            raise ValueError(f"Llegada fuera de orden: t={time} tras t={self._last_time}")
+        self._last_time = time
+        self._file.write(
+            _RECORD.pack(time, evt["id"], evt["weight"], evt["origin"], evt["dest"])
+        )
+        self.count += 1
+
+    def write_many(self, events: Iterable[Dict]) -> None:
+        """Añade todas las llegadas de un iterable ordenado."""
+        for evt in events:
+            self.write(evt)
+
+    def write_chunk(self, chunk: Dict) -> None:
+        """Añade un bloque de arrays (formato de traffic.generate_arrivals) de una vez."""
+        if np is None:
+            raise ImportError("write_chunk necesita NumPy (pip install numpy).")
+        times = np.asarray(chunk["time"], dtype=np.float64)
+        if times.size == 0:
+            return
+        if times[0] < self._last_time or (np.diff(times) < 0).any():
+            raise ValueError("Bloque de llegadas fuera de orden")
+        records = np.empty(times.size, dtype=TRACE_DTYPE)
+        for name, _ in TRACE_DTYPE:
+            records[name] = chunk[name]
+        self._file.write(records.tobytes())
+        self._last_time = float(times[-1])
+        self.count += times.size
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, self.count))
+        self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _check_header(buffer, path: str) -> int:
+    if len(buffer) < HEADER_SIZE:
+        raise ValueError(f"{path} no es una traza de llegadas")
+    magic, count = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} no es una traza de llegadas")
+    if HEADER_SIZE + count * RECORD_SIZE > len(buffer):
+        raise ValueError(f"{path} está truncada: faltan registros")
+    return count
+
+
+class TraceSource(ArrivalSource):
+    """
+    Reproduce una traza binaria en orden de tiempo leyendo del mmap: sólo
+    se decodifica la llegada que se consulta, nunca el fichero entero.
+    """
+
+    def __init__(self, path: str, start_time: Optional[float] = None):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"{path} no es una traza de llegadas")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = _check_header(self._map, path)
+        self._cursor = 0
+        if start_time is not None:
+            self.seek(start_time)
+
+    def __len__(self) -> int:
+        """Llegadas que quedan por reproducir."""
+        return self.count - self._cursor
+
+    def _time_at(self, index: int) -> float:
+        return _TIME.unpack_from(self._map, HEADER_SIZE + index * RECORD_SIZE)[0]
+
+    def seek(self, time: float) -> None:
+        """Sitúa el cursor en la primera llegada con tiempo >= time (búsqueda binaria)."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._time_at(mid) < time:
+                lo = mid + 1
+            else:
+                hi = mid
+        self._cursor = lo
+
+    def peek_time(self) -> float:
+        if self._cursor >= self.count:
+            return math.inf
+        return self._time_at(self._cursor)
+
+    def pop(self) -> Dict:
+        if self._cursor >= self.count:
+            raise IndexError("No quedan llegadas en la fuente.")
+        time, uid, weight, origin, dest = _RECORD.unpack_from(
+            self._map, HEADER_SIZE + self._cursor * RECORD_SIZE
+        )
+        self._cursor += 1
+        return {
+            "time": time,
+            "id": uid,
+            "weight": weight,
+            "origin": origin,
+            "dest": dest,
+            "dispatched": False,
+        }
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "TraceSource":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_trace_array(path: str):
+    """Traza completa como numpy.memmap estructurado (sólo lectura, sin copiar)."""
+    if np is None:
+        raise ImportError("open_trace_array necesita NumPy (pip install numpy).")
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or _HEADER.unpack(header)[0] != MAGIC:
+        raise ValueError(f"{path} no es una traza de llegadas")
+    count = _HEADER.unpack(header)[1]
+    return np.memmap(path, dtype=TRACE_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
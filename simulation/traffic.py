@@ -0,0 +1,266 @@
+# simulation/traffic.py
+"""
+Generador de tráfico vectorizado con perfiles horarios origen-destino.
+
+Un día se describe como una lista de periodos {"start", "end", "rate",
+"profile"}: en cada periodo las llegadas son un proceso de Poisson de tasa
+`rate` (pasajeros/s), y el par origen-destino se sortea de la matriz del
+perfil (subida, bajada, comida o entre plantas). Al ser la tasa constante
+por tramos, el conjunto del día es un proceso de Poisson no homogéneo.
+
+Los sorteos se hacen por bloques con NumPy: tiempos por suma acumulada de
+exponenciales y pares origen-destino con una tabla de alias (O(1) por
+muestra). generate_arrivals() es un generador perezoso de bloques de
+arrays; iter_events() los convierte en los dicts que consume la simulación.
+NumPy es opcional: el resto del paquete no lo necesita.
+"""
+
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependencia opcional
+    np = None
+
+
+# Mezclas típicas de los tres flujos básicos: entrante (vestíbulo -> plantas),
+# saliente (plantas -> vestíbulo) y entre plantas
+PROFILES: Dict[str, Dict[str, float]] = {
+    "up_peak": {"incoming": 0.85, "outgoing": 0.05, "interfloor": 0.10},
+    "down_peak": {"incoming": 0.05, "outgoing": 0.85, "interfloor": 0.10},
+    "lunch": {"incoming": 0.40, "outgoing": 0.40, "interfloor": 0.20},
+    "interfloor": {"incoming": 0.0, "outgoing": 0.0, "interfloor": 1.0},
+}
+
+# Jornada de oficina de ejemplo (segundos desde las 00:00)
+OFFICE_DAY: List[Dict] = [
+    {"start": 7.5 * 3600, "end": 9.5 * 3600, "rate": 0.20, "profile": "up_peak"},
+    {"start": 9.5 * 3600, "end": 12.5 * 3600, "rate": 0.04, "profile": "interfloor"},
+    {"start": 12.5 * 3600, "end": 14.0 * 3600, "rate": 0.12, "profile": "lunch"},
+    {"start": 14.0 * 3600, "end": 17.0 * 3600, "rate": 0.04, "profile": "interfloor"},
+    {"start": 17.0 * 3600, "end": 19.0 * 3600, "rate": 0.18, "profile": "down_peak"},
+]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("El generador de tráfico necesita NumPy (pip install numpy).")
+
+
+def od_matrix(profile: str, min_floor: int, max_floor: int, lobby: Optional[int] = None):
+    """
+    Matriz origen-destino (pisos x pisos, diagonal nula, suma 1) del perfil.
+    El vestíbulo es `lobby` (por defecto, min_floor).
+    """
+    _require_numpy()
+    if profile not in PROFILES:
+        raise ValueError(f"Perfil desconocido: {profile}")
+    n = max_floor - min_floor + 1
+    if n < 2:
+        raise ValueError("Se necesitan al menos dos pisos")
+    lobby = min_floor if lobby is None else lobby
+    if not min_floor <= lobby <= max_floor:
+        raise ValueError(f"El vestíbulo ({lobby}) debe estar entre {min_floor} y {max_floor}")
+    lobby_idx = lobby - min_floor
+
+    incoming = np.zeros((n, n))
+    incoming[lobby_idx, :] = 1.0
+    incoming[lobby_idx, lobby_idx] = 0.0
+    outgoing = incoming.T.copy()
+    interfloor = np.ones((n, n))
+    np.fill_diagonal(interfloor, 0.0)
+    if n > 2:
+        # Entre plantas no incluye el vestíbulo
+        interfloor[lobby_idx, :] = 0.0
+        interfloor[:, lobby_idx] = 0.0
+
+    mix = PROFILES[profile]
+    matrix = sum(
+        weight * flow / flow.sum()
+        for weight, flow in (
+            (mix["incoming"], incoming),
+            (mix["outgoing"], outgoing),
+            (mix["interfloor"], interfloor),
+        )
+        if weight
+    )
+    return matrix / matrix.sum()
+
+
+class AliasTable:
+    """
+    Tabla de alias de Vose: tras construirla en O(k), cada muestra de una
+    distribución discreta de k categorías cuesta O(1) (un uniforme y una
+    comparación), y se sortean bloques enteros de una vez.
+    """
+
+    def __init__(self, weights):
+        _require_numpy()
+        p = np.asarray(weights, dtype=np.float64).ravel()
+        if p.size == 0 or (p < 0).any() or p.sum() <= 0:
+            raise ValueError("Los pesos deben ser no negativos y no todos nulos")
+        k = p.size
+        scaled = p * (k / p.sum())
+        self.prob = np.ones(k)
+        self.alias = np.arange(k)
+        small = [i for i in range(k) if scaled[i] < 1.0]
+        large = [i for i in range(k) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Lo que queda tiene probabilidad 1 salvo errores de redondeo
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng, size: int):
+        """Devuelve `size` índices sorteados con `rng` (numpy.random.Generator)."""
+        column = rng.integers(0, self.prob.size, size=size)
+        keep = rng.random(size) < self.prob[column]
+        return np.where(keep, column, self.alias[column])
+
+
+def check_schedule(
+    schedule: List[Dict],
+    min_floor: Optional[int] = None,
+    max_floor: Optional[int] = None,
+    lobby: Optional[int] = None,
+) -> None:
+    """
+    Comprueba que los periodos estén ordenados y no se solapen (cada uno
+    empieza cuando o después de que acabe el anterior); si no, las
+    llegadas saldrían desordenadas. Con los pisos del edificio comprueba
+    además el vestíbulo (entre min_floor y max_floor), el perfil de cada
+    periodo y su matriz "od" propia: pisos x pisos, no negativa, con la
+    diagonal nula y suma positiva. Lanza ValueError con el periodo culpable.
+    """
+    if min_floor is not None and lobby is not None and not min_floor <= lobby <= max_floor:
+        raise ValueError(f"El vestíbulo ({lobby}) debe estar entre {min_floor} y {max_floor}")
+    previous_end = None
+    for index, period in enumerate(schedule):
+        start, end = period["start"], period["end"]
+        if end < start:
+            raise ValueError(f"Periodo {index}: termina ({end}) antes de empezar ({start})")
+        if previous_end is not None and start < previous_end:
+            raise ValueError(
+                f"Periodo {index}: empieza en {start}, antes del final del "
+                f"anterior ({previous_end}); los periodos deben ir ordenados y sin solaparse"
+            )
+        previous_end = end
+        if min_floor is not None:
+            _check_period_od(index, period, max_floor - min_floor + 1)
+
+
+def _check_period_od(index: int, period: Dict, n: int) -> None:
+    if "od" not in period:
+        if period.get("profile") not in PROFILES:
+            raise ValueError(f"Periodo {index}: perfil desconocido: {period.get('profile')}")
+        return
+    _require_numpy()
+    od = np.asarray(period["od"], dtype=np.float64)
+    if od.shape != (n, n):
+        raise ValueError(f"Periodo {index}: la matriz od debe ser de {n}x{n} pisos, no {od.shape}")
+    if not np.isfinite(od).all() or (od < 0).any():
+        raise ValueError(f"Periodo {index}: la matriz od debe ser finita y no negativa")
+    if od.diagonal().any():
+        raise ValueError(f"Periodo {index}: la matriz od debe tener la diagonal nula")
+    if od.sum() <= 0:
+        raise ValueError(f"Periodo {index}: la matriz od no puede sumar 0")
+
+
+def generate_arrivals(
+    schedule: List[Dict],
+    min_floor: int,
+    max_floor: int,
+    seed: Optional[int] = None,
+    chunk_size: int = 65536,
+    lobby: Optional[int] = None,
+    first_id: int = 1,
+) -> Iterator[Dict]:
+    """
+    Genera perezosamente las llegadas de `schedule` en bloques de como mucho
+    `chunk_size`. Cada bloque es un dict de arrays NumPy ordenados por
+    tiempo: time, id, weight, origin y dest. Un periodo puede dar su propia
+    matriz con la clave "od" en lugar de "profile".
+
+    El calendario (con sus matrices y el vestíbulo) se valida con
+    check_schedule() al llamar a la función, no al consumir el primer bloque.
+    """
+    _require_numpy()
+    check_schedule(schedule, min_floor, max_floor, lobby)
+    return _arrival_chunks(schedule, min_floor, max_floor, seed, chunk_size, lobby, first_id)
+
+
+def _arrival_chunks(
+    schedule: List[Dict],
+    min_floor: int,
+    max_floor: int,
+    seed: Optional[int],
+    chunk_size: int,
+    lobby: Optional[int],
+    first_id: int,
+) -> Iterator[Dict]:
+    rng = np.random.default_rng(seed)
+    n = max_floor - min_floor + 1
+    tables: Dict[str, AliasTable] = {}
+    next_id = first_id
+
+    for period in schedule:
+        start, end, rate = period["start"], period["end"], period["rate"]
+        if rate <= 0 or end <= start:
+            continue
+        if "od" in period:
+            table = AliasTable(period["od"])
+        else:
+            profile = period["profile"]
+            if profile not in tables:
+                tables[profile] = AliasTable(od_matrix(profile, min_floor, max_floor, lobby))
+            table = tables[profile]
+
+        clock = start
+        while clock < end:
+            # Bloque ajustado a las llegadas esperadas que quedan en el periodo
+            expected = rate * (end - clock)
+            size = min(chunk_size, int(expected + 4.0 * expected ** 0.5) + 16)
+            # Proceso de Poisson: suma acumulada de tiempos entre llegadas
+            times = clock + np.cumsum(rng.exponential(1.0 / rate, size=size))
+            clock = times[-1]
+            times = times[times < end]
+            count = times.size
+            if count == 0:
+                continue
+            pairs = table.sample(rng, count)
+            yield {
+                "time": times,
+                "id": np.arange(next_id, next_id + count, dtype=np.int64),
+                "weight": rng.uniform(50.0, 90.0, size=count),
+                "origin": (pairs // n + min_floor).astype(np.int32),
+                "dest": (pairs % n + min_floor).astype(np.int32),
+            }
+            next_id += count
+
+
+def iter_events(chunks: Iterator[Dict]) -> Iterator[Dict]:
+    """
+    Convierte bloques de generate_arrivals en los dicts de llegada de
+    generate_user_events, listos para StreamSource o run_until.
+    """
+    for chunk in chunks:
+        columns = zip(
+            chunk["time"].tolist(),
+            chunk["id"].tolist(),
+            chunk["weight"].tolist(),
+            chunk["origin"].tolist(),
+            chunk["dest"].tolist(),
+        )
+        for time, uid, weight, origin, dest in columns:
+            yield {
+                "time": time,
+                "id": uid,
+                "weight": weight,
+                "origin": origin,
+                "dest": dest,
+                "dispatched": False,
+            }
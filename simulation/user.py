@@ -2,35 +2,35 @@
 
 from typing import Optional
 
-class User:
-    def __init__(
-        self,
-        id: int,
-        weight_kg: float,
-        current_floor: int
-    ):
-        self.id: int = id
-        self.current_floor: int = current_floor
-        self.destination_floor: Optional[int] = None
-        self.inside_elevator: bool = False
-        self.waiting: bool = False
-        self.weight_kg: float = weight_kg
 
-    def call_elevator(self, direction: str) -> None:
+class UserBase:
+    """
+    Comportamiento de un pasajero (llamar, entrar, salir, tiempos) sin
+    almacenamiento propio: User guarda los atributos en slots y StoredUser
+    (ver passengers.py) en las columnas de PassengerStore.
+    """
+
+    __slots__ = ()
+
+    def call_elevator(self, direction: str, time: Optional[float] = None) -> None:
         """
-        Marca al usuario como en espera y (opcional) almacena la dirección deseada.
+        Marca al usuario como en espera y almacena la dirección deseada
+        y, si se indica, el instante de la llamada.
         """
         self.waiting = True
-        # Si necesitas almacenar direction para lógica futura, podrías hacerlo:
-        # self.call_direction = direction
+        self.call_direction = direction
+        if time is not None:
+            self.call_time = time
 
-    def enter_elevator(self) -> None:
+    def enter_elevator(self, time: Optional[float] = None) -> None:
         """
         El usuario entra al ascensor.
         """
         if self.waiting:
             self.inside_elevator = True
             self.waiting = False
+            if time is not None:
+                self.board_time = time
 
     def select_floor(self, floor: int) -> None:
         """
@@ -39,7 +39,7 @@ class User:
         if self.inside_elevator:
             self.destination_floor = floor
 
-    def exit_elevator(self) -> None:
+    def exit_elevator(self, time: Optional[float] = None) -> None:
         """
         El usuario sale del ascensor al llegar al destino.
         """
@@ -47,9 +47,58 @@ class User:
             self.inside_elevator = False
             self.current_floor = self.destination_floor
             self.destination_floor = None
+            if time is not None:
+                self.alight_time = time
+
+    def wait_time(self) -> Optional[float]:
+        """Segundos entre la llamada y la entrada (None si aún no ha entrado)."""
+        if self.call_time is None or self.board_time is None:
+            return None
+        return self.board_time - self.call_time
+
+    def journey_time(self) -> Optional[float]:
+        """Segundos entre la llamada y la salida (None si aún no ha llegado)."""
+        if self.call_time is None or self.alight_time is None:
+            return None
+        return self.alight_time - self.call_time
 
     def wait_for_elevator(self) -> None:
         """
         Pon al usuario en estado de espera.
         """
         self.waiting = True
+
+
+class User(UserBase):
+    # Sin __dict__ por instancia: con muchos pasajeros la diferencia de memoria es notable
+    __slots__ = (
+        "id",
+        "current_floor",
+        "destination_floor",
+        "inside_elevator",
+        "waiting",
+        "call_direction",
+        "weight_kg",
+        "call_time",
+        "board_time",
+        "alight_time",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        weight_kg: float,
+        current_floor: int
+    ):
+        self.id: int = id
+        self.current_floor: int = current_floor
+        self.destination_floor: Optional[int] = None
+        self.inside_elevator: bool = False
+        self.waiting: bool = False
+        # Dirección pedida en el panel de planta ("up"/"down")
+        self.call_direction: Optional[str] = None
+        self.weight_kg: float = weight_kg
+        # Marcas de tiempo de simulación (s): llamada, entrada y salida
+        self.call_time: Optional[float] = None
+        self.board_time: Optional[float] = None
+        self.alight_time: Optional[float] = None
@@ -0,0 +1,60 @@
+# tests/test_arrivals.py
+import math
+
+import pytest
+from simulation.arrivals import (
+    EventListSource,
+    StreamSource,
+    as_arrival_source,
+)
+
+
+def _evt(t, uid):
+    return {"time": t, "id": uid, "weight": 70.0, "origin": 1, "dest": 3, "dispatched": False}
+
+
+def test_event_list_source_pops_only_due_events():
+    events = [_evt(0.5, 1), _evt(1.0, 2), _evt(1.0, 3), _evt(4.0, 4)]
+    src = EventListSource(events)
+    assert src.pop_due(0.4) == []
+    assert [e["id"] for e in src.pop_due(1.0)] == [1, 2, 3]
+    assert src.peek_time() == 4.0
+    assert [e["id"] for e in src.pop_due(10.0)] == [4]
+    assert src.exhausted()
+    assert src.peek_time() == math.inf
+
+
+def test_event_list_source_skips_dispatched():
+    events = [_evt(0.5, 1), _evt(1.0, 2)]
+    events[0]["dispatched"] = True
+    src = EventListSource(events)
+    assert [e["id"] for e in src.pop_due(2.0)] == [2]
+
+
+def test_stream_source_is_lazy():
+    pulled = []
+
+    def gen():
+        for uid in range(1, 1000):
+            pulled.append(uid)
+            yield _evt(float(uid), uid)
+
+    src = StreamSource(gen())
+    assert [e["id"] for e in src.pop_due(2.0)] == [1, 2]
+    # Sólo se ha leído un elemento de anticipación
+    assert pulled == [1, 2, 3]
+
+
+def test_stream_source_rejects_out_of_order():
+    src = StreamSource(iter([_evt(2.0, 1), _evt(1.0, 2)]))
+    src.pop()
+    with pytest.raises(ValueError):
+        src.pop()
+
+
+def test_as_arrival_source_adapts_inputs():
+    src = EventListSource([])
+    assert as_arrival_source(src) is src
+    assert isinstance(as_arrival_source([_evt(1.0, 1)]), EventListSource)
+    assert isinstance(as_arrival_source(iter([])), StreamSource)
+    assert as_arrival_source(None).exhausted()
@@ -0,0 +1,39 @@
+# tests/test_benchmarks.py
+
+from benchmarks import suite
+
+
+def test_compare_flags_only_slow_cases():
+    baseline = {
+        "a": {"ticks_per_s": 1000.0},
+        "b": {"ticks_per_s": 1000.0},
+        "micro": {"calls_per_s": 500.0},
+    }
+    results = {
+        "a": {"ticks_per_s": 850.0},     # -15%: dentro del margen
+        "b": {"ticks_per_s": 700.0},     # -30%: regresión
+        "micro": {"calls_per_s": 100.0},
+        "new": {"ticks_per_s": 1.0},     # sin base: se ignora
+    }
+    regressions = suite.compare(results, baseline, margin=0.2)
+    assert [r.split(":")[0] for r in regressions] == ["b", "micro"]
+
+
+def test_run_case_reports_metrics():
+    result = suite.run_case(10, 1, "light", repeat=1)
+    assert result["passengers"] == round(suite.TRAFFIC["light"] * suite.SIM_TIME_S)
+    assert result["ticks_per_s"] > 0
+    assert result["passengers_per_s"] >= 0
+    assert result["peak_memory_kb"] > 0
+
+
+def test_main_fails_on_regression(tmp_path, capsys):
+    import json
+
+    path = tmp_path / "base.json"
+    base = {"results": {suite.case_name(10, 1, "light"): {"ticks_per_s": 1e12}}}
+    path.write_text(json.dumps(base))
+    code = suite.main(["--case", "10f-1c-light", "--no-micro", "--repeat", "1",
+                       "--compare", str(path)])
+    assert code == 1
+    assert "Regresiones" in capsys.readouterr().out
@@ -4,6 +4,7 @@ from simulation.controller import Controller
 from simulation.elevator import Elevator
 from simulation.floor_panel import FloorPanel
 from simulation.logger import Logger
+from simulation.user import User
 
 @pytest.fixture
 def setup_controller():
@@ -66,3 +67,128 @@ def test_reset_clears_state(setup_controller):
     ctrl.reset()
     assert ctrl.get_active_calls() == []
     assert ctrl.elevator.target_floors == []
+
+
+def _open_at(elevator, floor):
+    elevator.current_floor = floor
+    elevator.position_m = float(floor)
+    elevator.door.force_open()
+
+
+def test_update_users_boards_from_floor_panel_and_alights_at_destination(setup_controller):
+    ctrl = setup_controller
+    user = User(id=7, weight_kg=70.0, current_floor=2)
+    user.destination_floor = 4
+    user.call_elevator("up")
+    ctrl.floor_panels[1].call(user)
+
+    _open_at(ctrl.elevator, 2)
+    ctrl.update_users()
+    assert user.inside_elevator
+    assert ctrl.get_riders() == [user]
+    assert ctrl.get_active_calls() == [4]
+    assert not ctrl.floor_panels[1].up_pressed
+
+    _open_at(ctrl.elevator, 4)
+    ctrl.update_users()
+    assert not user.inside_elevator
+    assert user.current_floor == 4
+    assert ctrl.get_riders() == []
+
+
+def test_update_users_ignores_other_floors_and_closed_doors(setup_controller):
+    ctrl = setup_controller
+    user = User(id=8, weight_kg=70.0, current_floor=3)
+    user.destination_floor = 1
+    user.call_elevator("down")
+    ctrl.floor_panels[2].call(user)
+
+    # Puerta cerrada en el piso del usuario: no entra
+    ctrl.elevator.current_floor = 3
+    ctrl.update_users()
+    assert user.waiting
+    # Puerta abierta en otro piso: tampoco
+    _open_at(ctrl.elevator, 2)
+    ctrl.update_users()
+    assert user.waiting
+    assert ctrl.get_riders() == []
+
+
+def _wait_at(ctrl, uid, floor, dest, weight=70.0):
+    user = User(id=uid, weight_kg=weight, current_floor=floor)
+    user.destination_floor = dest
+    user.call_elevator("up" if dest > floor else "down")
+    ctrl._panels_by_floor[floor].call(user)
+    return user
+
+
+def test_boarding_respects_weight_limit_and_reregisters_call(setup_controller):
+    ctrl = setup_controller
+    elev = ctrl.elevator
+    elev.weight_limit_kg = 150.0
+    users = [_wait_at(ctrl, i, 1, 4) for i in range(3)]
+    elev.door.force_open()
+    ctrl.update_users()
+    assert [u.inside_elevator for u in users] == [True, True, False]
+    assert elev.current_weight_kg == pytest.approx(140.0)
+    panel = ctrl._panels_by_floor[1]
+    assert panel.waiting_count() == 1 and panel.indicator_up
+    assert ctrl.deferred_calls == [1]
+
+    # Al dejar el piso, la llamada del que se quedó vuelve a registrarse
+    for _ in range(200):
+        ctrl.run_tick(0.5)
+        if users[2].inside_elevator:
+            break
+    assert users[0].current_floor == users[1].current_floor == 4
+    assert users[2].inside_elevator
+    assert elev.current_weight_kg == pytest.approx(70.0)
+    assert ctrl.deferred_calls == []
+
+
+def test_empty_car_always_takes_first_passenger(setup_controller):
+    ctrl = setup_controller
+    elev = ctrl.elevator
+    elev.weight_limit_kg = 100.0
+    heavy = _wait_at(ctrl, 1, 1, 3, weight=180.0)
+    other = _wait_at(ctrl, 2, 1, 3)
+    elev.door.force_open()
+    ctrl.update_users()
+    assert heavy.inside_elevator and not other.inside_elevator
+    assert elev.current_weight_kg == 180.0
+
+
+def test_load_is_adjusted_on_alight(setup_controller):
+    ctrl = setup_controller
+    elev = ctrl.elevator
+    users = [_wait_at(ctrl, i, 1, 2 + i % 2, weight=60.1 + i) for i in range(4)]
+    elev.door.force_open()
+    ctrl.update_users()
+    assert elev.current_weight_kg == pytest.approx(sum(u.weight_kg for u in users))
+    for _ in range(100):
+        ctrl.run_tick(0.5)
+    assert all(u.current_floor in (2, 3) and not u.inside_elevator for u in users)
+    assert elev.current_weight_kg == 0.0
+
+
+def test_user_without_destination_is_not_boarded_and_car_settles(setup_controller):
+    ctrl = setup_controller
+    elev = ctrl.elevator
+    elev.weight_limit_kg = 150.0
+    lost = User(id=1, weight_kg=100.0, current_floor=1)
+    lost.call_elevator("up")
+    ctrl._panels_by_floor[1].call(lost)
+    rider = _wait_at(ctrl, 2, 1, 3, weight=100.0)
+    elev.door.force_open()
+    ctrl.update_users()
+    # El que no tiene destino no ocupa sitio: el siguiente sí cabe
+    assert not lost.inside_elevator and not lost.waiting
+    assert rider.inside_elevator
+    assert ctrl.deferred_calls == []
+    assert any("no destination" in line for line in ctrl.logger.logs)
+
+    for _ in range(100):
+        ctrl.run_tick(0.5)
+    assert rider.current_floor == 3
+    assert ctrl.get_riders() == []
+    assert ctrl.is_quiescent()
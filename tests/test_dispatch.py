@@ -0,0 +1,124 @@
+# tests/test_dispatch.py
+import pytest
+
+from simulation.dispatch import Dispatcher, EtaDispatcher, FirstCarDispatcher
+from simulation.elevator_system import ElevatorSystem
+from simulation.scenario import setup_elevators, setup_system
+
+
+def _building(cars=2, floors=10, dispatcher=None):
+    system = setup_system(1, floors)
+    if dispatcher is not None:
+        system.dispatcher = dispatcher
+    setup_elevators(system, [{"id": i} for i in range(1, cars + 1)])
+    return system
+
+
+def _place(elev, floor, direction="idle", stops=()):
+    elev.current_floor = floor
+    elev.position_m = float(floor)
+    elev.direction = direction
+    for stop in stops:
+        elev.call(stop)
+
+
+def test_idle_cars_nearest_wins_and_ties_go_to_first_car():
+    system = _building()
+    first, second = system.controllers
+    assert system.dispatcher.select(5, "up") is first
+    _place(second.elevator, 8)
+    assert system.dispatcher.select(7, "up") is second
+    assert system.dispatcher.estimate(second, 7, "up") == 1.0
+
+
+def test_intermediate_stops_add_door_time():
+    system = _building(cars=1)
+    ctrl = system.controllers[0]
+    _place(ctrl.elevator, 1, stops=[3])
+    # 4 pisos a 1 m/s más una parada intermedia (apertura + cierre)
+    assert system.dispatcher.estimate(ctrl, 5, "up") == pytest.approx(4.0 + 2.0)
+
+
+def test_call_direction_matters_for_moving_cars():
+    system = _building()
+    moving, idle = system.controllers
+    _place(moving.elevator, 3, "up", stops=[10])
+    _place(idle.elevator, 1)
+    # Subiendo pasa por el 5 enseguida; para bajar tendría que ir al 10 y volver
+    assert system.dispatcher.select(5, "up") is moving
+    assert system.dispatcher.select(5, "down") is idle
+    assert system.dispatcher.estimate(moving, 5, "down") == pytest.approx(7.0 + 5.0 + 2.0)
+
+
+def test_pending_assignments_count_as_stops():
+    system = _building(cars=1)
+    ctrl = system.controllers[0]
+    before = system.dispatcher.estimate(ctrl, 6, "up")
+    system.dispatch_request(3, "up")
+    assert system.dispatcher.estimate(ctrl, 6, "up") == before + 2.0
+
+
+def test_emergency_cars_are_never_chosen():
+    system = _building()
+    first, second = system.controllers
+    first.elevator.activate_emergency()
+    assert system.dispatcher.select(1, "up") is second
+    second.elevator.activate_emergency()
+    system.dispatch_request(4, "up")
+    assert not first.pending_requests and not second.pending_requests
+    assert "No car available" in system.logger.history_since(0)[-1]
+
+
+def test_calls_are_spread_over_the_fleet():
+    system = _building(cars=4, floors=30)
+    for floor in (2, 10, 20, 29):
+        system.dispatch_request(floor, "down")
+        system.run_tick(0.5)
+    served = [ctrl for ctrl in system.controllers if ctrl.elevator.stops or ctrl.pending_requests]
+    assert len(served) > 1
+
+
+def test_dispatcher_is_pluggable():
+    class LastCar(Dispatcher):
+        def __init__(self):
+            self.controllers = []
+
+        def add_controller(self, controller):
+            self.controllers.append(controller)
+
+        def select(self, floor, direction):
+            return self.controllers[-1]
+
+    system = _building(cars=3, dispatcher=LastCar())
+    system.dispatch_request(4, "up")
+    assert system.controllers[-1].pending_requests == [4]
+
+    legacy = _building(cars=3, dispatcher=FirstCarDispatcher())
+    _place(legacy.elevators[0], 10)
+    legacy.dispatch_request(1, "up")
+    assert legacy.controllers[0].pending_requests == [1]
+
+
+def test_estimate_follows_car_parameter_changes_without_refresh():
+    system = _building(cars=2)
+    first, second = system.controllers
+    _place(second.elevator, 2)
+    assert system.dispatcher.estimate(first, 9, "up") == 8.0
+    assert system.dispatcher.select(9, "up") is second
+
+    # Sin refresh(): la siguiente decisión ya usa la nueva velocidad
+    first.elevator.speed_mps = 2.0
+    assert system.dispatcher.estimate(first, 9, "up") == 4.0
+    assert system.dispatcher.select(9, "up") is first
+    first.elevator.motor.max_speed = 0.5
+    assert system.dispatcher.estimate(first, 9, "up") == 16.0
+
+    # También el tiempo de puertas de las paradas intermedias
+    _place(first.elevator, 1, stops=[3])
+    first.elevator.motor.max_speed = 1.0
+    first.elevator.door.open_duration = 2.0
+    assert system.dispatcher.estimate(first, 5, "up") == pytest.approx(4.0 + 4.0)
+
+
+def test_default_dispatcher_is_eta():
+    assert isinstance(ElevatorSystem().dispatcher, EtaDispatcher)
@@ -32,3 +32,39 @@ def test_render_contains_correct_info():
     assert "Direction: down" in output
     assert "Door: closing" in output
     assert "Error: Err msg" in output
+
+
+def test_version_only_changes_with_content():
+    d = Display(id=1)
+    v = d.version
+    d.update(0, "—", "closed")
+    assert d.version == v
+    d.update_floor(4)
+    assert d.version == v + 1
+    d.update(4, "↑", "opening")
+    assert d.version == v + 3
+
+
+def test_render_is_cached_until_change():
+    d = Display(id=1)
+    first = d.render()
+    assert d.render() is first
+    d.update_door("open")
+    assert "Door: open" in d.render()
+
+
+def test_publish_notifies_subscribers_only_on_change():
+    d = Display(id=1)
+    frames = []
+    callback = lambda display, frame: frames.append(frame)
+    d.subscribe(callback)
+    assert d.publish() is True
+    assert d.publish() is False
+    d.update_floor(2)
+    assert d.is_dirty()
+    assert d.publish() is True
+    assert frames == [frames[0], d.render()]
+    d.unsubscribe(callback)
+    d.show_error("Overload")
+    d.publish()
+    assert len(frames) == 2
@@ -1,4 +1,6 @@
 # tests/test_door.py
+import math
+
 import pytest
 from simulation.door import Door
 
@@ -59,3 +61,32 @@ def test_force_open_ignores_block_and_emergency():
     assert d.status == "open"
     assert d.timer == 0.0
     assert d.is_open()
+
+
+def test_deadline_is_absolute_and_reported():
+    d = Door(id=1, open_duration=2.0)
+    d.tick(10.0)
+    assert d.next_transition() == math.inf
+    d.open()
+    assert d.next_transition() == 12.0
+    d.tick(0.75)
+    assert d.timer == pytest.approx(1.25)
+    # Entre transiciones el estado y el deadline no cambian
+    d.tick(0.75)
+    assert d.status == "opening"
+    assert d.next_transition() == 12.0
+    d.tick(0.75)
+    assert d.status == "open"
+    assert d.next_transition() == math.inf
+
+
+def test_sync_jumps_clock_and_completes_due_transition():
+    d = Door(id=1, open_duration=1.0)
+    d.sync(50.0)
+    d.open()
+    d.sync(50.5)
+    assert d.status == "opening"
+    d.sync(51.0)
+    assert d.status == "open"
+    d.close()
+    assert d.next_transition() == 52.0
@@ -39,3 +39,43 @@ def test_step_idle_when_no_requests():
     assert e.door_status == 'closed'
 
 
+
+def _run_until_idle(e, dt=0.5, max_steps=1000):
+    served = []
+    for _ in range(max_steps):
+        was = e.door_status
+        e.step(dt)
+        if was == 'closed' and e.door_status == 'opening':
+            served.append(e.current_floor)
+        if e.is_parked():
+            break
+    return served
+
+
+def test_stops_are_served_in_look_order():
+    e = Elevator(id=1, min_floor=1, max_floor=10, speed_mps=1.0)
+    for floor in (7, 3, 9, 5):
+        e.call(floor)
+    assert e.target_floors == [3, 5, 7, 9]
+    assert _run_until_idle(e) == [3, 5, 7, 9]
+
+
+def test_look_reverses_only_when_no_stops_ahead():
+    e = Elevator(id=1, min_floor=1, max_floor=10, speed_mps=1.0)
+    e.current_floor = 5
+    e.position_m = 5.0
+    e.call(8)
+    e.step(1.0)   # 5 -> 6 subiendo
+    e.call(4)     # detrás: se atiende al volver
+    e.call(7)     # delante: se atiende antes que 8
+    assert e.target_floors == [7, 8, 4]
+    assert _run_until_idle(e) == [7, 8, 4]
+
+
+def test_call_on_current_floor_opens_without_moving():
+    e = Elevator(id=1, min_floor=1, max_floor=5, speed_mps=1.0)
+    e.call(1)
+    e.step(0.5)
+    assert e.position_m == 1.0
+    assert e.door_status == 'opening'
+    assert e.target_floors == []
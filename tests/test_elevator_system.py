@@ -64,3 +64,248 @@ def test_get_elevator_status_returns_list_of_dicts(simple_system):
     assert info["id"] == 1
     assert isinstance(info["current_floor"], int)
     assert info["direction"] in ("up", "down", "idle")
+
+
+def _build_scenario(seed, num_users, steps, dt, num_cars=2):
+    import copy
+    import random
+    import main
+
+    random.seed(seed)
+    events = main.generate_user_events(num_users, 1, 8, steps * dt, dt)
+    systems = []
+    for _ in range(2):
+        system = main.setup_system(1, 8)
+        main.setup_elevators(system, [{"id": i} for i in range(1, num_cars + 1)])
+        systems.append((system, copy.deepcopy(events)))
+    return systems
+
+
+def _snapshot(system):
+    return (
+        system.time,
+        [(e.current_floor, e.position_m, e.direction, e.door.status, e.door.now,
+          e.door.deadline, list(e.target_floors))
+         for e in system.elevators],
+        [(u.id, u.current_floor, u.waiting, u.inside_elevator) for u in system.users],
+        list(system.logger.logs),
+    )
+
+
+@pytest.mark.parametrize("dt", [0.5, 0.1, 0.2])
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_run_until_matches_tick_engine(seed, dt, capsys):
+    import main
+
+    # Mismo tramo de simulación (200 s) con dt exactos y no exactos en binario
+    steps = int(round(200 / dt))
+    (tick_sys, tick_events), (event_sys, event_events) = _build_scenario(seed, 6, steps, dt)
+    main.run_simulation(tick_sys, steps, dt, tick_events)
+    capsys.readouterr()
+    event_sys.run_until(steps * dt, dt, event_events)
+    assert _snapshot(event_sys) == _snapshot(tick_sys)
+
+
+def test_run_until_skips_ticks_between_events(capsys, monkeypatch):
+    import copy
+    import random
+    import main
+
+    steps, dt = 1200, 0.5
+    random.seed(3)
+    events = main.generate_user_events(12, 1, 20, steps * dt, dt)
+    systems = []
+    for _ in range(2):
+        system = main.setup_system(1, 20)
+        main.setup_elevators(system, [{"id": i, "acceleration": 0.8} for i in range(1, 4)])
+        systems.append(system)
+    tick_sys, event_sys = systems
+    main.run_simulation(tick_sys, steps, dt, copy.deepcopy(events))
+    capsys.readouterr()
+
+    ticks = []
+    run_tick = event_sys.run_tick
+    monkeypatch.setattr(event_sys, "run_tick", lambda dt: (ticks.append(dt), run_tick(dt)))
+    event_sys.run_until(steps * dt, dt, copy.deepcopy(events))
+    # Con cabinas en marcha o puertas moviéndose también se salta entre eventos
+    assert len(ticks) < steps // 2
+    event_sys.publish_displays()
+    assert event_sys.snapshot(include_logs=False) == tick_sys.snapshot(include_logs=False)
+    assert _snapshot(event_sys) == _snapshot(tick_sys)
+
+
+def test_run_until_jumps_over_idle_time(simple_system):
+    system = simple_system
+    events = [{"time": 50.0, "id": 1, "weight": 70.0, "origin": 3, "dest": 1, "dispatched": False}]
+    system.run_until(49.0, 0.5, events)
+    # Sin llegadas el edificio está en reposo y sólo avanza el reloj
+    assert system.time == pytest.approx(49.0)
+    assert system.users == []
+    system.run_until(60.0, 0.5, events)
+    assert events[0]["dispatched"]
+    assert system.users[0].id == 1
+
+
+def test_run_until_accepts_streaming_arrivals(capsys):
+    import main
+
+    steps, dt = 300, 0.5
+    (list_sys, list_events), (stream_sys, stream_events) = _build_scenario(5, 5, steps, dt)
+    main.run_simulation(list_sys, steps, dt, list_events)
+    capsys.readouterr()
+    stream_sys.run_until(steps * dt, dt, (evt for evt in stream_events))
+    assert _snapshot(stream_sys) == _snapshot(list_sys)
+
+
+def test_spawned_user_is_delivered(simple_system):
+    system = simple_system
+    events = [{"time": 0.5, "id": 1, "weight": 70.0, "origin": 2, "dest": 3, "dispatched": False}]
+    system.run_until(30.0, 0.5, events)
+    user = system.users[0]
+    assert not user.waiting and not user.inside_elevator
+    assert user.current_floor == 3
+    assert system.elevators[0].current_weight_kg == 0.0
+
+
+def test_parked_cars_are_not_stepped():
+    import main
+
+    system = main.setup_system(1, 8)
+    main.setup_elevators(system, [{"id": i} for i in range(1, 4)])
+    assert system.active_controllers() == []
+    system.dispatch_request(floor=5, direction="up")
+    ctrl = system.controllers[0]
+    assert system.active_controllers() == [ctrl]
+
+    system.run_tick(0.5)
+    # Sólo la cabina con trabajo avanza (su puerta va en hora; las demás no)
+    assert system.elevators[0].door.now == 0.5
+    assert system.elevators[1].door.now == 0.0
+    for _ in range(40):
+        system.run_tick(0.5)
+    assert system.elevators[0].is_parked()
+    assert system.active_controllers() == []
+
+
+def test_woken_car_syncs_door_clock():
+    import main
+
+    system = main.setup_system(1, 8)
+    main.setup_elevators(system, [{"id": 1}])
+    for _ in range(10):
+        system.run_tick(0.5)
+    elev = system.elevators[0]
+    assert elev.door.now == 0.0
+    # Una parada directa despierta la cabina y pone su puerta en hora
+    elev.call(3)
+    assert system.active_controllers() == system.controllers
+    assert elev.door.now == system.time
+    system.run_tick(0.5)
+    assert elev.position_m > 1.0
+
+
+def test_active_set_matches_stepping_every_car(capsys):
+    import main
+
+    steps, dt = 300, 0.5
+    (active_sys, active_events), (full_sys, full_events) = _build_scenario(3, 20, steps, dt, num_cars=3)
+    active_sys.run_until(steps * dt, dt, active_events)
+
+    # Referencia: todos los controladores en cada tick, sin conjunto activo
+    for _ in range(steps):
+        full_sys.time += dt
+        for ctrl in full_sys.controllers:
+            ctrl.run_tick(dt)
+        for ctrl in full_sys.controllers:
+            ctrl.update_users()
+        for evt in full_events:
+            if not evt["dispatched"] and evt["time"] <= full_sys.time:
+                full_sys.spawn_user(evt)
+        full_sys.refresh_loads()
+
+    def state(system):
+        return (
+            [(e.current_floor, e.position_m, e.direction, e.door.status, e.busy_time,
+              list(e.target_floors)) for e in system.elevators],
+            [(u.id, u.current_floor, u.waiting, u.inside_elevator) for u in system.users],
+            list(system.logger.logs),
+        )
+
+    assert state(active_sys) == state(full_sys)
+
+
+def test_full_cars_leave_passengers_queued_until_served():
+    import random
+    import main
+
+    random.seed(11)
+    events = main.generate_user_events(40, 1, 8, 60.0, 0.5)
+    system = main.setup_system(1, 8)
+    main.setup_elevators(system, [{"id": 1}, {"id": 2}])
+    for elev in system.elevators:
+        elev.weight_limit_kg = 160.0
+
+    for _ in range(200):
+        system.run_until(system.time + 5.0, 0.5, events)
+        loads = [e.current_weight_kg for e in system.elevators]
+        assert all(load <= 160.0 or len(ctrl.get_riders()) == 1
+                   for load, ctrl in zip(loads, system.controllers))
+        system.refresh_loads()
+        assert [e.current_weight_kg for e in system.elevators] == pytest.approx(loads)
+    assert system.delivered_count == 40
+    assert any("Car full" in line for line in system.logger.logs)
+
+
+def test_publish_displays_only_sends_changed_cars():
+    import main
+
+    system = main.setup_system(1, 8)
+    main.setup_elevators(system, [{"id": i} for i in range(1, 4)])
+    frames = []
+    for elev in system.elevators:
+        elev.display.subscribe(lambda display, frame: frames.append(display.id))
+    assert system.publish_displays() == 3
+    assert system.publish_displays() == 0
+
+    system.dispatch_request(floor=5, direction="up")
+    system.run_tick(0.5)
+    frames.clear()
+    system.publish_displays()
+    assert frames == [system.elevators[0].id]
+    system.elevators[2].activate_emergency()
+    frames.clear()
+    system.publish_displays()
+    assert system.elevators[2].id in frames
+    assert "Error: EMERGENCY" in system.elevators[2].display.render()
+
+
+def test_streamed_day_can_run_in_segments(capsys):
+    import main
+
+    steps, dt = 400, 0.5
+    (whole_sys, whole_events), (split_sys, split_events) = _build_scenario(9, 12, steps, dt)
+    whole_sys.run_until(steps * dt, dt, iter(whole_events))
+    stream = (evt for evt in split_events)
+    for end in (37.0, 80.0, 121.5, steps * dt):
+        split_sys.run_until(end, dt, stream)
+    # Ninguna llegada se pierde en los cortes entre tramos
+    assert len(split_sys.users) == len(split_events) == len(whole_sys.users)
+    assert _snapshot(split_sys) == _snapshot(whole_sys)
+
+
+def test_direct_call_moves_a_parked_car():
+    import main
+
+    system = main.setup_system(1, 8)
+    main.setup_elevators(system, [{"id": 1}, {"id": 2}])
+    for _ in range(4):
+        system.run_tick(0.5)
+    elev = system.elevators[1]
+    assert system.active_controllers() == []
+    elev.call(5)
+    for _ in range(40):
+        system.run_tick(0.5)
+    assert elev.position_m == 5.0
+    assert list(elev.target_floors) == []
+    elev.select_floor(2)
+    assert system.active_controllers() == [system.controllers[1]]
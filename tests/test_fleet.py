@@ -0,0 +1,88 @@
+# tests/test_fleet.py
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simulation.elevator import Elevator
+from simulation.fleet import FleetEngine
+
+
+def _object_status(elevators):
+    return [
+        {
+            "id": i,
+            "current_floor": e.current_floor,
+            "direction": e.direction,
+            "position_m": e.position_m,
+            "door_status": e.door.status,
+            "target_floors": list(e.target_floors),
+        }
+        for i, e in enumerate(elevators)
+    ]
+
+
+@pytest.mark.parametrize("seed,dt", [(1, 0.5), (2, 0.1), (3, 1.0), (4, 0.25)])
+def test_fleet_matches_object_model(seed, dt):
+    rng = random.Random(seed)
+    elevators = [
+        Elevator(id=i, min_floor=1, max_floor=12, speed_mps=rng.choice([0.5, 1.0, 1.5]))
+        for i in range(6)
+    ]
+    fleet = FleetEngine.from_elevators(elevators)
+
+    for _ in range(600):
+        if rng.random() < 0.2:
+            car, floor = rng.randrange(6), rng.randint(0, 13)
+            elevators[car].call(floor)
+            fleet.call(car, floor)
+        for e in elevators:
+            e.step(dt)
+        fleet.step(dt)
+        assert fleet.get_status() == _object_status(elevators)
+
+
+@pytest.mark.parametrize("seed,dt", [(5, 0.5), (6, 0.1), (7, 2.0)])
+def test_fleet_matches_object_model_with_acceleration(seed, dt):
+    rng = random.Random(seed)
+    elevators = [
+        Elevator(id=i, min_floor=1, max_floor=12, speed_mps=rng.choice([1.0, 1.5, 2.5]),
+                 acceleration_mps2=rng.choice([0.4, 0.8, 1.2]))
+        for i in range(6)
+    ]
+    fleet = FleetEngine.from_elevators(elevators)
+
+    for _ in range(600):
+        if rng.random() < 0.2:
+            car, floor = rng.randrange(6), rng.randint(0, 13)
+            elevators[car].call(floor)
+            fleet.call(car, floor)
+        for e in elevators:
+            e.step(dt)
+        fleet.step(dt)
+        assert fleet.get_status() == _object_status(elevators)
+
+
+def test_emergency_cars_are_frozen():
+    fleet = FleetEngine(2, min_floor=1, max_floor=5)
+    fleet.emergency[0] = True
+    fleet.call(0, 3)
+    fleet.call(1, 3)
+    fleet.step(1.0)
+    assert fleet.get_status()[0]["position_m"] == 1.0
+    assert fleet.get_status()[1]["position_m"] == 2.0
+
+
+def test_call_ignores_duplicates_and_out_of_range():
+    fleet = FleetEngine(1, min_floor=1, max_floor=5)
+    fleet.call(0, 3)
+    fleet.call(0, 3)
+    fleet.call(0, 9)
+    assert fleet.get_target_floors(0) == [3]
+
+
+def test_from_elevators_rejects_non_uniform_floors():
+    elev = Elevator(id=1, min_floor=1, max_floor=3, floor_heights=[4.0, 3.0])
+    with pytest.raises(ValueError):
+        FleetEngine.from_elevators([elev])
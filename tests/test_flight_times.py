@@ -0,0 +1,86 @@
+# tests/test_flight_times.py
+import math
+
+import pytest
+from simulation.elevator import Elevator
+from simulation.flight_times import FlightTimeTable, elevation_at, elevations, position_at
+
+
+def _simulated_flight(elev, floor, dt=0.01):
+    elev.call(floor)
+    t = 0.0
+    while elev.door_status == "closed":
+        elev.step(dt)
+        t += dt
+    return t
+
+
+def test_uniform_table_matches_profile():
+    table = FlightTimeTable(1, 20, max_speed=1.0, acceleration=0.5)
+    assert table.flight_time(1, 2) == pytest.approx(2 * math.sqrt(2))
+    assert table.flight_time(11, 1) == pytest.approx(12.0)
+    assert table.flight_time(5, 5) == 0.0
+    assert table.distance(3, 10) == 7.0
+
+
+def test_constant_speed_table():
+    table = FlightTimeTable(1, 10, max_speed=2.0, acceleration=math.inf, door_time=2.0)
+    assert table.flight_time(1, 9) == 4.0
+    # Dos tramos más una parada en cada destino
+    assert table.route_time(1, [5, 3]) == pytest.approx(2.0 + 2.0 + 1.0 + 2.0)
+
+
+def test_non_uniform_heights():
+    heights = [4.5, 3.0, 3.0, 3.0]
+    levels = elevations(0, 4, heights)
+    assert levels == [0.0, 4.5, 7.5, 10.5, 13.5]
+    assert elevation_at(levels, 0, 1.5) == pytest.approx(6.0)
+    assert position_at(levels, 0, 6.0) == pytest.approx(1.5)
+
+    table = FlightTimeTable(0, 4, max_speed=1.5, acceleration=0.8, floor_heights=heights)
+    assert table.distance(0, 1) == 4.5
+    assert table.distance(1, 2) == 3.0
+    assert table.flight_time(0, 1) > table.flight_time(1, 2)
+    assert table.flight_time(1, 2) == table.flight_time(3, 4)
+
+
+def test_elevations_are_validated():
+    with pytest.raises(ValueError):
+        elevations(1, 5, [3.0, 3.0])
+    with pytest.raises(ValueError):
+        elevations(1, 3, [3.0, 0.0])
+
+
+def test_elevator_table_predicts_simulated_flight():
+    elev = Elevator(id=1, min_floor=0, max_floor=6, speed_mps=2.0, acceleration_mps2=0.7,
+                    floor_heights=[5.0, 3.0, 3.0, 3.0, 3.0, 3.5])
+    expected = elev.flight_times.flight_time(0, 5)
+    assert _simulated_flight(elev, 5) == pytest.approx(expected, abs=0.01)
+    assert elev.current_floor == 5
+
+
+def test_elevator_table_is_cached_and_invalidated():
+    elev = Elevator(id=1, min_floor=1, max_floor=10, speed_mps=1.0, acceleration_mps2=0.5)
+    table = elev.flight_times
+    assert elev.flight_times is table
+    assert table.door_time == 2 * elev.door.open_duration
+
+    elev.speed_mps = 2.0
+    faster = elev.flight_times
+    assert faster is not table
+    assert faster.flight_time(1, 10) < table.flight_time(1, 10)
+
+    elev.door.open_duration = 3.0
+    assert elev.flight_times.door_time == 6.0
+    elev.floor_heights = [2.0] * 9
+    assert elev.flight_times.distance(1, 10) == 18.0
+
+
+def test_cars_with_same_parameters_share_one_table():
+    from simulation.elevator import Elevator
+
+    a = Elevator(id=1, min_floor=1, max_floor=30, speed_mps=2.0)
+    b = Elevator(id=2, min_floor=1, max_floor=30, speed_mps=2.0)
+    c = Elevator(id=3, min_floor=1, max_floor=30, speed_mps=1.0)
+    assert a.flight_times is b.flight_times
+    assert c.flight_times is not a.flight_times
@@ -58,3 +58,94 @@ def test_is_active_and_get_requested_directions():
     panel.press_down()
     assert panel.is_active()
     assert set(panel.get_requested_directions()) == {"up", "down"}
+
+
+def test_pop_waiting_users_empties_queue_and_resets_indicators():
+    from simulation.user import User
+
+    panel = FloorPanel(id=7, floor=2, min_floor=1, max_floor=3)
+    up, down = User(id=1, weight_kg=70.0, current_floor=2), User(id=2, weight_kg=70.0, current_floor=2)
+    up.call_elevator("up")
+    down.call_elevator("down")
+    panel.call(up)
+    panel.call(down)
+    assert panel.indicator_up and panel.indicator_down
+    assert panel.pop_waiting_users() == [up, down]
+    assert panel.pop_waiting_users() == []
+    assert not panel.is_active()
+
+
+def _queued(panel, uid, direction):
+    from simulation.user import User
+
+    user = User(id=uid, weight_kg=70.0, current_floor=panel.floor)
+    user.call_elevator(direction)
+    panel.call(user)
+    return user
+
+
+def test_direction_queues_counts_and_take():
+    panel = FloorPanel(id=8, floor=2, min_floor=1, max_floor=3)
+    ups = [_queued(panel, i, "up") for i in range(5)]
+    down = _queued(panel, 99, "down")
+    assert panel.waiting_count("up") == 5
+    assert panel.waiting_count("down") == 1
+    assert panel.waiting_count() == 6
+
+    # Embarque limitado por capacidad: FIFO y el indicador sigue encendido
+    assert panel.take("up", 2) == ups[:2]
+    assert panel.indicator_up
+    assert panel.take("up") == ups[2:]
+    assert not panel.indicator_up
+    assert panel.indicator_down
+    assert panel.get_waiting_users(2, "down") == [down]
+    assert not panel.is_active()
+
+
+def test_cancel_by_id_updates_only_its_direction():
+    panel = FloorPanel(id=9, floor=2, min_floor=1, max_floor=3)
+    up = _queued(panel, 1, "up")
+    down1 = _queued(panel, 2, "down")
+    down2 = _queued(panel, 3, "down")
+    assert panel.cancel(2) is down1
+    assert panel.cancel(2) is None
+    assert panel.indicator_down
+    panel.clear_call(2, 3)
+    assert not panel.indicator_down
+    assert panel.indicator_up
+    assert panel.waiting_users() == [up]
+    assert down2 not in panel.waiting_users()
+
+
+def test_waiting_users_keeps_arrival_order_across_directions():
+    panel = FloorPanel(id=10, floor=2, min_floor=1, max_floor=3)
+    users = [_queued(panel, i, "up" if i % 3 else "down") for i in range(7)]
+    assert panel.waiting_users() == users
+    assert panel.pop_waiting_users() == users
+    assert panel.waiting_count() == 0
+
+
+def test_take_within_stops_at_first_that_does_not_fit():
+    panel = FloorPanel(id=11, floor=2, min_floor=1, max_floor=3)
+    users = [_queued(panel, i, "up" if i % 2 else "down") for i in range(4)]
+    users[2].weight_kg = 200.0
+    assert panel.take_within(250.0) == users[:2]
+    assert panel.waiting_users() == users[2:]
+    assert panel.take_within(100.0) == []
+    assert panel.take_within(100.0, at_least_one=True) == [users[2]]
+    assert panel.indicator_up and not panel.indicator_down
+
+
+def test_duplicate_user_id_is_rejected_without_dropping_the_first():
+    import pytest
+
+    panel = FloorPanel(id=12, floor=2, min_floor=1, max_floor=3)
+    first = _queued(panel, 5, "up")
+    with pytest.raises(ValueError, match="5"):
+        _queued(panel, 5, "down")
+    assert panel.waiting_users() == [first]
+    assert panel.waiting_count() == 1
+    # Una vez fuera de la cola, el id se puede volver a usar
+    assert panel.take("up") == [first]
+    again = _queued(panel, 5, "up")
+    assert panel.waiting_users() == [again]
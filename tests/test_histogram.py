@@ -0,0 +1,75 @@
+# tests/test_histogram.py
+
+import random
+
+import pytest
+from simulation.histogram import LogHistogram
+
+
+def _exact_percentile(values, p):
+    ordered = sorted(values)
+    rank = max(-(-p * len(ordered) // 100), 1)
+    return ordered[int(rank) - 1]
+
+
+def test_empty_histogram_reports_none():
+    h = LogHistogram()
+    assert h.percentile(50) is None
+    assert h.summary() == {"count": 0, "mean": None, "p50": None, "p90": None, "p99": None, "max": None}
+
+
+@pytest.mark.parametrize("p", [50, 90, 99])
+def test_percentiles_within_relative_error(p):
+    rng = random.Random(5)
+    values = [rng.expovariate(1 / 30.0) for _ in range(20000)]
+    h = LogHistogram(sub_buckets=128)
+    for v in values:
+        h.record(v)
+    exact = _exact_percentile(values, p)
+    assert abs(h.percentile(p) - exact) <= exact / 64 + h.resolution
+    assert h.count == len(values)
+    assert h.mean() == pytest.approx(sum(values) / len(values))
+
+
+def test_memory_does_not_grow_with_records():
+    h = LogHistogram()
+    size = len(h._counts)
+    for i in range(100000):
+        h.record(i * 0.37)
+    assert len(h._counts) == size
+    # Lo que supera `highest` se acumula en la última cubeta
+    assert h.percentile(100) == h.max
+
+
+def test_merge_adds_counts_and_rejects_mismatched_configs():
+    a, b = LogHistogram(), LogHistogram()
+    for v in (1.0, 2.0):
+        a.record(v)
+    for v in (3.0, 40.0):
+        b.record(v)
+    a.merge(b)
+    assert a.count == 4 and a.min == 1.0 and a.max == 40.0
+    with pytest.raises(ValueError):
+        a.merge(LogHistogram(sub_buckets=64))
+
+
+def test_record_rejects_negative_values():
+    with pytest.raises(ValueError):
+        LogHistogram().record(-1.0)
+
+
+def test_system_histograms_track_users():
+    import main
+
+    random.seed(11)
+    system = main.setup_system(1, 8)
+    main.setup_elevators(system, [{"id": 1}])
+    system.run_until(300.0, 0.5, main.generate_user_events(15, 1, 8, 300.0, 0.5))
+    waits = [u.wait_time() for u in system.users if u.wait_time() is not None]
+    journeys = [u.journey_time() for u in system.users if u.journey_time() is not None]
+    stats = system.service_stats()
+    assert stats["wait"]["count"] == len(waits)
+    assert stats["journey"]["count"] == len(journeys) == system.delivered_count
+    assert stats["wait"]["max"] == max(waits)
+    exact = _exact_percentile(journeys, 50)
+    assert abs(stats["journey"]["p50"] - exact) <= exact / 64 + 0.01
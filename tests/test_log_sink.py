@@ -0,0 +1,88 @@
+# tests/test_log_sink.py
+import os
+
+import pytest
+
+from simulation.log_sink import (
+    BinaryFrameSink,
+    JsonLinesSink,
+    read_frames,
+    read_json_lines,
+)
+from simulation.logger import Logger
+
+
+def test_logger_streams_json_lines(tmp_path):
+    path = str(tmp_path / "sim.jsonl")
+    logger = Logger(timestamp_fn=lambda: 2.5, capacity=1, sink=JsonLinesSink(path))
+    logger.log("User %s entered elevator at floor %s", 3, 7, level="INFO")
+    logger.log("Filtered", level="DEBUG")
+    logger.log("Plain")
+    logger.close()
+    records = list(read_json_lines(path))
+    assert records[0] == {
+        "time": 2.5,
+        "level": "INFO",
+        "message": "User 3 entered elevator at floor 7",
+        "template": "User %s entered elevator at floor %s",
+        "args": [3, 7],
+    }
+    assert records[1] == {"time": 2.5, "level": "INFO", "message": "Plain"}
+    # El buffer en memoria sigue acotado
+    assert logger.show_history() == ["[2.5] INFO: Plain"]
+
+
+def test_logging_after_close_keeps_working_in_memory(tmp_path):
+    path = str(tmp_path / "sim.jsonl")
+    sink = JsonLinesSink(path)
+    logger = Logger(timestamp_fn=lambda: 1.0, sink=sink)
+    logger.log("Before close")
+    logger.close()
+    logger.log("After close")
+    logger.close()
+    assert logger.sink is None
+    assert [r["message"] for r in read_json_lines(path)] == ["Before close"]
+    assert logger.show_history()[-1] == "[1.0] INFO: After close"
+    # Escribir directamente en un sink cerrado da un error claro
+    with pytest.raises(ValueError, match="cerrado"):
+        sink.write((1.0, "INFO", "Late", ()))
+
+
+def test_size_rotation_with_gzip_and_backup_count(tmp_path):
+    path = str(tmp_path / "sim.log")
+    sink = JsonLinesSink(path, max_bytes=200, compress=True, backup_count=2)
+    logger = Logger(sink=sink)
+    for i in range(40):
+        logger.log("Message number %d", i, level="INFO")
+    logger.close()
+    assert sink.segments > 2
+    kept = sorted(p for p in os.listdir(tmp_path) if p.endswith(".gz"))
+    assert kept == [f"sim.log.{sink.segments - 1}.gz", f"sim.log.{sink.segments}.gz"]
+    # El último segmento rotado y el activo contienen los mensajes finales en orden
+    tail = list(read_json_lines(sink.segment_path(sink.segments))) + list(read_json_lines(path))
+    assert tail[-1]["message"] == "Message number 39"
+    assert all(os.path.getsize(tmp_path / p) > 0 for p in kept)
+
+
+def test_time_rotation_uses_clock(tmp_path):
+    now = [0.0]
+    path = str(tmp_path / "sim.log")
+    sink = JsonLinesSink(path, interval_s=10.0, clock=lambda: now[0])
+    sink.write((0.0, "INFO", "a", ()))
+    now[0] = 11.0
+    sink.write((0.0, "INFO", "b", ()))
+    sink.close()
+    assert [r["message"] for r in read_json_lines(path + ".1")] == ["a"]
+    assert [r["message"] for r in read_json_lines(path)] == ["b"]
+
+
+def test_binary_frames_roundtrip(tmp_path):
+    path = str(tmp_path / "sim.bin")
+    with BinaryFrameSink(path, max_bytes=64, compress=True) as sink:
+        for i in range(5):
+            sink.write((float(i), "WARNING", "Frame %d ñ", (i,)))
+    frames = []
+    for n in range(1, sink.segments + 1):
+        frames.extend(read_frames(sink.segment_path(n)))
+    frames.extend(read_frames(path))
+    assert frames == [(float(i), "WARNING", f"Frame {i} ñ") for i in range(5)]
@@ -61,3 +61,74 @@ def test_export_writes_file(tmp_path):
     assert path.exists()
     content = path.read_text()
     assert "Msg1" in content
+
+
+def test_capacity_keeps_only_latest_records():
+    logger = Logger(capacity=3)
+    for i in range(10):
+        logger.log("Msg %d", i, level="INFO")
+    assert logger.total_logged == 10
+    assert logger.show_history() == [f"[0.0] INFO: Msg {i}" for i in (7, 8, 9)]
+    assert logger.show_history(2) == ["[0.0] INFO: Msg 8", "[0.0] INFO: Msg 9"]
+
+
+def test_formatting_is_deferred_and_skipped_when_filtered():
+    rendered = []
+
+    class Probe:
+        def __str__(self):
+            rendered.append(1)
+            return "probe"
+
+    logger = Logger(log_level="INFO")
+    logger.log("Debug %s", Probe(), level="DEBUG")
+    logger.log("Info %s", Probe(), level="INFO")
+    assert rendered == []
+    assert logger.show_history() == ["[0.0] INFO: Info probe"]
+    assert rendered == [1]
+
+
+def test_history_since_returns_new_entries():
+    logger = Logger(capacity=5)
+    logger.log("A")
+    seen = logger.total_logged
+    logger.log("B")
+    logger.log("C")
+    assert logger.history_since(seen) == ["[0.0] INFO: B", "[0.0] INFO: C"]
+    assert logger.history_since(logger.total_logged) == []
+
+
+def test_log_level_attribute_updates_threshold():
+    logger = Logger()
+    logger.log_level = "ERROR"
+    logger.log("Warn", level="WARNING")
+    assert logger.show_history() == []
+    assert logger.is_enabled_for("error")
+
+
+def test_positional_args_are_template_arguments_not_level():
+    logger = Logger()
+    logger.log("Added floor %s", 5)
+    logger.log("Car %s at floor %s", 2, 7, level="WARNING")
+    assert logger.show_history() == [
+        "[0.0] INFO: Added floor 5",
+        "[0.0] WARNING: Car 2 at floor 7",
+    ]
+
+
+def test_positional_level_is_still_accepted_with_a_warning():
+    import pytest
+
+    logger = Logger(log_level="WARNING")
+    with pytest.warns(DeprecationWarning):
+        logger.log("Hello", "WARNING")
+    with pytest.warns(DeprecationWarning):
+        logger.log("Filtered", "info")
+    assert logger.show_history() == ["[0.0] WARNING: Hello"]
+
+
+def test_bad_record_does_not_break_the_history():
+    logger = Logger()
+    logger.log("Two values %s %s", 1)
+    logger.log("Fine %s", 2)
+    assert logger.logs == ["[0.0] INFO: Two values %s %s (1,)", "[0.0] INFO: Fine 2"]
@@ -0,0 +1,32 @@
+# tests/test_main.py
+import json
+
+import main
+
+
+def test_headless_prints_only_json_summary(capsys):
+    main.main(["--headless", "--floors", "8", "--cars", "2", "--users", "20",
+               "--steps", "2000", "--dt", "0.5", "--seed", "3"])
+    out = capsys.readouterr().out
+    summary = json.loads(out)
+    assert summary["floors"] == [1, 8]
+    assert summary["cars"] == 2
+    assert summary["sim_time_s"] == 1000.0
+    assert summary["ticks_per_s"] > 0
+    assert summary["kpis"]["generated"] == 20
+    assert summary["kpis"]["delivered"] == 20
+
+
+def test_headless_summary_is_reproducible_with_seed(capsys):
+    argv = ["--headless", "--users", "10", "--steps", "600", "--seed", "11"]
+    main.main(argv)
+    first = json.loads(capsys.readouterr().out)
+    main.main(argv)
+    second = json.loads(capsys.readouterr().out)
+    assert first["kpis"] == second["kpis"]
+
+
+def test_headless_summary_without_users_is_valid_json(capsys):
+    main.main(["--headless", "--users", "0", "--steps", "10"])
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["kpis"]["mean_wait_s"] is None
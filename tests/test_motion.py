@@ -0,0 +1,99 @@
+# tests/test_motion.py
+import math
+
+import pytest
+from simulation.elevator import Elevator
+from simulation.motion import MotionProfile
+
+
+def test_trapezoid_profile_reaches_max_speed():
+    trip = MotionProfile(1.0, 11, 0.0, 1.0, 0.5)
+    # 2 s acelerando (1 m), 8 s de crucero y 2 s frenando (1 m)
+    assert (trip.t1, trip.t2, trip.total) == pytest.approx((2.0, 10.0, 12.0))
+    assert trip.v_peak == 1.0
+    assert trip.offset(1.0) == pytest.approx(0.25)
+    assert trip.offset(6.0) == pytest.approx(5.0)
+    assert trip.offset(11.0) == pytest.approx(9.75)
+    assert trip.offset(20.0) == 10
+
+
+def test_short_trip_is_triangular():
+    trip = MotionProfile(3.0, 2, 0.0, 1.0, 0.5)
+    assert trip.direction == -1
+    assert trip.v_peak == pytest.approx(math.sqrt(0.5))
+    assert trip.total == pytest.approx(2 * math.sqrt(2))
+    assert trip.offset(trip.t1) == pytest.approx(0.5)
+
+
+def test_infinite_acceleration_is_constant_speed():
+    trip = MotionProfile(1.0, 4, 0.0, 1.5, math.inf)
+    assert trip.total == pytest.approx(2.0)
+    trip.elapsed = 1.0
+    assert trip.position() == pytest.approx(2.5)
+    assert trip.braking_distance() == 0.0
+
+
+def test_replan_from_cruise_keeps_speed():
+    trip = MotionProfile(2.0, 10, 1.0, 1.0, 0.5)
+    assert trip.t1 == 0.0
+    assert trip.speed(0.0) == 1.0
+    assert trip.total == pytest.approx(9.0)
+
+
+def _flight_time(dt, floors=10, accel=0.5):
+    e = Elevator(id=1, min_floor=1, max_floor=20, speed_mps=1.0, acceleration_mps2=accel)
+    e.call(1 + floors)
+    t = 0.0
+    while e.door_status == "closed":
+        e.step(dt)
+        t += dt
+        assert e.position_m <= 1 + floors
+    return t
+
+
+@pytest.mark.parametrize("dt", [0.01, 0.1, 0.5, 3.0])
+def test_flight_time_does_not_depend_on_dt(dt):
+    # Se llega en el tick que cubre los 12 s del perfil, sin pasarse de piso
+    t = _flight_time(dt)
+    assert 12.0 - 1e-6 <= t < 12.0 + dt + 1e-6
+
+
+def test_elevator_position_follows_profile():
+    e = Elevator(id=1, min_floor=1, max_floor=20, speed_mps=1.0, acceleration_mps2=0.5)
+    e.call(11)
+    e.step(1.0)
+    assert e.position_m == pytest.approx(1.25)
+    assert e.motor.current_speed == pytest.approx(0.5)
+    assert e.time_to_arrival() == pytest.approx(11.0)
+    e.step(5.0)
+    assert e.position_m == pytest.approx(6.0)
+    assert e.current_floor == 6
+
+
+def test_stop_ahead_is_taken_only_if_car_can_brake():
+    e = Elevator(id=1, min_floor=1, max_floor=20, speed_mps=1.0, acceleration_mps2=0.5)
+    e.call(11)
+    for _ in range(8):
+        e.step(0.5)          # 4 s: en crucero en 4.0
+    e.call(3)                # detrás: se atiende al volver
+    e.call(5)                # a 1.0 m, justo la distancia de frenado
+    e.step(0.5)
+    assert e._trip.target == 5
+    e.call(9)
+    while e.door_status == "closed":
+        e.step(0.5)
+    assert e.current_floor == 5
+    assert e.target_floors == [9, 11, 3]
+
+
+def test_stop_too_close_to_brake_is_served_later():
+    e = Elevator(id=1, min_floor=1, max_floor=20, speed_mps=1.0, acceleration_mps2=0.5)
+    e.call(8)
+    for _ in range(9):
+        e.step(0.5)          # 4.5 s: en 4.5 a 1 m/s
+    e.call(5)                # a 0.5 m, no puede frenar
+    e.step(0.5)
+    e.step(0.5)
+    assert e._trip.target == 8
+    assert e.position_m == pytest.approx(5.5)
+    assert e.target_floors == [8, 5]
@@ -0,0 +1,95 @@
+# tests/test_passengers.py
+
+import copy
+import random
+
+import pytest
+from simulation.passengers import PassengerStore, StoredUser
+from simulation.user import User
+
+
+def test_user_has_no_instance_dict():
+    u = User(id=1, weight_kg=70.0, current_floor=1)
+    assert not hasattr(u, "__dict__")
+    with pytest.raises(AttributeError):
+        u.nickname = "x"
+
+
+def test_stored_user_matches_user_api():
+    store = PassengerStore()
+    stored = store.new_user(7, 82.5, 3)
+    plain = User(id=7, weight_kg=82.5, current_floor=3)
+    for u in (stored, plain):
+        assert u.destination_floor is None and u.call_time is None
+        u.destination_floor = 9
+        u.call_elevator("up", time=1.5)
+        u.enter_elevator(time=4.0)
+        u.current_floor = 9
+        u.exit_elevator(time=10.0)
+    for attr in User.__slots__:
+        assert getattr(stored, attr) == getattr(plain, attr), attr
+    assert stored.wait_time() == plain.wait_time() == 2.5
+    assert stored.journey_time() == plain.journey_time() == 8.5
+
+
+def test_stored_user_does_not_reserve_user_slots():
+    import sys
+
+    stored = PassengerStore().new_user(1, 70.0, 1)
+    assert not isinstance(stored, User)
+    assert StoredUser.__slots__ == ("_store", "_row")
+    assert sys.getsizeof(stored) < sys.getsizeof(User(id=1, weight_kg=70.0, current_floor=1))
+
+
+def test_store_reuses_released_rows():
+    store = PassengerStore()
+    live = []
+    for i in range(1000):
+        live.append(store.new_user(i, 70.0, 1))
+        if len(live) > 10:
+            store.release(live.pop(0))
+    assert len(store) == 10
+    assert store.capacity == 11
+    # La fila reutilizada no arrastra el estado del pasajero anterior
+    reused = live[-1]
+    assert reused.id == 999 and reused.call_direction is None and not reused.waiting
+
+
+def test_system_with_store_matches_plain_system():
+    import main
+
+    random.seed(3)
+    events = main.generate_user_events(40, 1, 8, 400.0, 0.5)
+    plain = main.setup_system(1, 8)
+    main.setup_elevators(plain, [{"id": 1}, {"id": 2}])
+    plain.run_until(400.0, 0.5, copy.deepcopy(events))
+
+    stored = main.setup_system(1, 8)
+    stored.passenger_store = PassengerStore()
+    main.setup_elevators(stored, [{"id": 1}, {"id": 2}])
+    stored.run_until(400.0, 0.5, copy.deepcopy(events))
+
+    delivered = sum(u.journey_time() is not None for u in plain.users)
+    assert stored.delivered_count == plain.delivered_count == delivered
+    assert stored.users == []
+    # Sólo quedan vivos los que no han llegado a su destino
+    assert len(stored.passenger_store) == len(events) - delivered
+    assert stored.passenger_store.capacity < len(events)
+    assert stored.logger.logs == plain.logger.logs
+
+
+def test_rejected_user_releases_its_row():
+    import main
+
+    system = main.setup_system(1, 8)
+    system.passenger_store = PassengerStore()
+    main.setup_elevators(system, [{"id": 1}])
+    lost = system.passenger_store.new_user(1, 70.0, 1)
+    lost.call_elevator("up", time=0.0)
+    system.add_user(lost)
+    system.dispatch_request(1, "up")
+    for _ in range(20):
+        system.run_tick(0.5)
+    # Sin destino no sube; ya no está en ninguna cola y su fila queda libre
+    assert len(system.passenger_store) == 0
+    assert lost._store is None
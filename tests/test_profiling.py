@@ -0,0 +1,57 @@
+# tests/test_profiling.py
+
+import copy
+import random
+
+from simulation.profiling import PHASES, PhaseTimer
+
+
+def _scenario():
+    import main
+
+    random.seed(4)
+    events = main.generate_user_events(15, 1, 8, 200.0, 0.5)
+    systems = []
+    for _ in range(2):
+        system = main.setup_system(1, 8)
+        main.setup_elevators(system, [{"id": 1}, {"id": 2}])
+        systems.append((system, copy.deepcopy(events)))
+    return systems
+
+
+def test_phase_timer_aggregates_per_car():
+    timer = PhaseTimer()
+    timer.add("elevator_step", 1, 100)
+    timer.add("elevator_step", 1, 300)
+    timer.add("elevator_step", 2, 200)
+    timer.add("spawn_users", None, 50)
+    data = timer.as_dict()
+    assert list(data) == ["elevator_step", "spawn_users"]
+    assert data["elevator_step"]["calls"] == 3
+    assert data["elevator_step"]["total_ns"] == 600
+    assert data["elevator_step"]["cars"][1] == {"calls": 2, "total_ns": 400, "mean_ns": 200.0}
+    assert data["spawn_users"]["cars"] == {}
+    assert "elevator_step" in timer.table(per_car=True)
+
+
+def test_profiling_counts_every_phase_without_changing_results():
+    (plain, plain_events), (profiled, profiled_events) = _scenario()
+    profiler = profiled.enable_profiling()
+    plain.run_until(200.0, 0.5, plain_events)
+    profiled.run_until(200.0, 0.5, profiled_events)
+
+    assert profiled.logger.logs == plain.logger.logs
+    assert profiled.disable_profiling() is profiler
+    assert profiled.profiler is None
+
+    data = profiler.as_dict()
+    assert set(data) == set(PHASES)
+    ticks = data["spawn_users"]["calls"]
+    assert 0 < ticks <= 400
+    # Sólo se ejecutan las cabinas activas; update_users va dentro del
+    # tick y otra vez después
+    steps = data["elevator_step"]["calls"]
+    assert 0 < steps <= 2 * ticks
+    assert steps < data["update_users"]["calls"] <= 2 * steps
+    assert 1 in data["handle_requests"]["cars"]
+    assert set(data["handle_requests"]["cars"]) <= {1, 2}
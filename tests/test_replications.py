@@ -0,0 +1,57 @@
+# tests/test_replications.py
+import math
+
+import pytest
+from simulation.replications import (
+    confidence_interval,
+    derive_seeds,
+    run_replication,
+    run_replications,
+)
+
+SCENARIO = {"min_floor": 1, "max_floor": 6, "num_cars": 2, "num_users": 8, "steps": 400, "dt": 0.5}
+
+
+def test_run_replication_returns_kpis():
+    record = run_replication(SCENARIO, seed=123)
+    assert record["generated"] == 8
+    assert 0 <= record["delivered"] <= 8
+    assert record["mean_wait_s"] >= 0
+    assert record["mean_journey_s"] >= record["mean_wait_s"]
+    assert len(record["car_utilization"]) == 2
+    assert all(0.0 <= u <= 1.0 for u in record["car_utilization"])
+    # Misma semilla -> mismo resultado
+    assert run_replication(SCENARIO, seed=123) == record
+
+
+def test_results_do_not_depend_on_worker_count():
+    serial = run_replications(SCENARIO, n=4, master_seed=7, workers=1)
+    parallel = run_replications(SCENARIO, n=4, master_seed=7, workers=2)
+    assert serial == parallel
+    assert [r["seed"] for r in serial["replications"]] == derive_seeds(7, 4)
+
+
+def test_confidence_interval_uses_student_t():
+    ci = confidence_interval([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0])
+    assert ci["mean"] == pytest.approx(5.5)
+    # t(0.975, 9) = 2.262 ; s = 3.0277
+    assert ci["ci_high"] - ci["mean"] == pytest.approx(2.262 * 3.0277 / math.sqrt(10), rel=1e-3)
+    assert math.isnan(confidence_interval([math.nan])["mean"])
+
+
+@pytest.mark.parametrize("p, df, expected", [
+    (0.975, 1, 12.7062),
+    (0.975, 2, 4.3027),
+    (0.975, 3, 3.1824),
+    (0.975, 4, 2.7764),
+    (0.975, 9, 2.2622),
+    (0.975, 29, 2.0452),
+    (0.995, 1, 63.6567),
+    (0.995, 5, 4.0321),
+    (0.95, 10, 1.8125),
+    (0.025, 4, -2.7764),
+])
+def test_t_quantile_matches_student_tables(p, df, expected):
+    from simulation.replications import _t_quantile
+
+    assert _t_quantile(p, df) == pytest.approx(expected, abs=1e-4)
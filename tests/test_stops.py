@@ -0,0 +1,50 @@
+# tests/test_stops.py
+import pytest
+from simulation.stops import StopSet
+
+
+def test_add_discard_and_membership():
+    stops = StopSet(-2, 40)
+    assert stops.add(5)
+    assert not stops.add(5)
+    stops.add(-2)
+    stops.add(40)
+    assert 5 in stops and -2 in stops and 40 in stops
+    assert 6 not in stops and 99 not in stops
+    assert len(stops) == 3
+    assert list(stops) == [-2, 5, 40]
+    assert stops.discard(5)
+    assert not stops.discard(5)
+    assert list(stops) == [-2, 40]
+    stops.clear()
+    assert not stops
+
+
+def test_add_out_of_range_raises():
+    with pytest.raises(ValueError):
+        StopSet(1, 10).add(11)
+
+
+def test_at_or_above_and_below_with_fractional_positions():
+    stops = StopSet(1, 20)
+    for f in (3, 8, 15):
+        stops.add(f)
+    assert stops.at_or_above(8.0) == 8
+    assert stops.at_or_above(8.2) == 15
+    assert stops.at_or_above(15.5) is None
+    assert stops.at_or_below(7.9) == 3
+    assert stops.at_or_below(8.0) == 8
+    assert stops.at_or_below(2.5) is None
+
+
+def test_next_stop_follows_look_order():
+    stops = StopSet(1, 20)
+    for f in (2, 6, 12):
+        stops.add(f)
+    assert stops.next_stop(5.0, "up") == 6
+    assert stops.next_stop(5.0, "down") == 2
+    assert stops.next_stop(13.0, "up") == 12     # nada arriba: se invierte
+    assert stops.next_stop(5.0, "idle") == 6     # la más cercana
+    assert stops.in_service_order(5.0, "up") == [6, 12, 2]
+    assert stops.in_service_order(5.0, "down") == [2, 6, 12]
+    assert stops.in_service_order(6.0, "down") == [6, 2, 12]
@@ -0,0 +1,92 @@
+# tests/test_trace.py
+
+import copy
+import random
+
+import pytest
+from simulation.trace import TraceSource, TraceWriter, RECORD_SIZE, HEADER_SIZE, open_trace_array
+
+
+def _events(seed=0, n=40):
+    import main
+
+    random.seed(seed)
+    return main.generate_user_events(n, 1, 8, 400.0, 0.5)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "day.trace")
+    events = _events()
+    with TraceWriter(path) as writer:
+        writer.write_many(events)
+    assert (tmp_path / "day.trace").stat().st_size == HEADER_SIZE + len(events) * RECORD_SIZE
+
+    with TraceSource(path) as source:
+        assert len(source) == len(events)
+        replayed = [source.pop() for _ in range(len(events))]
+        assert source.exhausted()
+        with pytest.raises(IndexError):
+            source.pop()
+    assert replayed == events
+
+
+def test_replay_matches_event_list(tmp_path):
+    import main
+
+    path = str(tmp_path / "day.trace")
+    events = _events(seed=5)
+    with TraceWriter(path) as writer:
+        writer.write_many(events)
+
+    systems = []
+    for arrivals in (copy.deepcopy(events), TraceSource(path)):
+        system = main.setup_system(1, 8)
+        main.setup_elevators(system, [{"id": 1}, {"id": 2}])
+        system.run_until(400.0, 0.5, arrivals)
+        systems.append(system)
+    assert systems[0].logger.logs == systems[1].logger.logs
+    assert systems[0].service_stats() == systems[1].service_stats()
+
+
+def test_seek_skips_earlier_arrivals(tmp_path):
+    path = str(tmp_path / "day.trace")
+    events = _events(seed=2)
+    with TraceWriter(path) as writer:
+        writer.write_many(events)
+    with TraceSource(path, start_time=200.0) as source:
+        assert source.peek_time() == min(e["time"] for e in events if e["time"] >= 200.0)
+        assert len(source) == sum(e["time"] >= 200.0 for e in events)
+
+
+def test_writer_rejects_out_of_order(tmp_path):
+    evt = {"time": 5.0, "id": 1, "weight": 70.0, "origin": 1, "dest": 2}
+    with TraceWriter(str(tmp_path / "t.trace")) as writer:
+        writer.write(evt)
+        with pytest.raises(ValueError):
+            writer.write({**evt, "time": 4.0})
+
+
+def test_reader_rejects_foreign_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a trace at all")
+    with pytest.raises(ValueError):
+        TraceSource(str(path))
+
+
+def test_numpy_chunks_and_memmap(tmp_path):
+    np = pytest.importorskip("numpy")
+    from simulation.traffic import generate_arrivals
+
+    path = str(tmp_path / "peak.trace")
+    schedule = [{"start": 0.0, "end": 600.0, "rate": 2.0, "profile": "up_peak"}]
+    chunks = list(generate_arrivals(schedule, 1, 20, seed=1, chunk_size=256))
+    with TraceWriter(path) as writer:
+        for chunk in chunks:
+            writer.write_chunk(chunk)
+
+    trace = open_trace_array(path)
+    assert trace.size == sum(c["time"].size for c in chunks)
+    assert (trace["dest"] == np.concatenate([c["dest"] for c in chunks])).all()
+    with TraceSource(path) as source:
+        first = source.pop()
+    assert first["time"] == trace["time"][0] and first["origin"] == trace["origin"][0]
@@ -0,0 +1,124 @@
+# tests/test_traffic.py
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simulation.traffic import AliasTable, generate_arrivals, iter_events, od_matrix
+
+
+@pytest.mark.parametrize("profile", ["up_peak", "down_peak", "lunch", "interfloor"])
+def test_od_matrix_is_a_distribution_without_self_trips(profile):
+    m = od_matrix(profile, 1, 12)
+    assert m.shape == (12, 12)
+    assert m.sum() == pytest.approx(1.0)
+    assert (np.diag(m) == 0).all()
+
+
+def test_alias_table_matches_weights():
+    weights = np.array([1.0, 0.0, 3.0, 6.0])
+    table = AliasTable(weights)
+    draws = table.sample(np.random.default_rng(0), 200000)
+    freq = np.bincount(draws, minlength=4) / draws.size
+    assert freq == pytest.approx(weights / weights.sum(), abs=0.005)
+    with pytest.raises(ValueError):
+        AliasTable([0.0, 0.0])
+
+
+def test_arrivals_follow_schedule_and_profile():
+    schedule = [
+        {"start": 0.0, "end": 3600.0, "rate": 2.0, "profile": "up_peak"},
+        {"start": 3600.0, "end": 7200.0, "rate": 0.5, "profile": "down_peak"},
+    ]
+    chunks = list(generate_arrivals(schedule, 1, 20, seed=3, chunk_size=1000))
+    assert all(c["time"].size <= 1000 for c in chunks)
+    times = np.concatenate([c["time"] for c in chunks])
+    origin = np.concatenate([c["origin"] for c in chunks])
+    dest = np.concatenate([c["dest"] for c in chunks])
+    ids = np.concatenate([c["id"] for c in chunks])
+
+    assert (np.diff(times) >= 0).all() and times.max() < 7200.0
+    assert (ids == np.arange(1, ids.size + 1)).all()
+    assert (origin != dest).all() and origin.min() >= 1 and dest.max() <= 20
+    morning = times < 3600.0
+    # Poisson: recuento dentro de ~5 desviaciones típicas
+    assert abs(morning.sum() - 7200) < 5 * 7200 ** 0.5
+    assert abs((~morning).sum() - 1800) < 5 * 1800 ** 0.5
+    assert (origin[morning] == 1).mean() == pytest.approx(0.85, abs=0.03)
+    assert (dest[~morning] == 1).mean() == pytest.approx(0.85, abs=0.05)
+
+
+def test_same_seed_gives_same_stream():
+    schedule = [{"start": 0.0, "end": 600.0, "rate": 1.0, "profile": "lunch"}]
+    a = [c["dest"] for c in generate_arrivals(schedule, 1, 10, seed=7)]
+    b = [c["dest"] for c in generate_arrivals(schedule, 1, 10, seed=7)]
+    assert all((x == y).all() for x, y in zip(a, b))
+
+
+def test_events_feed_the_simulation():
+    import main
+
+    schedule = [{"start": 0.0, "end": 300.0, "rate": 0.05, "profile": "interfloor"}]
+    system = main.setup_system(1, 8)
+    main.setup_elevators(system, [{"id": 1}, {"id": 2}])
+    system.run_until(600.0, 0.5, iter_events(generate_arrivals(schedule, 1, 8, seed=1)))
+    assert system.users
+    assert system.delivered_count == len(system.users)
+
+
+@pytest.mark.parametrize("schedule", [
+    [{"start": 0.0, "end": 600.0, "rate": 1.0, "profile": "lunch"},
+     {"start": 300.0, "end": 900.0, "rate": 1.0, "profile": "up_peak"}],
+    [{"start": 600.0, "end": 900.0, "rate": 1.0, "profile": "lunch"},
+     {"start": 0.0, "end": 600.0, "rate": 1.0, "profile": "up_peak"}],
+    [{"start": 600.0, "end": 0.0, "rate": 1.0, "profile": "lunch"}],
+])
+def test_unordered_or_overlapping_schedule_is_rejected_up_front(schedule):
+    # Falla al crear el generador, no al consumirlo durante la simulación
+    with pytest.raises(ValueError, match="Periodo"):
+        generate_arrivals(schedule, 1, 10, seed=1)
+
+
+def test_back_to_back_periods_are_accepted():
+    schedule = [
+        {"start": 0.0, "end": 300.0, "rate": 0.5, "profile": "up_peak"},
+        {"start": 300.0, "end": 600.0, "rate": 0.5, "profile": "down_peak"},
+    ]
+    times = np.concatenate([c["time"] for c in generate_arrivals(schedule, 1, 10, seed=2)])
+    assert (np.diff(times) >= 0).all()
+
+
+def _od_schedule(od):
+    return [{"start": 0.0, "end": 600.0, "rate": 1.0, "od": od}]
+
+
+@pytest.mark.parametrize("od, match", [
+    (np.ones((3, 3)) - np.eye(3), "4x4"),
+    (np.array([[0, 1, 1, -1], [1, 0, 1, 1], [1, 1, 0, 1], [1, 1, 1, 0]]), "no negativa"),
+    (np.ones((4, 4)), "diagonal nula"),
+    (np.zeros((4, 4)), "sumar 0"),
+])
+def test_bad_od_matrix_is_rejected_up_front(od, match):
+    with pytest.raises(ValueError, match=match):
+        generate_arrivals(_od_schedule(od), 1, 4, seed=1)
+
+
+def test_custom_od_matrix_is_accepted():
+    od = np.ones((4, 4)) - np.eye(4)
+    chunk = next(generate_arrivals(_od_schedule(od), 1, 4, seed=1))
+    assert (chunk["origin"] != chunk["dest"]).all()
+
+
+@pytest.mark.parametrize("lobby", [0, 11])
+def test_lobby_outside_the_building_is_rejected(lobby):
+    schedule = [{"start": 0.0, "end": 600.0, "rate": 1.0, "profile": "up_peak"}]
+    with pytest.raises(ValueError, match="vestíbulo"):
+        generate_arrivals(schedule, 1, 10, seed=1, lobby=lobby)
+    with pytest.raises(ValueError, match="vestíbulo"):
+        od_matrix("up_peak", 1, 10, lobby=lobby)
+
+
+def test_unknown_profile_is_rejected_up_front():
+    schedule = [{"start": 0.0, "end": 600.0, "rate": 1.0, "profile": "rush"}]
+    with pytest.raises(ValueError, match="perfil desconocido"):
+        generate_arrivals(schedule, 1, 10, seed=1)
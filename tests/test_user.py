@@ -59,3 +59,13 @@ def test_exit_elevator_no_effect_if_not_inside_or_no_destination():
     u.destination_floor = None
     u.exit_elevator()
     assert u.current_floor == 3
+
+def test_timestamps_give_wait_and_journey_times():
+    u = User(id=7, weight_kg=70.0, current_floor=1)
+    assert u.wait_time() is None and u.journey_time() is None
+    u.destination_floor = 4
+    u.call_elevator("up", time=10.0)
+    u.enter_elevator(time=14.5)
+    u.exit_elevator(time=30.0)
+    assert u.wait_time() == pytest.approx(4.5)
+    assert u.journey_time() == pytest.approx(20.0)